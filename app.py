@@ -2,17 +2,20 @@
 Application principale CycloFlow - Planification d'itinéraires vélo
 """
 
+import folium
 import streamlit as st
 import googlemaps  # type: ignore
 from streamlit_folium import st_folium  # type: ignore
 
 from config.var_env import GOOGLE_MAP_API_KEY
+from ui.constants import MAP_HEIGHT, MAP_KEY, MAP_WIDTH
 from ui import (
     init_session_state,
     calculate_itinerary,
     has_itinerary_result,
     get_itinerary_result,
     create_base_map,
+    create_parking_viewport_layer,
     add_bike_routes_to_map,
     add_departure_arrival_markers,
     add_walking_route_to_map,
@@ -59,35 +62,66 @@ def main():
             parking_filter,
         )
 
-    # Créer la carte avec les options sélectionnées
-    m = create_base_map(
-        show_parking=show_parking,
-        map_style=map_style,
-        parking_filter=parking_filter,
-    )
+    # Météo affichée aux exécutions complètes, hors du fragment de la carte
+    itinerary_data = _get_displayed_itinerary()
+    if itinerary_data and itinerary_data.get("meteo_forecast"):
+        try:
+            display_weather_forecast(
+                itinerary_data["meteo_forecast"],
+                st.session_state.get("travel_datetime"),
+            )
+        except Exception as e:
+            st.error(f"❌ Erreur affichage: {e}")
+
+    display_itinerary_and_map(show_parking, map_style, parking_filter)
+
+
+def _get_displayed_itinerary():
+    """Renvoie l'itinéraire calculé à afficher, None s'il n'y en a pas."""
+    if not has_itinerary_result():
+        return None
+    itinerary_data = get_itinerary_result()
+    if isinstance(itinerary_data, list):
+        itinerary_data = next((item for item in itinerary_data if isinstance(item, dict)), {})
+    return itinerary_data
+
+
+@st.fragment
+def display_itinerary_and_map(show_parking, map_style, parking_filter):
+    """Affiche les itinéraires et la carte.
+
+    Fragment réexécuté seul quand un itinéraire est sélectionné ou que la
+    carte est déplacée : la barre latérale, le client Google Maps et la météo
+    ne sont pas reconstruits.
+    """
+    # Créer la carte avec les options sélectionnées, les parkings sont ajoutés selon la vue courante
+    m = create_base_map(map_style=map_style)
+    parking_layer = create_parking_viewport_layer(show_parking, parking_filter)
+    # Itinéraire dans sa propre couche : un nouvel itinéraire ne recharge pas la carte
+    route_layer = folium.FeatureGroup(name="Itinéraire", control=False)
 
     # Affichage des résultats d'itinéraire
-    if has_itinerary_result():
+    itinerary_data = _get_displayed_itinerary()
+    if itinerary_data:
         try:
-            itinerary_data = get_itinerary_result()
-            if isinstance(itinerary_data, list):
-                itinerary_data = next((item for item in itinerary_data if isinstance(item, dict)), {})
-            if itinerary_data.get("meteo_forecast"):
-                display_weather_forecast(
-                    itinerary_data["meteo_forecast"],
-                    st.session_state.get("travel_datetime"),
-                )
-            add_departure_arrival_markers(m, itinerary_data)
-            add_bike_routes_to_map(m, itinerary_data)
-            add_walking_route_to_map(m, itinerary_data)
-            add_transport_route_to_map(m, itinerary_data)
+            add_departure_arrival_markers(route_layer, itinerary_data)
+            add_bike_routes_to_map(route_layer, itinerary_data)
+            add_walking_route_to_map(route_layer, itinerary_data)
+            add_transport_route_to_map(route_layer, itinerary_data)
             transport_info = itinerary_data.get("itinerary_transport")
             display_transport_itinerary(transport_info)
         except Exception as e:
             st.error(f"❌ Erreur affichage: {e}")
 
-    # Carte finale
-    st_folium(m, width=700, height=500)
+    # Carte finale : couches ajoutées sans recharger la carte, emprise et zoom renvoyés pour le prochain rendu
+    st_folium(
+        m,
+        key=MAP_KEY,
+        width=MAP_WIDTH,
+        height=MAP_HEIGHT,
+        returned_objects=["bounds", "zoom"],
+        feature_group_to_add=[parking_layer, route_layer],
+    )
 
 
 if __name__ == "__main__":
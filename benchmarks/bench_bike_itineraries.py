@@ -0,0 +1,94 @@
+import argparse
+import ast
+import json
+import os
+import time
+import tracemalloc
+from typing import Any
+
+import numpy as np
+
+from ui.business_logic import _normalize_bike_itineraries
+
+RESPONSE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "response.json")
+DEFAULT_SEGMENTS = [2, 10, 50]
+REPEATS = 200
+
+
+def load_response(path: str = RESPONSE_PATH) -> dict[str, Any]:
+    # repr Python reformaté : des retours à la ligne ont été insérés dans les chaînes, on les retire
+    with open(path) as f:
+        text = f.read()
+
+    chars = []
+    quote = None
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quote:
+            if char == "\\":
+                chars.append(text[i:i + 2])
+                i += 2
+                continue
+            if char == "\n":
+                i += 1
+                while i < len(text) and text[i] in " \t":
+                    i += 1
+                continue
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        chars.append(char)
+        i += 1
+    return ast.literal_eval("".join(chars))
+
+
+def multi_segment_routes(response: dict[str, Any], segments: int) -> list[list[dict[str, Any]]]:
+    # Trajet à plusieurs tronçons vélo : les tronçons de la réponse réelle sont répétés
+    raw_segments = response["itinerary_velo"]
+    routes = [raw_segments[i % len(raw_segments)] for i in range(segments)]
+    # Objets distincts à chaque tronçon, comme après décodage d'une réponse JSON
+    return json.loads(json.dumps(routes))
+
+
+def run_benchmark(response: dict[str, Any], segments: int, repeats: int) -> dict[str, Any]:
+    raw_routes = multi_segment_routes(response, segments)
+
+    durations = []
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        _normalize_bike_itineraries(raw_routes)
+        durations.append(time.perf_counter() - started_at)
+
+    # Mémoire allouée par la normalisation et conservée par son résultat
+    tracemalloc.start()
+    routes = _normalize_bike_itineraries(raw_routes)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "segments": segments,
+        "routes": len(routes),
+        "sections": sum(len(route["sections"]) for route in routes),
+        "mean_seconds": float(np.mean(durations)),
+        "p95_seconds": float(np.percentile(durations, 95)),
+        "retained_bytes": retained,
+        "peak_bytes": peak,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de la normalisation des itinéraires vélo Geovelo")
+    parser.add_argument("--segments", type=int, nargs="+", default=DEFAULT_SEGMENTS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--response", default=RESPONSE_PATH)
+    args = parser.parse_args()
+
+    response = load_response(args.response)
+    for segments in args.segments:
+        print(json.dumps(run_benchmark(response, segments, args.repeats)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+# Les modules src ne sont importés que dans le processus de mesure, une fois CYCLOFLOW_DATA_PATH positionné
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+NEAREST_QUERIES = 1_000
+RSS_SAMPLING_INTERVAL = 0.005
+
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), "results")
+
+Stage = dict[str, Any]
+
+
+class PeakRss:
+    # Échantillonne la mémoire résidente du processus : couvre aussi les allocations Arrow et numpy
+    def __init__(self):
+        self.peak = 0
+        self._running = False
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> "PeakRss":
+        self.peak = _current_rss()
+        self._running = True
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._running = False
+        self._thread.join()
+        self.peak = max(self.peak, _current_rss())
+
+    def _sample(self) -> None:
+        while self._running:
+            self.peak = max(self.peak, _current_rss())
+            time.sleep(RSS_SAMPLING_INTERVAL)
+
+
+def _current_rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Hors Linux : pic depuis le démarrage du processus
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _measure(stages: dict[str, Stage], name: str, function: Callable[[], Any]) -> Any:
+    rss_before = _current_rss()
+    with PeakRss() as peak_rss, contextlib.redirect_stdout(io.StringIO()):
+        started_at = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - started_at
+    stages[name] = {
+        "seconds": round(seconds, 4),
+        "rss_before_bytes": rss_before,
+        "peak_rss_bytes": peak_rss.peak,
+    }
+    return result
+
+
+def run_benchmark(rows: int, queries: int, seed: int, keep_data: Optional[str]) -> dict[str, Any]:
+    workdir = keep_data or tempfile.mkdtemp(prefix="cycloflow_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    os.environ["CYCLOFLOW_DATA_PATH"] = workdir
+    try:
+        return _run_benchmark(rows, queries, seed, workdir)
+    finally:
+        if not keep_data:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_benchmark(rows: int, queries: int, seed: int, workdir: str) -> dict[str, Any]:
+    import data
+
+    # Garde-fou : data importé avant CYCLOFLOW_DATA_PATH écrirait dans le répertoire de l'application
+    if os.path.realpath(data.DATA_PATH) != os.path.realpath(workdir):
+        raise RuntimeError(f"Benchmark data path {data.DATA_PATH} is not the temporary directory {workdir}")
+
+    import folium
+    from shapely.geometry import Point
+
+    from tests.parquet_source_handler import ParquetSourceHandler
+    from tests.synthetic_parking_velo import ILE_DE_FRANCE_BOUNDS, generate_parking_velo_export
+    from src.parking_velo.config.datasets import ParkingVeloDatasets
+    from src.parking_velo.config.filters import ParkingVeloFilters
+    from src.parking_velo.domain.usecases.filter_parking_velo_data import filter_parking_velo_data
+    from src.parking_velo.domain.usecases.find_nearest_parking_velo import find_nearest_parking_velo
+    from src.parking_velo.domain.usecases.get_parking_velo_data import get_parking_velo_data_in_bbox
+    from src.parking_velo.domain.usecases.load_parking_velo_data import load_parking_velo_data
+    from src.parking_velo.infrastructure.local_file_system_handler import LocalFileSystemHandler
+    from ui.constants import PARKING_VIEWPORT_MAX
+    from ui.map_components import (
+        PARKING_CLUSTER_ICON_FUNCTION, PARKING_MARKER_COLUMNS, ParkingMarkerCluster, _to_parking_json)
+
+    stages: dict[str, Stage] = {}
+    export_path = os.path.join(workdir, "export.parquet")
+    _measure(stages, "generate", lambda: generate_parking_velo_export(rows, export_path, seed))
+
+    local_fs_handler = LocalFileSystemHandler()
+    _measure(stages, "ingest", lambda: load_parking_velo_data(ParquetSourceHandler(export_path), local_fs_handler))
+    _measure(stages, "filter", lambda: filter_parking_velo_data(local_fs_handler, with_grid=True))
+
+    # Recherche du plus proche : premier appel à froid (chargement des caches) puis appels à chaud
+    rng = np.random.default_rng(seed)
+    xmin, ymin, xmax, ymax = ILE_DE_FRANCE_BOUNDS
+    points = [Point(x, y) for x, y in zip(rng.uniform(xmin, xmax, queries), rng.uniform(ymin, ymax, queries))]
+    cached_fs_handler = LocalFileSystemHandler(use_cache=True)
+    _measure(stages, "nearest_cold", lambda: find_nearest_parking_velo(
+        cached_fs_handler, points[0], ParkingVeloFilters.default
+    ))
+    durations = []
+
+    def nearest_queries() -> None:
+        for point in points:
+            started_at = time.perf_counter()
+            find_nearest_parking_velo(cached_fs_handler, point, ParkingVeloFilters.default)
+            durations.append(time.perf_counter() - started_at)
+
+    _measure(stages, "nearest", nearest_queries)
+    stages["nearest"].update({
+        "queries": queries,
+        "mean_seconds": float(np.mean(durations)),
+        "p50_seconds": float(np.percentile(durations, 50)),
+        "p95_seconds": float(np.percentile(durations, 95)),
+    })
+
+    # Couche de parkings envoyée au navigateur au niveau de la rue, rendue en HTML : cas le plus lourd,
+    # une vue couvrant tous les sites, tronquée à PARKING_VIEWPORT_MAX comme dans l'application
+    sites_manifest = cached_fs_handler.get_parking_velo_manifest(ParkingVeloDatasets.sites)
+
+    def map_layer() -> tuple[str, int]:
+        parking_data, _ = get_parking_velo_data_in_bbox(
+            cached_fs_handler,
+            ParkingVeloFilters.default,
+            tuple(sites_manifest["bbox"]),
+            limit=PARKING_VIEWPORT_MAX,
+            columns=PARKING_MARKER_COLUMNS,
+        )
+        m = folium.Map()
+        ParkingMarkerCluster(
+            _to_parking_json(parking_data),
+            max_cluster_radius=30,
+            icon_create_function=PARKING_CLUSTER_ICON_FUNCTION,
+        ).add_to(m)
+        return m.get_root().render(), len(parking_data)
+
+    html, markers = _measure(stages, "map_layer", map_layer)
+    stages["map_layer"].update({"html_bytes": len(html), "markers": markers})
+
+    return {
+        "rows": rows,
+        "filtered_rows": cached_fs_handler.get_parking_velo_manifest(ParkingVeloDatasets.filtered)["row_count"],
+        "sites": sites_manifest["row_count"],
+        "stages": stages,
+    }
+
+
+def _metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.now(UTC).isoformat(),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _compare(results: list[dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {run["rows"]: run["stages"] for run in json.load(f)["runs"]}
+    for run in results:
+        for name, stage in run["stages"].items():
+            reference = baseline.get(run["rows"], {}).get(name, {})
+            if "seconds" in stage and reference.get("seconds"):
+                ratio = stage["seconds"] / reference["seconds"]
+                print(f"{run['rows']:>9} {name:<13} {stage['seconds']:>10.3f}s  x{ratio:.2f} vs baseline")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline parking vélo sur données synthétiques")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--queries", type=int, default=NEAREST_QUERIES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--keep-data", default=None, help="Répertoire où conserver les données générées")
+    args = parser.parse_args()
+
+    # Un processus neuf par taille : mémoire de départ et caches indépendants d'une taille à l'autre
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for rows in args.rows:
+        keep_data = os.path.join(args.keep_data, str(rows)) if args.keep_data else None
+        with context.Pool(1) as pool:
+            run = pool.apply(run_benchmark, (rows, args.queries, args.seed, keep_data))
+        results.append(run)
+        print(json.dumps(run, indent=2))
+
+    output = args.output or os.path.join(
+        RESULTS_PATH, f"parking_velo_{datetime.now(UTC).strftime('%Y%m%dT%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"metadata": _metadata(), "runs": results}, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        _compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 import os
 from posixpath import join
 
-DATA_PATH = os.path.dirname(__file__)
+# Répertoire surchargeable (benchmarks) pour ne pas écraser les données de l'application
+DATA_PATH = os.environ.get("CYCLOFLOW_DATA_PATH", os.path.dirname(__file__))
 FILTERED_DATA_PATH = os.path.join(DATA_PATH, "filtered")
 
 PATH_PARKING_VELO = join(DATA_PATH, "parking_velo.parquet")
-PATH_TRANSPORTS_POSSIBLES = join(DATA_PATH, "transports_possibles.parquet")
\ No newline at end of file
+PATH_PARKING_VELO_INDEX = join(DATA_PATH, "parking_velo.index.pkl")
+PATH_PARKING_VELO_SOURCE = join(DATA_PATH, "parking_velo.source.json")
+PATH_PARKING_VELO_FILTERED = join(FILTERED_DATA_PATH, "parking_velo_filtered.parquet")
+PATH_PARKING_VELO_SITES = join(FILTERED_DATA_PATH, "parking_velo_sites.arrow")
+PATH_GEOCODING_CACHE = join(DATA_PATH, "geocoding.sqlite")
+PATH_TRANSPORTS_POSSIBLES = join(DATA_PATH, "transports_possibles.parquet")
+PATH_TRANSPORTS_POSSIBLES_MANIFEST = join(DATA_PATH, "transports_possibles.manifest.json")
\ No newline at end of file
@@ -4,6 +4,8 @@ import logging
 from src.itineraire.domain.usecases.calcul_itineraire_transport import \
     calcul_itineraire_transport
 from src.itineraire.infrastructure.api_handler import ApiHandler
+from src.itineraire.infrastructure.cached_source_handler import CachedGeocodingSourceHandler
+from src.itineraire.infrastructure.local_file_system_handler import LocalFileSystemHandler
 
 
 def itineraire_transport_velo_autorise(
@@ -12,7 +14,7 @@ def itineraire_transport_velo_autorise(
     travel_datetime: datetime = None,
     datetime_represents: str = "departure"
 ) -> dict:
-    api_handler = ApiHandler()
+    api_handler = CachedGeocodingSourceHandler(ApiHandler(), LocalFileSystemHandler())
     itinerary = calcul_itineraire_transport(
         api_handler, departure_address, arrival_address, travel_datetime, datetime_represents)
     return itinerary
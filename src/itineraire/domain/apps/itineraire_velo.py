@@ -5,6 +5,8 @@ from typing import Optional
 from src.parking_velo.config.filters import ParkingVeloFilters
 from src.itineraire.domain.usecases.calcul_itineraire_velo import calcul_itineraire_velo
 from src.itineraire.infrastructure.api_handler import ApiHandler
+from src.itineraire.infrastructure.cached_source_handler import CachedGeocodingSourceHandler
+from src.itineraire.infrastructure.local_file_system_handler import LocalFileSystemHandler
 
 
 def itineraire_parking_velo(
@@ -16,7 +18,8 @@ def itineraire_parking_velo(
     parking_filter: ParkingVeloFilters = ParkingVeloFilters.default,
     use_train: bool = True,
 ) -> dict:
-    api_handler = ApiHandler()
+    # Adresses déjà résolues lues dans le cache partagé, sans appel à Geovelo
+    api_handler = CachedGeocodingSourceHandler(ApiHandler(), LocalFileSystemHandler())
 
     if travel_datetime:
         if travel_datetime.tzinfo is None:
@@ -0,0 +1,18 @@
+import re
+import unicodedata
+from typing import Any
+
+# Adresse résolue : {"lon", "lat"} ; adresse introuvable : {"error"}
+GeocodingEntry = dict[str, Any]
+
+# Durée de vie des adresses résolues et des échecs, en secondes
+GEOCODING_TTL = 30 * 24 * 3600
+GEOCODING_NEGATIVE_TTL = 3600
+
+
+def normalize_address(address: str) -> str:
+    # Forme comparable d'une adresse : même clé de cache et même entrée d'index pour les variantes
+    # de casse, d'accents, de ponctuation et d'espaces
+    address = unicodedata.normalize("NFKD", address)
+    address = "".join(char for char in address if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", address.lower()).split())
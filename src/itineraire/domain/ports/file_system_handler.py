@@ -1,5 +1,22 @@
-
 from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.itineraire.domain.entities.geocoding import GeocodingEntry
+
 
 class FileSystemHandler(ABC):
-    pass
\ No newline at end of file
+    @abstractmethod
+    def get_geocoding(self, key: str) -> Optional[GeocodingEntry]:
+        pass
+
+    @abstractmethod
+    def save_geocoding(self, key: str, entry: GeocodingEntry, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    def count_geocoding(self, event: str) -> None:
+        pass
+
+    @abstractmethod
+    def get_geocoding_stats(self) -> dict[str, int]:
+        pass
@@ -32,6 +32,8 @@ class ApiHandler(SourceHandler):
     def get_address_coordinates(self, address_name: str) -> Point:
         params = {'q': address_name}
         r = self.session.get(f"{self.url_geovelo}/places", params=params)
+        # Quota dépassé ou erreur serveur (HTTPError) : erreur transitoire, jamais prise pour une adresse introuvable
+        r.raise_for_status()
 
         # Vérifications de sécurité
         response_data = r.json()
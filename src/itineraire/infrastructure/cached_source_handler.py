@@ -0,0 +1,53 @@
+from shapely.geometry import Point
+from requests import RequestException
+
+from src.itineraire.domain.entities.geocoding import GEOCODING_NEGATIVE_TTL, GEOCODING_TTL, normalize_address
+from src.itineraire.domain.ports.file_system_handler import FileSystemHandler
+from src.itineraire.domain.ports.source_handler import SourceHandler
+
+
+class CachedGeocodingSourceHandler(SourceHandler):
+    # Géocodage mis en cache sur disque, les autres appels sont transmis tels quels à la source
+    def __init__(self, source_handler: SourceHandler, file_system_handler: FileSystemHandler):
+        self.source_handler = source_handler
+        self.file_system_handler = file_system_handler
+
+    def get_address_coordinates(self, address_name: str) -> Point:
+        key = normalize_address(address_name)
+        entry = self.file_system_handler.get_geocoding(key)
+        if entry is not None:
+            if "error" in entry:
+                self.file_system_handler.count_geocoding("negative_hit")
+                raise ValueError(entry["error"])
+            self.file_system_handler.count_geocoding("hit")
+            return Point(entry["lon"], entry["lat"])
+
+        self.file_system_handler.count_geocoding("miss")
+        try:
+            point = self.source_handler.get_address_coordinates(address_name=address_name)
+        except RequestException:
+            # Erreur réseau ou réponse illisible : rien n'est mis en cache
+            raise
+        except ValueError as e:
+            # Adresse introuvable : l'échec est gardé moins longtemps qu'une adresse résolue
+            self.file_system_handler.save_geocoding(key, {"error": str(e)}, GEOCODING_NEGATIVE_TTL)
+            raise
+
+        self.file_system_handler.save_geocoding(key, {"lon": point.x, "lat": point.y}, GEOCODING_TTL)
+        return point
+
+    def get_itinerary_transport(self, departure_coordinates, arrival_coordinates, travel_datetime, datetime_represents):
+        return self.source_handler.get_itinerary_transport(
+            departure_coordinates, arrival_coordinates, travel_datetime, datetime_represents
+        )
+
+    def get_itinerary_marche(self, departure_coordinates: Point, arrival_coordinates: Point) -> dict:
+        return self.source_handler.get_itinerary_marche(departure_coordinates, arrival_coordinates)
+
+    def get_itinerary_velo(
+        self,
+        departure_coordinates: Point,
+        arrival_coordinates: Point,
+        profile: str = "Default"
+    ) -> list[dict]:
+        return self.source_handler.get_itinerary_velo(departure_coordinates, arrival_coordinates, profile)
@@ -0,0 +1,121 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from data import PATH_GEOCODING_CACHE
+from src.itineraire.domain.entities.geocoding import GeocodingEntry
+from src.itineraire.domain.ports.file_system_handler import FileSystemHandler
+
+# Attente maximale d'un verrou tenu par un autre processus, en secondes
+SQLITE_TIMEOUT = 5.0
+
+# Compteurs du cache accumulés en mémoire par base, écrits par lot : une lecture du cache n'ouvre
+# pas de transaction d'écriture. Lot écrit tous les STATS_FLUSH_EVENTS événements ou toutes les
+# STATS_FLUSH_INTERVAL secondes, avec chaque écriture du cache et à la sortie du processus
+STATS_FLUSH_EVENTS = 100
+STATS_FLUSH_INTERVAL = 60.0
+_PENDING_STATS: dict[str, Counter] = {}
+_STATS_FLUSHED_AT: dict[str, float] = {}
+_STATS_LOCK = threading.Lock()
+
+
+# Bases déjà initialisées par ce processus : le schéma n'est créé qu'une fois par chemin,
+# pas à chaque instanciation du gestionnaire (une par itinéraire)
+_INITIALISED_PATHS: set[str] = set()
+_INIT_LOCK = threading.Lock()
+
+
+class LocalFileSystemHandler(FileSystemHandler):
+    def __init__(self, path: str = PATH_GEOCODING_CACHE):
+        self.path = path
+        with _INIT_LOCK:
+            # Base supprimée depuis son initialisation : recréée
+            if path not in _INITIALISED_PATHS or not os.path.exists(path):
+                self._initialise()
+                _INITIALISED_PATHS.add(path)
+
+    def _initialise(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as connection:
+            # Journal WAL : lectures concurrentes entre processus pendant une écriture
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS geocoding (key TEXT PRIMARY KEY, entry TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS geocoding_expires_at ON geocoding (expires_at)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS geocoding_stats (event TEXT PRIMARY KEY, count INTEGER NOT NULL)"
+            )
+
+    def get_geocoding(self, key: str) -> Optional[GeocodingEntry]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT entry FROM geocoding WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_geocoding(self, key: str, entry: GeocodingEntry, ttl: float) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO geocoding (key, entry, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(entry), time.time() + ttl),
+            )
+            # Entrées expirées purgées au fil des écritures
+            connection.execute("DELETE FROM geocoding WHERE expires_at <= ?", (time.time(),))
+            # Compteurs en attente écrits dans la même transaction
+            self._write_stats(connection)
+
+    def count_geocoding(self, event: str) -> None:
+        with _STATS_LOCK:
+            pending = _PENDING_STATS.setdefault(self.path, Counter())
+            pending[event] += 1
+            flushed_at = _STATS_FLUSHED_AT.setdefault(self.path, time.monotonic())
+            due = pending.total() >= STATS_FLUSH_EVENTS or time.monotonic() - flushed_at >= STATS_FLUSH_INTERVAL
+        if due:
+            self._flush_stats()
+
+    def _flush_stats(self) -> None:
+        with self._connect() as connection:
+            self._write_stats(connection)
+
+    def get_geocoding_stats(self) -> dict[str, int]:
+        self._flush_stats()
+        with self._connect() as connection:
+            return dict(connection.execute("SELECT event, count FROM geocoding_stats").fetchall())
+
+    def _write_stats(self, connection: sqlite3.Connection) -> None:
+        with _STATS_LOCK:
+            pending = _PENDING_STATS.pop(self.path, Counter())
+            _STATS_FLUSHED_AT[self.path] = time.monotonic()
+        if pending:
+            connection.executemany(
+                "INSERT INTO geocoding_stats (event, count) VALUES (?, ?) "
+                "ON CONFLICT(event) DO UPDATE SET count = count + excluded.count",
+                list(pending.items()),
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Connexion courte par opération : utilisable depuis n'importe quel thread ou processus
+        connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+@atexit.register
+def _flush_pending_stats() -> None:
+    # Compteurs pas encore écrits conservés à l'arrêt du processus
+    for path in list(_PENDING_STATS):
+        try:
+            LocalFileSystemHandler(path)._flush_stats()
+        except sqlite3.Error:
+            pass
@@ -15,6 +15,14 @@ class ParkingVeloColumns(str, Enum):
     date_modif = 'date_modif'
     notes = 'notes'
     geometry = 'geometry'
+    filter_mask = 'filter_mask'
+    lon = 'lon'
+    lat = 'lat'
+    x_l93 = 'x_l93'
+    y_l93 = 'y_l93'
+    osm_ids = 'osm_ids'
+    zoom = 'zoom'
+    site_count = 'site_count'
 
     def __str__(self) -> str:
         return self.value
@@ -0,0 +1,21 @@
+from enum import Enum
+from posixpath import join
+
+from data import DATA_PATH, FILTERED_DATA_PATH
+
+
+class ParkingVeloDatasets(str, Enum):
+    parking_velo = 'parking_velo'
+    filtered = 'parking_velo_filtered'
+    sites = 'parking_velo_sites'
+
+    def get_manifest_path(self) -> str:
+        if self == ParkingVeloDatasets.parking_velo:
+            return join(DATA_PATH, f"{self.value}.manifest.json")
+        return join(FILTERED_DATA_PATH, f"{self.value}.manifest.json")
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return self.value
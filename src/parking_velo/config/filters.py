@@ -11,8 +11,17 @@ class ParkingVeloFilters(str, Enum):
     surveille = 'surveille'
     default = 'default'
 
-    def get_path(self) -> str:
-        return join(FILTERED_DATA_PATH, f"parking_velo_filter_{self.value}.parquet")
+    def get_bit(self) -> int:
+        return 1 << list(ParkingVeloFilters).index(self)
+
+    def get_index_path(self) -> str:
+        return join(FILTERED_DATA_PATH, f"parking_velo_filter_{self.value}.index.pkl")
+
+    def get_grid_path(self) -> str:
+        return join(FILTERED_DATA_PATH, f"parking_velo_filter_{self.value}.grid.pkl")
+
+    def get_clusters_path(self) -> str:
+        return join(FILTERED_DATA_PATH, f"parking_velo_filter_{self.value}.clusters.arrow")
 
     def __str__(self) -> str:
         return self.value
@@ -8,6 +8,6 @@ if __name__ == "__main__":
 
     local_fs_handler = LocalFileSystemHandler()
 
-    filtered_data = filter_parking_velo_data(local_fs_handler)
+    filtered_data = filter_parking_velo_data(local_fs_handler, with_grid=True)
 
     logging.info("Filtered data saved successfully.")
@@ -1,15 +1,64 @@
 import logging
+from typing import Optional
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
 
-from src.parking_velo.domain.usecases.get_parking_velo_data import get_parking_velo_data
+from src.parking_velo.domain.usecases.get_parking_velo_data import (
+    get_parking_velo_clusters_in_bbox, get_parking_velo_count, get_parking_velo_data, get_parking_velo_data_in_bbox,
+    get_parking_velo_data_matching, get_parking_velo_manifest, get_shared_parking_velo_data)
+from src.parking_velo.config.datasets import ParkingVeloDatasets
 from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.entities.parking_velo_manifest import ParkingVeloManifest
+from src.parking_velo.domain.entities.parking_velo_predicate import ParkingVeloPredicate
+from src.parking_velo.domain.ports.file_system_handler import BBox
 from src.parking_velo.infrastructure.local_file_system_handler import LocalFileSystemHandler
 
 
-def get_parking_velo(filter: ParkingVeloFilters) -> gpd.GeoDataFrame:
-    local_fs_handler = LocalFileSystemHandler()
-    return get_parking_velo_data(file_system_handler=local_fs_handler, filter=filter)
+def get_parking_velo(filter: ParkingVeloFilters, columns: Optional[list[str]] = None) -> gpd.GeoDataFrame:
+    local_fs_handler = LocalFileSystemHandler(use_cache=True)
+    return get_parking_velo_data(file_system_handler=local_fs_handler, filter=filter, columns=columns)
+
+
+def get_shared_parking_velo(
+    filter: ParkingVeloFilters, columns: Optional[list[str]] = None
+) -> tuple[pd.DataFrame, np.ndarray]:
+    local_fs_handler = LocalFileSystemHandler(use_cache=True)
+    return get_shared_parking_velo_data(file_system_handler=local_fs_handler, filter=filter, columns=columns)
+
+
+def get_parking_velo_matching(
+    predicate: ParkingVeloPredicate, columns: Optional[list[str]] = None
+) -> gpd.GeoDataFrame:
+    local_fs_handler = LocalFileSystemHandler(use_cache=True)
+    return get_parking_velo_data_matching(
+        file_system_handler=local_fs_handler, predicate=predicate, columns=columns
+    )
+
+
+def get_parking_velo_in_bbox(
+    filter: ParkingVeloFilters, bbox: BBox, limit: Optional[int] = None, columns: Optional[list[str]] = None
+) -> tuple[pd.DataFrame, int]:
+    local_fs_handler = LocalFileSystemHandler(use_cache=True)
+    return get_parking_velo_data_in_bbox(
+        file_system_handler=local_fs_handler, filter=filter, bbox=bbox, limit=limit, columns=columns
+    )
+
+
+def get_parking_velo_clusters(filter: ParkingVeloFilters, bbox: BBox, zoom: int) -> Optional[pd.DataFrame]:
+    local_fs_handler = LocalFileSystemHandler(use_cache=True)
+    return get_parking_velo_clusters_in_bbox(file_system_handler=local_fs_handler, filter=filter, bbox=bbox, zoom=zoom)
+
+
+def get_parking_velo_dataset_manifest(dataset: ParkingVeloDatasets) -> ParkingVeloManifest:
+    local_fs_handler = LocalFileSystemHandler(use_cache=True)
+    return get_parking_velo_manifest(file_system_handler=local_fs_handler, dataset=dataset)
+
+
+def get_parking_velo_filter_count(filter: ParkingVeloFilters) -> int:
+    local_fs_handler = LocalFileSystemHandler(use_cache=True)
+    return get_parking_velo_count(file_system_handler=local_fs_handler, filter=filter)
 
 
 if __name__ == "__main__":
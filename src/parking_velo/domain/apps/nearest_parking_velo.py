@@ -1,14 +1,34 @@
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
 import pandas as pd
 from shapely.geometry import Point
 
 from src.parking_velo.config.filters import ParkingVeloFilters
-from src.parking_velo.domain.usecases.find_nearest_parking_velo import find_nearest_parking_velo
+from src.parking_velo.domain.usecases.find_nearest_parking_velo import (
+    find_nearest_parking_velo, find_nearest_parking_velo_batch, find_nearest_parking_velo_matching)
+from src.parking_velo.domain.entities.parking_velo_predicate import ParkingVeloPredicate
 from src.parking_velo.infrastructure.local_file_system_handler import LocalFileSystemHandler
 
 
-def get_nearest_parking_velo(point: Point, filtre: ParkingVeloFilters) -> pd.Series:
-    local_file_system_handler = LocalFileSystemHandler()
-    return find_nearest_parking_velo(local_file_system_handler, point, filtre)
+def get_nearest_parking_velo(
+    point: Point, filtre: ParkingVeloFilters, columns: Optional[list[str]] = None
+) -> pd.Series:
+    local_file_system_handler = LocalFileSystemHandler(use_cache=True)
+    return find_nearest_parking_velo(local_file_system_handler, point, filtre, columns)
+
+
+def get_nearest_parking_velo_batch(xs: np.ndarray, ys: np.ndarray, filtre: ParkingVeloFilters) -> gpd.GeoDataFrame:
+    local_file_system_handler = LocalFileSystemHandler(use_cache=True)
+    return find_nearest_parking_velo_batch(local_file_system_handler, xs, ys, filtre)
+
+
+def get_nearest_parking_velo_matching(
+    point: Point, predicate: ParkingVeloPredicate, columns: Optional[list[str]] = None
+) -> Optional[pd.Series]:
+    local_file_system_handler = LocalFileSystemHandler(use_cache=True)
+    return find_nearest_parking_velo_matching(local_file_system_handler, point, predicate, columns)
 
 
 if __name__ == "__main__":
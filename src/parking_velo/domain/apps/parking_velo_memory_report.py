@@ -0,0 +1,21 @@
+import logging
+
+import geopandas as gpd
+import numpy as np
+
+from data import PATH_PARKING_VELO
+from src.parking_velo.domain.entities.compact_parking_velo import (
+    CATEGORY_COLUMNS, INTEGER_COLUMNS, STRING_COLUMNS, compact_parking_velo, parking_velo_memory_report)
+
+
+if __name__ == "__main__":
+    logging.info("Parking vélo memory report...")
+
+    df_gpd = gpd.read_parquet(PATH_PARKING_VELO)
+    # Représentation d'origine : chaînes en objets Python, entiers sur 64 bits
+    df_gpd_before = df_gpd.astype({
+        **{column: object for column in CATEGORY_COLUMNS + STRING_COLUMNS if column in df_gpd.columns},
+        **{column: np.int64 for column in INTEGER_COLUMNS if column in df_gpd.columns},
+    })
+
+    print(parking_velo_memory_report(df_gpd_before, compact_parking_velo(df_gpd_before)))
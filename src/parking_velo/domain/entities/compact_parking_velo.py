@@ -0,0 +1,59 @@
+import pandas as pd
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+
+# Attributs à peu de valeurs distinctes : encodés en dictionnaire (catégories pandas, dictionnaire Arrow sur disque)
+CATEGORY_COLUMNS = [
+    ParkingVeloColumns.couvert.value,
+    ParkingVeloColumns.acces.value,
+    ParkingVeloColumns.payant.value,
+    ParkingVeloColumns.surveille.value,
+    ParkingVeloColumns.type.value,
+    ParkingVeloColumns.insee_com.value,
+    ParkingVeloColumns.nom_com.value,
+]
+
+# Textes libres : chaînes Arrow contiguës plutôt qu'objets Python
+STRING_COLUMNS = [
+    ParkingVeloColumns.osm_id.value,
+    ParkingVeloColumns.nom.value,
+    ParkingVeloColumns.notes.value,
+]
+
+INTEGER_COLUMNS = [
+    ParkingVeloColumns.capacite.value,
+]
+
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+
+def compact_parking_velo(df: pd.DataFrame) -> pd.DataFrame:
+    # Sans effet sur un jeu déjà compact : seules les colonnes au mauvais type sont converties
+    dtypes = {}
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            dtypes[column] = "category"
+    for column in STRING_COLUMNS:
+        if column in df.columns and df[column].dtype != STRING_DTYPE:
+            dtypes[column] = STRING_DTYPE
+    df = df.astype(dtypes) if dtypes else df
+
+    downcast = {
+        column: pd.to_numeric(df[column], downcast="integer")
+        for column in INTEGER_COLUMNS
+        if column in df.columns and pd.api.types.is_integer_dtype(df[column].dtype)
+    }
+    return df.assign(**downcast) if downcast else df
+
+
+def parking_velo_memory_report(df_before: pd.DataFrame, df_after: pd.DataFrame) -> pd.DataFrame:
+    # Empreinte mémoire par colonne (en octets, chaînes comprises) avant et après compactage
+    report = pd.DataFrame({
+        "dtype_before": df_before.dtypes.astype(str),
+        "bytes_before": df_before.memory_usage(index=False, deep=True),
+        "dtype_after": df_after.dtypes.astype(str),
+        "bytes_after": df_after.memory_usage(index=False, deep=True),
+    })
+    report.loc["total", ["bytes_before", "bytes_after"]] = report[["bytes_before", "bytes_after"]].sum()
+    report["ratio"] = report["bytes_after"] / report["bytes_before"]
+    return report
@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+import numpy as np
+import pyproj
+from shapely.geometry import Point
+
+WGS84 = "EPSG:4326"
+LAMBERT93 = "EPSG:2154"
+
+
+@lru_cache(maxsize=1)
+def wgs84_to_lambert93() -> pyproj.Transformer:
+    return pyproj.Transformer.from_crs(WGS84, LAMBERT93, always_xy=True)
+
+
+def to_lambert93(lons: np.ndarray, lats: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    xs, ys = wgs84_to_lambert93().transform(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+    return np.asarray(xs), np.asarray(ys)
+
+
+def point_to_lambert93(point: Point) -> Point:
+    x, y = wgs84_to_lambert93().transform(point.x, point.y)
+    return Point(x, y)
+
+
+def bbox_to_lambert93(bbox: tuple[float, float, float, float]) -> tuple[float, float, float, float]:
+    # Bords densifiés : l'emprise Lambert-93 couvre aussi la courbure des parallèles
+    return wgs84_to_lambert93().transform_bounds(*bbox, densify_pts=21)
@@ -0,0 +1,38 @@
+from typing import Iterable
+
+import geopandas as gpd
+import pandas as pd
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.compact_parking_velo import compact_parking_velo
+from src.parking_velo.domain.entities.parking_velo_to_gpd import parking_velo_to_gpd
+
+KEY_COLUMNS = [ParkingVeloColumns.osm_id.value, ParkingVeloColumns.date_modif.value]
+# Colonnes que la fusion suppose présentes dans les données enregistrées : sinon rechargement complet
+REQUIRED_COLUMNS = [*KEY_COLUMNS, ParkingVeloColumns.x_l93.value, ParkingVeloColumns.y_l93.value]
+
+
+def merge_parking_velo_data(
+    df_gpd_existing: gpd.GeoDataFrame, source_batches: Iterable[pd.DataFrame]
+) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame, pd.Series]:
+    existing_keys = pd.MultiIndex.from_frame(df_gpd_existing[KEY_COLUMNS])
+
+    source_keys = []
+    df_gpd_changed_batches = []
+    for df_source in source_batches:
+        batch_keys = pd.MultiIndex.from_frame(df_source[KEY_COLUMNS])
+        source_keys.append(df_source[KEY_COLUMNS])
+        # Seules les lignes nouvelles ou modifiées sont reconverties
+        df_gpd_changed_batches.append(parking_velo_to_gpd(df_source[~batch_keys.isin(existing_keys)]))
+
+    kept = existing_keys.isin(pd.MultiIndex.from_frame(pd.concat(source_keys, ignore_index=True)))
+    # Les lots sans changement sont écartés de la concaténation, le premier garde le schéma si tous sont vides
+    df_gpd_changed = compact_parking_velo(pd.concat(
+        [batch for batch in df_gpd_changed_batches if len(batch)] or df_gpd_changed_batches[:1], ignore_index=True
+    ))
+    dropped_osm_ids = df_gpd_existing.loc[~kept, ParkingVeloColumns.osm_id]
+
+    df_gpd_merged = compact_parking_velo(pd.concat(
+        [df_gpd_existing[kept], df_gpd_changed] if len(df_gpd_changed) else [df_gpd_existing[kept]], ignore_index=True
+    ))
+    return df_gpd_merged, df_gpd_changed, dropped_osm_ids  # type: ignore
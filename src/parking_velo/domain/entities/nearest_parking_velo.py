@@ -1,7 +1,88 @@
+from typing import Optional
+
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
 from shapely.geometry import Point
 
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.lambert93 import WGS84, point_to_lambert93, to_lambert93
+from src.parking_velo.domain.entities.parking_velo_grid import ParkingVeloGrid
+from src.parking_velo.domain.entities.parking_velo_index import ParkingVeloIndex
+
+
+def nearest_parking_velo(
+    df_parking_velo: pd.DataFrame,
+    positions: np.ndarray,
+    point: Point,
+    index: Optional[ParkingVeloIndex] = None,
+    grid: Optional[ParkingVeloGrid] = None,
+) -> pd.Series:
+    # positions : lignes du filtre dans le jeu partagé, index et grille travaillent dans ce sous-ensemble
+    if len(positions) == 0:
+        raise ValueError("Aucun parking vélo ne correspond à ce filtre")
+    point_l93 = point_to_lambert93(point)
+    position = None
+    if grid is not None and len(grid) == len(positions):
+        position = grid.nearest(point_l93)
+    if position is None and index is not None and len(index) == len(positions):
+        position = index.nearest(point_l93)
+    if position is None:
+        # Sans index à jour : seules les lignes du filtre sont converties, pas les colonnes entières
+        xs = df_parking_velo[ParkingVeloColumns.x_l93].iloc[positions].to_numpy(dtype=float)
+        ys = df_parking_velo[ParkingVeloColumns.y_l93].iloc[positions].to_numpy(dtype=float)
+        position = int(np.argmin(np.hypot(xs - point_l93.x, ys - point_l93.y)))
+
+    return _parking_velo_row(df_parking_velo, int(positions[position]))
+
+
+def nearest_parking_velo_batch(
+    df_parking_velo: pd.DataFrame,
+    positions: np.ndarray,
+    lons: np.ndarray,
+    lats: np.ndarray,
+    index: Optional[ParkingVeloIndex] = None,
+) -> gpd.GeoDataFrame:
+    if index is None or len(index) != len(positions):
+        index = ParkingVeloIndex.from_lambert93(df_parking_velo.iloc[positions])
+
+    nearest_positions, distances = index.nearest_many(shapely.points(*to_lambert93(lons, lats)))
+    # Seules les lignes trouvées sont lues dans les colonnes Arrow
+    rows = positions[nearest_positions]
+    return gpd.GeoDataFrame(
+        {
+            ParkingVeloColumns.osm_id.value: df_parking_velo[ParkingVeloColumns.osm_id].iloc[rows].to_numpy(),
+            "distance": distances,
+        },
+        geometry=gpd.points_from_xy(
+            df_parking_velo[ParkingVeloColumns.lon].iloc[rows].to_numpy(dtype=float),
+            df_parking_velo[ParkingVeloColumns.lat].iloc[rows].to_numpy(dtype=float),
+        ),
+        crs=WGS84,
+    )
+
+
+def nearest_parking_velo_matching(
+    df_parking_velo: gpd.GeoDataFrame, point: Point, mask: np.ndarray, index: Optional[ParkingVeloIndex] = None
+) -> Optional[pd.Series]:
+    if index is None or len(index) != len(df_parking_velo):
+        index = ParkingVeloIndex.from_lambert93(df_parking_velo)
+
+    position = index.nearest_where(point_to_lambert93(point), mask)
+    if position is None:
+        return None
+    return _parking_velo_row(df_parking_velo, position)
+
 
-def nearest_parking_velo(df_parking_velo: gpd.GeoDataFrame, point: Point) -> gpd.GeoSeries:
-    min_idx = df_parking_velo.distance(point).idxmin()
-    return df_parking_velo.loc[min_idx]  # type: ignore
+def _parking_velo_row(df_parking_velo: pd.DataFrame, row: int) -> pd.Series:
+    # Forme commune aux recherches : attributs lus, lon, lat et géométrie WGS84, nommée par sa ligne
+    # Lecture colonne par colonne : évite de matérialiser toute la ligne du tableau Arrow
+    parking_velo = {column: df_parking_velo[column].iloc[row] for column in df_parking_velo.columns}
+    geometry = parking_velo.get(ParkingVeloColumns.geometry.value)
+    if geometry is None:
+        geometry = Point(parking_velo[ParkingVeloColumns.lon.value], parking_velo[ParkingVeloColumns.lat.value])
+    parking_velo[ParkingVeloColumns.lon.value] = geometry.x
+    parking_velo[ParkingVeloColumns.lat.value] = geometry.y
+    parking_velo[ParkingVeloColumns.geometry.value] = geometry
+    return pd.Series(parking_velo, name=row)
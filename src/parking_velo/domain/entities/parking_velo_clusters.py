@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.compact_parking_velo import compact_parking_velo
+
+# Zooms servis en agrégats : de toute l'Île-de-France à l'échelle du quartier, au-delà parkings un à un
+CLUSTER_MIN_ZOOM = 8
+CLUSTER_MAX_ZOOM = 15
+# Taille d'un agrégat à l'écran, en pixels de tuiles de 256 pixels
+CLUSTER_RADIUS_PX = 60
+TILE_SIZE = 256
+
+
+def parking_velo_clusters(
+    df_sites: pd.DataFrame,
+    min_zoom: int = CLUSTER_MIN_ZOOM,
+    max_zoom: int = CLUSTER_MAX_ZOOM,
+    radius_px: int = CLUSTER_RADIUS_PX,
+) -> pd.DataFrame:
+    # Pyramide d'agrégats, un niveau par zoom : chaque cellule d'un niveau réunit quatre cellules du niveau suivant
+    lons = df_sites[ParkingVeloColumns.lon].to_numpy(dtype=float)
+    lats = df_sites[ParkingVeloColumns.lat].to_numpy(dtype=float)
+    capacities = pd.to_numeric(df_sites[ParkingVeloColumns.capacite]).fillna(0).to_numpy(dtype=np.int64)
+    osm_ids = df_sites[ParkingVeloColumns.osm_id].to_numpy(dtype=object)
+
+    # Cellules fixes du zoom le plus fin en coordonnées Web Mercator normalisées, divisées par deux à chaque niveau.
+    # Grille et non fusion par rayon : deux sites proches de part et d'autre d'un bord de cellule restent
+    # dans deux agrégats distincts, dont les positions moyennes peuvent presque se superposer
+    scale = TILE_SIZE * 2 ** max_zoom / radius_px
+    cols = np.floor((lons + 180) / 360 * scale).astype(np.int64)
+    rows = np.floor((0.5 - np.log(np.tan(np.pi / 4 + np.radians(lats) / 2)) / (2 * np.pi)) * scale).astype(np.int64)
+
+    levels = []
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        shift = max_zoom - zoom
+        cells = ((cols >> shift) << 32) | (rows >> shift)
+        _, first, labels, counts = np.unique(cells, return_index=True, return_inverse=True, return_counts=True)
+        levels.append(pd.DataFrame({
+            ParkingVeloColumns.zoom.value: np.full(len(counts), zoom, dtype=np.int8),
+            ParkingVeloColumns.lon.value: np.bincount(labels, weights=lons) / counts,
+            ParkingVeloColumns.lat.value: np.bincount(labels, weights=lats) / counts,
+            ParkingVeloColumns.site_count.value: counts.astype(np.int32),
+            ParkingVeloColumns.capacite.value: np.bincount(labels, weights=capacities).astype(np.int64),
+            # Identifiant gardé pour les agrégats d'un seul site, affichés comme un parking
+            ParkingVeloColumns.osm_id.value: np.where(counts == 1, osm_ids[first], None),
+        }))
+
+    return compact_parking_velo(pd.concat(levels[::-1], ignore_index=True))
+
+
+def parking_velo_clusters_in_bbox(
+    df_clusters: pd.DataFrame, zoom: int, bbox: tuple[float, float, float, float]
+) -> pd.DataFrame:
+    # Niveaux triés par zoom : le niveau demandé est une tranche contiguë du tableau
+    zooms = df_clusters[ParkingVeloColumns.zoom].to_numpy()
+    zoom = int(np.clip(zoom, zooms[0], zooms[-1]))
+    start, stop = np.searchsorted(zooms, [zoom, zoom + 1])
+
+    xmin, ymin, xmax, ymax = bbox
+    lons = df_clusters[ParkingVeloColumns.lon].to_numpy(dtype=float)[start:stop]
+    lats = df_clusters[ParkingVeloColumns.lat].to_numpy(dtype=float)[start:stop]
+    inside = (lons >= xmin) & (lons <= xmax) & (lats >= ymin) & (lats <= ymax)
+    return df_clusters.iloc[start + np.flatnonzero(inside)]
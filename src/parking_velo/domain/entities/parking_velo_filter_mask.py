@@ -0,0 +1,26 @@
+from typing import Callable
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.filters import ParkingVeloFilters
+
+
+def parking_velo_filter_mask(
+    df: gpd.GeoDataFrame,
+    filter_list: list[tuple[ParkingVeloFilters, Callable[[gpd.GeoDataFrame], pd.Series]]],
+) -> pd.Series:
+    mask = np.zeros(len(df), dtype=np.uint8)
+    for filter, filter_function in filter_list:
+        mask[np.asarray(filter_function(df), dtype=bool)] |= filter.get_bit()
+    return pd.Series(mask, index=df.index, name=ParkingVeloColumns.filter_mask.value)
+
+
+def parking_velo_filter_positions(df: pd.DataFrame, filter: ParkingVeloFilters) -> np.ndarray:
+    return np.flatnonzero(df[ParkingVeloColumns.filter_mask].to_numpy() & filter.get_bit())
+
+
+def select_parking_velo_filter(df: gpd.GeoDataFrame, filter: ParkingVeloFilters) -> gpd.GeoDataFrame:
+    return df.iloc[parking_velo_filter_positions(df, filter)]  # type: ignore
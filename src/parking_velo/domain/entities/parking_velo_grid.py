@@ -0,0 +1,104 @@
+from typing import Optional
+
+import numpy as np
+import shapely
+from shapely.geometry import Point
+
+from src.parking_velo.domain.entities.parking_velo_index import ParkingVeloIndex
+
+# Emprise de l'Île-de-France en Lambert-93, cellules de 1 km
+ILE_DE_FRANCE_BOUNDS = (583_000.0, 6_780_000.0, 742_000.0, 6_906_000.0)
+GRID_CELL_SIZE = 1_000.0
+
+# Cellules aux candidats trop nombreux divisées en quatre, jusqu'à 62,5 m de côté dans les zones denses
+MAX_CELL_CANDIDATES = 32
+MIN_CELL_SIZE = GRID_CELL_SIZE / 16
+
+# Quart de cellule fille : (décalage en x, décalage en y), numéroté (haut << 1) | droite
+CHILD_OFFSETS_X = np.array([0, 1, 0, 1])
+CHILD_OFFSETS_Y = np.array([0, 0, 1, 1])
+
+
+class ParkingVeloGrid:
+    def __init__(
+        self,
+        index: ParkingVeloIndex,
+        bounds: tuple[float, float, float, float] = ILE_DE_FRANCE_BOUNDS,
+        cell_size: float = GRID_CELL_SIZE,
+        max_candidates: int = MAX_CELL_CANDIDATES,
+        min_cell_size: float = MIN_CELL_SIZE,
+    ):
+        self.fingerprint = index.fingerprint
+        self.xmin, self.ymin, xmax, ymax = bounds
+        self.cell_size = cell_size
+        self.n_cols = int(np.ceil((xmax - self.xmin) / cell_size))
+        self.n_rows = int(np.ceil((ymax - self.ymin) / cell_size))
+        self.xs = shapely.get_x(index.geometries)
+        self.ys = shapely.get_y(index.geometries)
+
+        # Arbre de cellules : les cellules de premier niveau sont numérotées row * n_cols + col,
+        # les quatre filles d'une cellule divisée se suivent à partir de first_child
+        cols, rows = np.meshgrid(np.arange(self.n_cols), np.arange(self.n_rows))
+        level_nodes = np.arange(self.n_cols * self.n_rows)
+        level_x0 = self.xmin + cols.ravel() * cell_size
+        level_y0 = self.ymin + rows.ravel() * cell_size
+        n_nodes = len(level_nodes)
+        first_child = np.full(n_nodes, -1, dtype=np.int32)
+        leaf_nodes, leaf_candidates = [], []
+
+        size = cell_size
+        while len(level_nodes) > 0 and len(index) > 0:
+            # Le plus proche de tout point de la cellule est à moins de d(centre) + diagonale du centre
+            centers = shapely.points(level_x0 + size / 2, level_y0 + size / 2)
+            _, center_distances = index.nearest_many(centers)
+            cells, candidates = index.tree.query(
+                centers, predicate="dwithin", distance=center_distances + size * np.sqrt(2)
+            )
+
+            split = np.bincount(cells, minlength=len(level_nodes)) > max_candidates
+            if size / 2 < min_cell_size:
+                split[:] = False
+            leaf = ~split[cells]
+            leaf_nodes.append(level_nodes[cells[leaf]])
+            leaf_candidates.append(candidates[leaf])
+
+            # Cellules divisées : quatre filles de côté moitié, examinées au tour suivant
+            n_split = int(np.count_nonzero(split))
+            first_child = np.concatenate([first_child, np.full(4 * n_split, -1, dtype=np.int32)])
+            first_child[level_nodes[split]] = n_nodes + 4 * np.arange(n_split)
+
+            size /= 2
+            level_nodes = n_nodes + np.arange(4 * n_split)
+            level_x0 = np.repeat(level_x0[split], 4) + np.tile(CHILD_OFFSETS_X, n_split) * size
+            level_y0 = np.repeat(level_y0[split], 4) + np.tile(CHILD_OFFSETS_Y, n_split) * size
+            n_nodes += 4 * n_split
+
+        self.first_child = first_child
+        nodes = np.concatenate(leaf_nodes) if leaf_nodes else np.array([], dtype=np.int64)
+        order = np.argsort(nodes, kind="stable")
+        self.candidates = (np.concatenate(leaf_candidates)[order] if leaf_candidates else nodes).astype(np.int32)
+        self.offsets = np.searchsorted(nodes[order], np.arange(n_nodes + 1)).astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def nearest(self, point: Point) -> Optional[int]:
+        col = int((point.x - self.xmin) // self.cell_size)
+        row = int((point.y - self.ymin) // self.cell_size)
+        if not (0 <= col < self.n_cols and 0 <= row < self.n_rows):
+            return None
+
+        # Descente jusqu'à la cellule non divisée qui contient le point
+        node = row * self.n_cols + col
+        x0, y0, size = self.xmin + col * self.cell_size, self.ymin + row * self.cell_size, self.cell_size
+        while self.first_child[node] >= 0:
+            size /= 2
+            right, top = int(point.x >= x0 + size), int(point.y >= y0 + size)
+            node = int(self.first_child[node]) + (top << 1 | right)
+            x0, y0 = x0 + right * size, y0 + top * size
+
+        candidates = self.candidates[self.offsets[node]:self.offsets[node + 1]]
+        if len(candidates) == 0:
+            return None
+        distances = np.hypot(self.xs[candidates] - point.x, self.ys[candidates] - point.y)
+        return int(candidates[np.argmin(distances)])
@@ -0,0 +1,33 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.lambert93 import bbox_to_lambert93
+from src.parking_velo.domain.entities.parking_velo_index import ParkingVeloIndex
+
+
+def parking_velo_in_bbox(
+    df_parking_velo: pd.DataFrame,
+    positions: np.ndarray,
+    bbox: tuple[float, float, float, float],
+    index: Optional[ParkingVeloIndex] = None,
+    limit: Optional[int] = None,
+) -> tuple[pd.DataFrame, int]:
+    # bbox en WGS84 (xmin, ymin, xmax, ymax) ; renvoie les parkings retenus et le nombre total dans l'emprise
+    if index is not None and len(index) == len(positions):
+        candidates = positions[index.within_bbox(bbox_to_lambert93(bbox))]
+    else:
+        candidates = positions
+
+    xmin, ymin, xmax, ymax = bbox
+    lons = df_parking_velo[ParkingVeloColumns.lon].iloc[candidates].to_numpy(dtype=float)
+    lats = df_parking_velo[ParkingVeloColumns.lat].iloc[candidates].to_numpy(dtype=float)
+    rows = candidates[(lons >= xmin) & (lons <= xmax) & (lats >= ymin) & (lats <= ymax)]
+
+    total = len(rows)
+    if limit is not None and total > limit:
+        # Tirage régulier dans l'ordre de Hilbert : les parkings gardés restent répartis sur toute l'emprise
+        rows = rows[np.linspace(0, total - 1, max(limit, 0)).astype(int)]
+    return df_parking_velo.iloc[rows], total
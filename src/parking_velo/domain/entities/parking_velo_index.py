@@ -0,0 +1,85 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import Point
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+
+# En dessous de ce nombre de candidats, un calcul direct des distances est plus rapide
+BRUTE_FORCE_LIMIT = 1_024
+
+
+class ParkingVeloIndex:
+    def __init__(self, geometries: np.ndarray, fingerprint: Optional[str] = None):
+        # fingerprint : empreinte du jeu de données indexé, comparée à celle de son manifeste
+        self.fingerprint = fingerprint
+        self.geometries = np.asarray(geometries, dtype=object)
+        self.tree = shapely.STRtree(self.geometries)
+
+        # Filtre sans aucun parking : index vide, sans emprise
+        self.mean_spacing = 0.0
+        if len(self.geometries) > 0:
+            xmin, ymin, xmax, ymax = shapely.total_bounds(self.geometries)
+            area = max((xmax - xmin) * (ymax - ymin), np.finfo(float).eps)
+            self.mean_spacing = float(np.sqrt(area / len(self.geometries)))
+
+    @classmethod
+    def from_lambert93(cls, df: pd.DataFrame, fingerprint: Optional[str] = None) -> "ParkingVeloIndex":
+        # Index construit en Lambert-93 : distances et rayons exprimés en mètres
+        return cls(shapely.points(
+            df[ParkingVeloColumns.x_l93].to_numpy(dtype=float),
+            df[ParkingVeloColumns.y_l93].to_numpy(dtype=float),
+        ), fingerprint)
+
+    def __len__(self) -> int:
+        return len(self.geometries)
+
+    def nearest(self, point: Point) -> int:
+        return int(self.tree.query_nearest(point)[0])
+
+    def nearest_many(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        (input_positions, positions), distances = self.tree.query_nearest(
+            points, return_distance=True, all_matches=False
+        )
+        order = np.argsort(input_positions, kind="stable")
+        return positions[order], distances[order]
+
+    def within_radius(self, point: Point, radius: float) -> np.ndarray:
+        positions = self.tree.query(point, predicate="dwithin", distance=radius)
+        distances = shapely.distance(self.geometries[positions], point)
+        return positions[np.argsort(distances, kind="stable")]
+
+    def within_bbox(self, bbox: tuple[float, float, float, float]) -> np.ndarray:
+        # Candidats dont la position intersecte l'emprise, dans l'ordre des lignes
+        return np.sort(self.tree.query(shapely.box(*bbox)))
+
+    def k_nearest(self, point: Point, k: int) -> np.ndarray:
+        if k <= 1:
+            return np.array([self.nearest(point)])[:max(k, 0)]
+
+        _, distance = self.tree.query_nearest(point, return_distance=True)
+        radius = max(float(distance[0]), self.mean_spacing)
+        while True:
+            positions = self.within_radius(point, radius)
+            if len(positions) >= k or len(positions) == len(self):
+                return positions[:k]
+            radius *= 2
+
+    def nearest_where(self, point: Point, mask: np.ndarray) -> Optional[int]:
+        positions = np.flatnonzero(mask)
+        if len(positions) == 0:
+            return None
+        if len(positions) <= BRUTE_FORCE_LIMIT:
+            return int(positions[np.argmin(shapely.distance(self.geometries[positions], point))])
+
+        # Rayon initial : distance attendue au plus proche parmi les parkings retenus
+        _, distance = self.tree.query_nearest(point, return_distance=True)
+        radius = max(float(distance[0]), self.mean_spacing / np.sqrt(len(positions) / len(self)))
+        while True:
+            candidates = self.within_radius(point, radius)
+            matching = candidates[mask[candidates]]
+            if len(matching) > 0:
+                return int(matching[0])
+            radius *= 2
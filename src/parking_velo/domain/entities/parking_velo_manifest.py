@@ -0,0 +1,50 @@
+import hashlib
+import json
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.filters import ParkingVeloFilters
+
+ParkingVeloManifest = dict[str, Any]
+
+
+def parking_velo_manifest(
+    df_gpd: gpd.GeoDataFrame, source_timestamp: Optional[str], build_duration: float
+) -> ParkingVeloManifest:
+    # Métadonnées lisibles sans décoder le jeu de données
+    manifest: ParkingVeloManifest = {
+        "row_count": len(df_gpd),
+        "bbox": None if df_gpd.empty else [float(bound) for bound in df_gpd.total_bounds],
+        "schema_hash": schema_hash(df_gpd),
+        "fingerprint": parking_velo_fingerprint(df_gpd),
+        "source_timestamp": source_timestamp,
+        "built_at": datetime.now(UTC).isoformat(),
+        "build_duration": round(build_duration, 3),
+    }
+    if ParkingVeloColumns.filter_mask.value in df_gpd.columns:
+        filter_mask = df_gpd[ParkingVeloColumns.filter_mask].to_numpy()
+        manifest["filter_counts"] = {
+            filter.value: int(np.count_nonzero(filter_mask & filter.get_bit())) for filter in ParkingVeloFilters
+        }
+    return manifest
+
+
+def schema_hash(df_gpd: gpd.GeoDataFrame) -> str:
+    schema = [[str(column), str(dtype)] for column, dtype in df_gpd.dtypes.items()]
+    return hashlib.sha256(json.dumps(schema).encode()).hexdigest()[:16]
+
+
+def parking_velo_fingerprint(df: pd.DataFrame) -> str:
+    # Empreinte des lignes dans leur ordre (identifiants et coordonnées) : un index ou une grille
+    # construit sur d'autres lignes n'est plus valable, même à nombre de lignes égal
+    columns = [
+        column.value for column in (ParkingVeloColumns.osm_id, ParkingVeloColumns.x_l93, ParkingVeloColumns.y_l93)
+        if column.value in df.columns
+    ]
+    row_hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return hashlib.sha256(schema_hash(df).encode() + row_hashes.tobytes()).hexdigest()[:16]
@@ -0,0 +1,35 @@
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+# Conjonction de conditions (colonne, opérateur, valeur), au format des filtres parquet de pyarrow
+ParkingVeloPredicate = list[tuple[str, str, Any]]
+
+OPERATORS: dict[str, Callable[[pd.Series, Any], pd.Series]] = {
+    "=": lambda column, value: column == value,
+    "==": lambda column, value: column == value,
+    "!=": lambda column, value: column.notna() & (column != value),
+    "<": lambda column, value: column < value,
+    "<=": lambda column, value: column <= value,
+    ">": lambda column, value: column > value,
+    ">=": lambda column, value: column >= value,
+    "in": lambda column, value: column.isin(value),
+    "not in": lambda column, value: column.notna() & ~column.isin(value),
+}
+
+
+ORDERING_OPERATORS = {"<", "<=", ">", ">="}
+
+
+def parking_velo_predicate_mask(df: pd.DataFrame, predicate: ParkingVeloPredicate) -> np.ndarray:
+    mask = np.ones(len(df), dtype=bool)
+    for column, operator, value in predicate:
+        if operator not in OPERATORS:
+            raise ValueError(f"Opérateur non supporté: {operator}")
+        series = df[str(column)]
+        if operator in ORDERING_OPERATORS and isinstance(series.dtype, pd.CategoricalDtype):
+            # Catégories non ordonnées : la comparaison porte sur les valeurs
+            series = series.astype(series.cat.categories.dtype)
+        mask &= OPERATORS[operator](series, value).fillna(False).to_numpy(dtype=bool)
+    return mask
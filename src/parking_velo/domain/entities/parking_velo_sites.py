@@ -0,0 +1,149 @@
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.compact_parking_velo import compact_parking_velo
+from src.parking_velo.domain.entities.lambert93 import WGS84
+
+# Rayon de regroupement en mètres : les arceaux d'une même rue ou d'un même abri forment un site
+SITE_RADIUS = 15.0
+# Côté maximal d'un site en mètres : une file d'arceaux le long d'une rue est découpée en plusieurs sites
+SITE_MAX_SIZE = 40.0
+
+
+def parking_velo_site_labels(
+    df: pd.DataFrame,
+    radius: float = SITE_RADIUS,
+    max_size: float = SITE_MAX_SIZE,
+    groups: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    # Composantes connexes du graphe « à moins de radius mètres », numérotées de 0 à n_sites - 1
+    # groups : deux parkings de groupes différents ne sont jamais réunis
+    labels = np.arange(len(df))
+    if radius <= 0 or len(df) == 0:
+        return labels
+
+    xs = df[ParkingVeloColumns.x_l93].to_numpy(dtype=float)
+    ys = df[ParkingVeloColumns.y_l93].to_numpy(dtype=float)
+    points = shapely.points(xs, ys)
+    left, right = shapely.STRtree(points).query(points, predicate="dwithin", distance=radius)
+    if groups is not None:
+        same_group = groups[left] == groups[right]
+        left, right = left[same_group], right[same_group]
+
+    # Propagation du plus petit label voisin puis saut de pointeurs, jusqu'à stabilité
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, left, labels[right])
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    labels = np.unique(labels, return_inverse=True)[1]
+    return _split_large_sites(labels, xs, ys, max_size)
+
+
+def _split_large_sites(labels: np.ndarray, xs: np.ndarray, ys: np.ndarray, max_size: float) -> np.ndarray:
+    # Le chaînage à radius mètres n'a pas de limite : un site plus large que max_size est découpé
+    # selon une grille de max_size mètres, les sites compacts restent entiers
+    n_sites = int(labels.max()) + 1
+    xmin, ymin = np.full(n_sites, np.inf), np.full(n_sites, np.inf)
+    xmax, ymax = np.full(n_sites, -np.inf), np.full(n_sites, -np.inf)
+    np.minimum.at(xmin, labels, xs)
+    np.minimum.at(ymin, labels, ys)
+    np.maximum.at(xmax, labels, xs)
+    np.maximum.at(ymax, labels, ys)
+    large = ((xmax - xmin) > max_size) | ((ymax - ymin) > max_size)
+    if not large.any():
+        return labels
+
+    in_large = large[labels]
+    cells = np.column_stack([
+        labels,
+        np.where(in_large, np.floor(xs / max_size), 0).astype(np.int64),
+        np.where(in_large, np.floor(ys / max_size), 0).astype(np.int64),
+    ])
+    return np.unique(cells, axis=0, return_inverse=True)[1].ravel()
+
+
+# Agrégations vectorisées par pandas, les autres colonnes sont traitées à part
+SITE_AGGREGATIONS = {
+    ParkingVeloColumns.osm_id.value: "first",
+    ParkingVeloColumns.date_modif.value: "max",
+    ParkingVeloColumns.x_l93.value: "mean",
+    ParkingVeloColumns.y_l93.value: "mean",
+    ParkingVeloColumns.lon.value: "mean",
+    ParkingVeloColumns.lat.value: "mean",
+}
+
+
+def parking_velo_sites(df_gpd: gpd.GeoDataFrame, radius: float = SITE_RADIUS) -> gpd.GeoDataFrame:
+    # Un site ne réunit que des parkings satisfaisant les mêmes filtres :
+    # son masque et sa capacité valent pour chaque vue filtrée
+    labels = parking_velo_site_labels(df_gpd, radius, groups=df_gpd[ParkingVeloColumns.filter_mask].to_numpy())
+    df = pd.DataFrame(df_gpd.drop(columns=ParkingVeloColumns.geometry.value)).assign(**{
+        ParkingVeloColumns.lon.value: df_gpd.geometry.x.to_numpy(),
+        ParkingVeloColumns.lat.value: df_gpd.geometry.y.to_numpy(),
+    })
+
+    # Les parkings isolés sont repris tels quels, seuls les sites à plusieurs parkings sont agrégés
+    single = np.bincount(labels)[labels] == 1
+    df_single = df[single].assign(**{
+        ParkingVeloColumns.osm_ids.value: [[osm_id] for osm_id in df.loc[single, ParkingVeloColumns.osm_id]],
+    })
+    df_sites = pd.concat([
+        df_single,
+        _aggregate_sites(df[~single], np.unique(labels[~single], return_inverse=True)[1]),
+    ], ignore_index=True)
+
+    return gpd.GeoDataFrame(
+        compact_parking_velo(df_sites.drop(columns=[ParkingVeloColumns.lon.value, ParkingVeloColumns.lat.value])),
+        geometry=gpd.points_from_xy(df_sites[ParkingVeloColumns.lon], df_sites[ParkingVeloColumns.lat]),
+        crs=WGS84,
+    )
+
+
+def _aggregate_sites(df: pd.DataFrame, labels: np.ndarray) -> pd.DataFrame:
+    # labels : numéro de site de 0 à n_sites - 1, les sites sont renvoyés dans cet ordre
+    grouped = df.groupby(labels, sort=True)
+    df_sites = grouped.agg({column: function for column, function in SITE_AGGREGATIONS.items() if column in df.columns})
+
+    order = np.argsort(labels, kind="stable")
+    starts = np.flatnonzero(np.diff(labels[order], prepend=-1))
+    aggregated = {
+        ParkingVeloColumns.capacite.value: grouped[ParkingVeloColumns.capacite.value].sum(min_count=1),
+        ParkingVeloColumns.filter_mask.value: np.bitwise_or.reduceat(
+            df[ParkingVeloColumns.filter_mask].to_numpy()[order], starts
+        ),
+        ParkingVeloColumns.osm_ids.value: [
+            osm_ids.tolist()
+            for osm_ids in np.split(df[ParkingVeloColumns.osm_id].to_numpy(dtype=object)[order], starts[1:])
+        ],
+    }
+    # Les autres attributs du site sont l'union de ceux de ses parkings
+    for column in df.columns:
+        if column not in SITE_AGGREGATIONS and column not in aggregated:
+            aggregated[column] = _union(df[column], labels, len(starts))
+
+    return df_sites.assign(**aggregated)[df.columns.tolist() + [ParkingVeloColumns.osm_ids.value]]
+
+
+def _union(values: pd.Series, labels: np.ndarray, n_sites: int) -> list[Optional[str]]:
+    # Valeurs distinctes triées et jointes par « ; », None pour un site sans valeur
+    present = values.notna().to_numpy()
+    df_values = pd.DataFrame({
+        "label": labels[present],
+        "value": values[present].astype(str).to_numpy(dtype=object),
+    }).drop_duplicates().sort_values(["label", "value"])
+
+    unions: list[Optional[str]] = [None] * n_sites
+    site_labels = df_values["label"].to_numpy()
+    starts = np.flatnonzero(np.diff(site_labels, prepend=-1))
+    for label, site_values in zip(site_labels[starts], np.split(df_values["value"].to_numpy(), starts[1:])):
+        unions[label] = ";".join(site_values)
+    return unions
@@ -1,15 +1,32 @@
+from typing import Iterable
+
 import geopandas as gpd
 import pandas as pd
-from shapely import wkb
+import shapely
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.compact_parking_velo import compact_parking_velo
+from src.parking_velo.domain.entities.lambert93 import WGS84, to_lambert93
 
 GEO_POINT_COL = "geo_point_2d"
 GEO_SHAPE_COL = "geo_shape"
 
 
 def parking_velo_to_gpd(df: pd.DataFrame) -> gpd.GeoDataFrame:
-    df_gpd = gpd.GeoDataFrame(
-        df,
-        geometry=df[GEO_POINT_COL].apply(wkb.loads),
-        crs="EPSG:2154"
-    )
-    return df_gpd.drop(columns=[GEO_POINT_COL, GEO_SHAPE_COL])
+    # Décodage WKB vectorisé : un seul appel pour toute la colonne
+    geometry = shapely.from_wkb(df[GEO_POINT_COL].to_numpy())
+
+    # Géométrie en WGS84 pour l'affichage, coordonnées Lambert-93 (mètres) pour les distances
+    x_l93, y_l93 = to_lambert93(shapely.get_x(geometry), shapely.get_y(geometry))
+    df = df.drop(columns=[GEO_POINT_COL, GEO_SHAPE_COL]).assign(**{
+        ParkingVeloColumns.x_l93.value: x_l93,
+        ParkingVeloColumns.y_l93.value: y_l93,
+    })
+    return gpd.GeoDataFrame(compact_parking_velo(df), geometry=geometry, crs=WGS84)
+
+
+def parking_velo_batches_to_gpd(batches: Iterable[pd.DataFrame]) -> gpd.GeoDataFrame:
+    # Un seul lot brut en mémoire à la fois, seules les données converties sont conservées
+    df_gpd_batches = [parking_velo_to_gpd(batch) for batch in batches]
+    # Les catégories des lots diffèrent : la concaténation est recompactée
+    return compact_parking_velo(pd.concat(df_gpd_batches, ignore_index=True))  # type: ignore
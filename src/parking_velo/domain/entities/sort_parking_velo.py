@@ -0,0 +1,9 @@
+import geopandas as gpd
+
+
+def sort_parking_velo(df_gpd: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    # Tri selon la courbe de Hilbert : des parkings proches tombent dans le même groupe de lignes
+    if df_gpd.empty:
+        return df_gpd
+    order = df_gpd.geometry.hilbert_distance().argsort(kind="stable")
+    return df_gpd.iloc[order.to_numpy()].reset_index(drop=True)  # type: ignore
@@ -1,23 +1,109 @@
 import geopandas as gpd
+import numpy as np
+import pandas as pd
 
 from abc import ABC, abstractmethod
+from typing import Optional
 
+from src.parking_velo.config.datasets import ParkingVeloDatasets
 from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.entities.parking_velo_grid import ParkingVeloGrid
+from src.parking_velo.domain.entities.parking_velo_index import ParkingVeloIndex
+from src.parking_velo.domain.entities.parking_velo_manifest import ParkingVeloManifest
+from src.parking_velo.domain.entities.parking_velo_predicate import ParkingVeloPredicate
+
+BBox = tuple[float, float, float, float]
+Columns = Optional[list[str]]
 
 
 class FileSystemHandler(ABC):
+    def __init__(self, use_cache: bool = False):
+        self.use_cache = use_cache
+
     @abstractmethod
     def save_parking_velo_data(self, df: gpd.GeoDataFrame) -> None:
         pass
 
     @abstractmethod
-    def get_parking_velo_data(self) -> gpd.GeoDataFrame:
+    def get_parking_velo_data(
+        self, bbox: Optional[BBox] = None, predicate: Optional[ParkingVeloPredicate] = None, columns: Columns = None
+    ) -> gpd.GeoDataFrame:
+        pass
+
+    @abstractmethod
+    def get_parking_velo_columns(self) -> list[str]:
+        pass
+
+    @abstractmethod
+    def get_parking_velo_predicate_mask(self, predicate: ParkingVeloPredicate) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def save_parking_velo_source_validators(self, validators: dict[str, str]) -> None:
+        pass
+
+    @abstractmethod
+    def get_parking_velo_source_validators(self) -> dict[str, str]:
+        pass
+
+    @abstractmethod
+    def save_parking_velo_manifest(self, manifest: ParkingVeloManifest, dataset: ParkingVeloDatasets) -> None:
+        pass
+
+    @abstractmethod
+    def get_parking_velo_manifest(self, dataset: ParkingVeloDatasets) -> ParkingVeloManifest:
+        pass
+
+    @abstractmethod
+    def has_filtered_parking_velo_data(self) -> bool:
+        pass
+
+    @abstractmethod
+    def save_filtered_parking_velo_data(self, df: gpd.GeoDataFrame) -> None:
+        pass
+
+    @abstractmethod
+    def get_filtered_parking_velo_data(
+        self, filter: ParkingVeloFilters, bbox: Optional[BBox] = None, columns: Columns = None
+    ) -> gpd.GeoDataFrame:
+        pass
+
+    @abstractmethod
+    def save_parking_velo_sites(self, df: gpd.GeoDataFrame) -> None:
+        pass
+
+    @abstractmethod
+    def get_parking_velo_sites(self, columns: Columns = None) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def get_parking_velo_filter_positions(self, filter: ParkingVeloFilters) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def save_parking_velo_clusters(self, df: pd.DataFrame, filter: ParkingVeloFilters) -> None:
+        pass
+
+    @abstractmethod
+    def get_parking_velo_clusters(self, filter: ParkingVeloFilters) -> Optional[pd.DataFrame]:
+        pass
+
+    @abstractmethod
+    def save_parking_velo_index(self, index: ParkingVeloIndex, filter: Optional[ParkingVeloFilters] = None) -> None:
+        pass
+
+    @abstractmethod
+    def get_parking_velo_index(self, filter: Optional[ParkingVeloFilters] = None) -> Optional[ParkingVeloIndex]:
+        pass
+
+    @abstractmethod
+    def save_parking_velo_grid(self, grid: Optional[ParkingVeloGrid], filter: ParkingVeloFilters) -> None:
         pass
 
     @abstractmethod
-    def save_filtered_parking_velo_data(self, df: gpd.GeoDataFrame, filter: ParkingVeloFilters) -> None:
+    def has_parking_velo_grid(self, filter: ParkingVeloFilters) -> bool:
         pass
 
     @abstractmethod
-    def get_filtered_parking_velo_data(self, filter: ParkingVeloFilters) -> gpd.GeoDataFrame:
+    def get_parking_velo_grid(self, filter: ParkingVeloFilters) -> Optional[ParkingVeloGrid]:
         pass
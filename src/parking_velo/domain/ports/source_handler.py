@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterator, Optional
 
 import pandas as pd
 
@@ -7,3 +8,9 @@ class SourceHandler(ABC):
     @abstractmethod
     def get_parking_velo_data(self) -> pd.DataFrame:
         pass
+
+    @abstractmethod
+    def get_parking_velo_data_if_modified(
+        self, validators: dict[str, str]
+    ) -> tuple[Optional[Iterator[pd.DataFrame]], dict[str, str]]:
+        pass
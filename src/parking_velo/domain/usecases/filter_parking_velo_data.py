@@ -1,56 +1,137 @@
+from src.parking_velo.config.datasets import ParkingVeloDatasets
 from src.parking_velo.config.filters import ParkingVeloFilters
 from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.compact_parking_velo import compact_parking_velo
+from src.parking_velo.domain.entities.parking_velo_clusters import parking_velo_clusters
+from src.parking_velo.domain.entities.parking_velo_filter_mask import (
+    parking_velo_filter_mask, select_parking_velo_filter)
+from src.parking_velo.domain.entities.parking_velo_grid import ParkingVeloGrid
+from src.parking_velo.domain.entities.parking_velo_index import ParkingVeloIndex
+from src.parking_velo.domain.entities.parking_velo_manifest import parking_velo_manifest
+from src.parking_velo.domain.entities.parking_velo_sites import SITE_RADIUS, parking_velo_sites
+from src.parking_velo.domain.entities.sort_parking_velo import sort_parking_velo
 from src.parking_velo.domain.ports.file_system_handler import FileSystemHandler
 import geopandas as gpd
+import pandas as pd
+import time
 from typing import Callable
 
-FILTER_LIST: list[tuple[str, Callable[[gpd.GeoDataFrame], gpd.GeoDataFrame]]] = [
+FILTER_LIST: list[tuple[ParkingVeloFilters, Callable[[gpd.GeoDataFrame], pd.Series]]] = [
     (
         ParkingVeloFilters.privee_abris,
-        lambda df: df[
+        lambda df: (
             (df[ParkingVeloColumns.acces] == "privee")
             & (df[ParkingVeloColumns.type] == "abri")
-        ]
+        )
     ),
     (
         ParkingVeloFilters.clientele_abris,
-        lambda df: df[
+        lambda df: (
             (df[ParkingVeloColumns.acces] == "clientele")
             & (df[ParkingVeloColumns.type] == "abri")
-        ]
+        )
     ),
     (
         ParkingVeloFilters.casier,
-        lambda df: df[
+        lambda df: (
             (df[ParkingVeloColumns.type] == "casier")
-        ]
+        )
     ),
     (
         ParkingVeloFilters.surveille,
-        lambda df: df[
+        lambda df: (
             (df[ParkingVeloColumns.surveille] == "OUI")
-        ]
+        )
     ),
     (
         ParkingVeloFilters.default,
-        lambda df: df[
+        lambda df: (
             ((df[ParkingVeloColumns.acces] == "privee") & (df[ParkingVeloColumns.type] == "abri")) |
             ((df[ParkingVeloColumns.acces] == "clientele") & (df[ParkingVeloColumns.type] == "abri")) |
             (df[ParkingVeloColumns.type] == "casier") |
             (df[ParkingVeloColumns.surveille] == "OUI")
-        ]
+        )
     ),
 ]
 
 
 def filter_parking_velo_data(
     file_system_handler: FileSystemHandler,
+    with_grid: bool = False,
+    site_radius: float = SITE_RADIUS,
 ) -> gpd.GeoDataFrame:
+    started_at = time.perf_counter()
 
     df_gpd_parking_velo = file_system_handler.get_parking_velo_data()
     print(df_gpd_parking_velo)
-    for filter, filter_function in FILTER_LIST:
-        filtered_df_gpd = df_gpd_parking_velo.copy()
-        filtered_df_gpd = filter_function(filtered_df_gpd)
 
-        file_system_handler.save_filtered_parking_velo_data(filtered_df_gpd, filter)
+    filtered_df_gpd = _with_filter_mask(df_gpd_parking_velo)
+
+    return _save_filtered_parking_velo_data(file_system_handler, filtered_df_gpd, with_grid, site_radius, started_at)
+
+
+def update_filtered_parking_velo_data(
+    file_system_handler: FileSystemHandler,
+    df_gpd_changed: gpd.GeoDataFrame,
+    dropped_osm_ids: pd.Series,
+    with_grid: bool = False,
+    site_radius: float = SITE_RADIUS,
+) -> gpd.GeoDataFrame:
+    started_at = time.perf_counter()
+    # Le filtre default est l'union des autres : il couvre tout le jeu filtré
+    filtered_df_gpd = file_system_handler.get_filtered_parking_velo_data(ParkingVeloFilters.default)
+    filtered_df_gpd = filtered_df_gpd[~filtered_df_gpd[ParkingVeloColumns.osm_id].isin(dropped_osm_ids)]
+
+    filtered_df_gpd = pd.concat(
+        [filtered_df_gpd, _with_filter_mask(df_gpd_changed)], ignore_index=True
+    )
+
+    return _save_filtered_parking_velo_data(file_system_handler, filtered_df_gpd, with_grid, site_radius, started_at)
+
+
+def _with_filter_mask(df_gpd: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    # Un seul jeu de données : chaque ligne porte le masque des filtres qu'elle satisfait
+    df_gpd = df_gpd.assign(**{ParkingVeloColumns.filter_mask.value: parking_velo_filter_mask(df_gpd, FILTER_LIST)})
+    return df_gpd[df_gpd[ParkingVeloColumns.filter_mask] != 0]  # type: ignore
+
+
+def _save_filtered_parking_velo_data(
+    file_system_handler: FileSystemHandler,
+    filtered_df_gpd: gpd.GeoDataFrame,
+    with_grid: bool,
+    site_radius: float,
+    started_at: float,
+) -> gpd.GeoDataFrame:
+    source_timestamp = file_system_handler.get_parking_velo_manifest(ParkingVeloDatasets.parking_velo).get(
+        "source_timestamp"
+    )
+
+    filtered_df_gpd = sort_parking_velo(compact_parking_velo(filtered_df_gpd))
+    file_system_handler.save_filtered_parking_velo_data(filtered_df_gpd)
+    file_system_handler.save_parking_velo_manifest(
+        parking_velo_manifest(filtered_df_gpd, source_timestamp, time.perf_counter() - started_at),
+        ParkingVeloDatasets.filtered,
+    )
+
+    # La carte et la recherche du plus proche travaillent sur les sites, index et grilles compris
+    sites_df_gpd = sort_parking_velo(parking_velo_sites(filtered_df_gpd, site_radius))
+    sites_manifest = parking_velo_manifest(sites_df_gpd, source_timestamp, time.perf_counter() - started_at)
+    file_system_handler.save_parking_velo_sites(sites_df_gpd)
+    file_system_handler.save_parking_velo_manifest(sites_manifest, ParkingVeloDatasets.sites)
+    for filter, _ in FILTER_LIST:
+        filter_df_gpd = select_parking_velo_filter(sites_df_gpd, filter)
+        parking_velo_index = ParkingVeloIndex.from_lambert93(filter_df_gpd, sites_manifest["fingerprint"])
+        file_system_handler.save_parking_velo_index(parking_velo_index, filter)
+        file_system_handler.save_parking_velo_grid(
+            ParkingVeloGrid(parking_velo_index) if with_grid else None, filter
+        )
+        # Agrégats précalculés pour les zooms larges : la carte n'a plus à regrouper les parkings
+        file_system_handler.save_parking_velo_clusters(
+            parking_velo_clusters(filter_df_gpd.assign(**{
+                ParkingVeloColumns.lon.value: filter_df_gpd.geometry.x.to_numpy(),
+                ParkingVeloColumns.lat.value: filter_df_gpd.geometry.y.to_numpy(),
+            })),
+            filter,
+        )
+
+    return filtered_df_gpd
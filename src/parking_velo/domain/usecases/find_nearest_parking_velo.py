@@ -1,14 +1,68 @@
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
 import pandas as pd
 from shapely.geometry import Point
 
+from src.parking_velo.config.columns import ParkingVeloColumns
 from src.parking_velo.config.filters import ParkingVeloFilters
-from src.parking_velo.domain.entities.nearest_parking_velo import nearest_parking_velo
+from src.parking_velo.domain.entities.nearest_parking_velo import (
+    nearest_parking_velo, nearest_parking_velo_batch, nearest_parking_velo_matching)
+from src.parking_velo.domain.entities.parking_velo_predicate import ParkingVeloPredicate
 from src.parking_velo.domain.ports.file_system_handler import FileSystemHandler
 
+# Colonnes lues par la recherche : coordonnées, les lignes du filtre viennent du cache du gestionnaire
+NEAREST_COLUMNS = [
+    ParkingVeloColumns.x_l93.value,
+    ParkingVeloColumns.y_l93.value,
+    ParkingVeloColumns.lon.value,
+    ParkingVeloColumns.lat.value,
+]
+
 
 def find_nearest_parking_velo(
-    file_system_handler: FileSystemHandler, point: Point, filtre: ParkingVeloFilters
+    file_system_handler: FileSystemHandler,
+    point: Point,
+    filtre: ParkingVeloFilters,
+    columns: Optional[list[str]] = None,
 ) -> pd.Series:
-    df_gpd_parking_velo = file_system_handler.get_filtered_parking_velo_data(filtre)
+    # Les attributs ne sont lus que s'ils sont demandés, la géométrie est toujours renvoyée
+    df_parking_velo = file_system_handler.get_parking_velo_sites(
+        columns=list(dict.fromkeys([*NEAREST_COLUMNS, *(columns or [])]))
+    )
+    positions = file_system_handler.get_parking_velo_filter_positions(filtre)
+    parking_velo_index = file_system_handler.get_parking_velo_index(filtre)
+    parking_velo_grid = file_system_handler.get_parking_velo_grid(filtre)
+
+    return nearest_parking_velo(df_parking_velo, positions, point, parking_velo_index, parking_velo_grid)
+
+
+def find_nearest_parking_velo_batch(
+    file_system_handler: FileSystemHandler, xs: np.ndarray, ys: np.ndarray, filtre: ParkingVeloFilters
+) -> gpd.GeoDataFrame:
+    df_parking_velo = file_system_handler.get_parking_velo_sites(
+        columns=[*NEAREST_COLUMNS, ParkingVeloColumns.osm_id.value]
+    )
+    positions = file_system_handler.get_parking_velo_filter_positions(filtre)
+    parking_velo_index = file_system_handler.get_parking_velo_index(filtre)
+
+    return nearest_parking_velo_batch(df_parking_velo, positions, xs, ys, parking_velo_index)
+
+
+def find_nearest_parking_velo_matching(
+    file_system_handler: FileSystemHandler,
+    point: Point,
+    predicate: ParkingVeloPredicate,
+    columns: Optional[list[str]] = None,
+) -> Optional[pd.Series]:
+    # Le prédicat porte sur les parkings bruts et non sur les sites : une capacité ou un attribut agrégé
+    # ne dit rien de chaque parking. Le résultat est un parking, de même forme que le site renvoyé
+    # par find_nearest_parking_velo (attributs demandés, lon, lat, géométrie)
+    df_gpd_parking_velo = file_system_handler.get_parking_velo_data(columns=list(dict.fromkeys([
+        ParkingVeloColumns.x_l93.value, ParkingVeloColumns.y_l93.value, *(columns or [])
+    ])))
+    parking_velo_index = file_system_handler.get_parking_velo_index()
 
-    return nearest_parking_velo(df_gpd_parking_velo, point)
+    mask = file_system_handler.get_parking_velo_predicate_mask(predicate)
+    return nearest_parking_velo_matching(df_gpd_parking_velo, point, mask, parking_velo_index)
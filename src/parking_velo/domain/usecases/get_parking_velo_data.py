@@ -1,8 +1,76 @@
+from typing import Optional
+
 import geopandas as gpd
+import numpy as np
+import pandas as pd
 
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.datasets import ParkingVeloDatasets
 from src.parking_velo.config.filters import ParkingVeloFilters
-from src.parking_velo.domain.ports.file_system_handler import FileSystemHandler
+from src.parking_velo.domain.entities.parking_velo_clusters import parking_velo_clusters_in_bbox
+from src.parking_velo.domain.entities.parking_velo_in_bbox import parking_velo_in_bbox
+from src.parking_velo.domain.entities.parking_velo_manifest import ParkingVeloManifest
+from src.parking_velo.domain.entities.parking_velo_predicate import ParkingVeloPredicate
+from src.parking_velo.domain.ports.file_system_handler import BBox, FileSystemHandler
+
+
+def get_parking_velo_data(
+    file_system_handler: FileSystemHandler, filter: ParkingVeloFilters, columns: Optional[list[str]] = None
+) -> gpd.GeoDataFrame:
+    return file_system_handler.get_filtered_parking_velo_data(filter=filter, columns=columns)
+
+
+def get_parking_velo_data_matching(
+    file_system_handler: FileSystemHandler, predicate: ParkingVeloPredicate, columns: Optional[list[str]] = None
+) -> gpd.GeoDataFrame:
+    return file_system_handler.get_parking_velo_data(predicate=predicate, columns=columns)
+
+
+def get_shared_parking_velo_data(
+    file_system_handler: FileSystemHandler, filter: ParkingVeloFilters, columns: Optional[list[str]] = None
+) -> tuple[pd.DataFrame, np.ndarray]:
+    # Jeu partagé tel que projeté en mémoire et lignes du filtre : aucune ligne n'est copiée,
+    # l'appelant ne matérialise que les colonnes qu'il lit
+    df_parking_velo = file_system_handler.get_parking_velo_sites(columns=columns)
+    return df_parking_velo, file_system_handler.get_parking_velo_filter_positions(filter)
+
+
+def get_parking_velo_data_in_bbox(
+    file_system_handler: FileSystemHandler,
+    filter: ParkingVeloFilters,
+    bbox: BBox,
+    limit: Optional[int] = None,
+    columns: Optional[list[str]] = None,
+) -> tuple[pd.DataFrame, int]:
+    # Sites du filtre dans l'emprise, trouvés par l'index du filtre sans parcourir tout le jeu
+    df_parking_velo = file_system_handler.get_parking_velo_sites(columns=None if columns is None else list(dict.fromkeys([
+        *columns,
+        ParkingVeloColumns.lon.value,
+        ParkingVeloColumns.lat.value,
+    ])))
+    positions = file_system_handler.get_parking_velo_filter_positions(filter)
+    parking_velo_index = file_system_handler.get_parking_velo_index(filter)
+
+    return parking_velo_in_bbox(df_parking_velo, positions, bbox, parking_velo_index, limit)
+
+
+def get_parking_velo_clusters_in_bbox(
+    file_system_handler: FileSystemHandler, filter: ParkingVeloFilters, bbox: BBox, zoom: int
+) -> Optional[pd.DataFrame]:
+    # None au-delà du dernier niveau de la pyramide : les parkings sont alors servis un à un
+    df_clusters = file_system_handler.get_parking_velo_clusters(filter)
+    if df_clusters is None or len(df_clusters) == 0 or zoom > df_clusters[ParkingVeloColumns.zoom].iloc[-1]:
+        return None
+    return parking_velo_clusters_in_bbox(df_clusters, zoom, bbox)
+
+
+def get_parking_velo_manifest(
+    file_system_handler: FileSystemHandler, dataset: ParkingVeloDatasets
+) -> ParkingVeloManifest:
+    return file_system_handler.get_parking_velo_manifest(dataset)
 
 
-def get_parking_velo_data(file_system_handler: FileSystemHandler, filter: ParkingVeloFilters) -> gpd.GeoDataFrame:
-    return file_system_handler.get_filtered_parking_velo_data(filter=filter)
+def get_parking_velo_count(file_system_handler: FileSystemHandler, filter: ParkingVeloFilters) -> int:
+    # Nombre de parkings du filtre (et non de sites regroupés), lu dans le manifeste sans charger les données
+    manifest = file_system_handler.get_parking_velo_manifest(ParkingVeloDatasets.filtered)
+    return manifest.get("filter_counts", {}).get(filter.value, 0)
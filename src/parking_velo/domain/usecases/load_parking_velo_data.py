@@ -1,9 +1,78 @@
-from src.parking_velo.domain.entities.parking_velo_to_gpd import parking_velo_to_gpd
+import logging
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import geopandas as gpd
+
+from src.parking_velo.domain.entities.merge_parking_velo_data import REQUIRED_COLUMNS, merge_parking_velo_data
+from src.parking_velo.domain.entities.parking_velo_index import ParkingVeloIndex
+from src.parking_velo.domain.entities.parking_velo_manifest import ParkingVeloManifest, parking_velo_manifest
+from src.parking_velo.domain.entities.parking_velo_to_gpd import parking_velo_batches_to_gpd
+from src.parking_velo.domain.entities.sort_parking_velo import sort_parking_velo
+from src.parking_velo.config.datasets import ParkingVeloDatasets
+from src.parking_velo.config.filters import ParkingVeloFilters
 from src.parking_velo.domain.ports.file_system_handler import FileSystemHandler
 from src.parking_velo.domain.ports.source_handler import SourceHandler
+from src.parking_velo.domain.usecases.filter_parking_velo_data import (
+    filter_parking_velo_data, update_filtered_parking_velo_data)
+
+
+def load_parking_velo_data(source_handler: SourceHandler, file_system_handler: FileSystemHandler) -> bool:
+    started_at = time.perf_counter()
+    validators = file_system_handler.get_parking_velo_source_validators()
+    if validators and not set(REQUIRED_COLUMNS) <= set(file_system_handler.get_parking_velo_columns()):
+        # Données écrites avec un schéma antérieur : ni réponse 304 ni fusion, tout est rechargé
+        logging.info("Parking vélo data written with an older schema, reloading everything.")
+        validators = {}
+    source_batches, new_validators = source_handler.get_parking_velo_data_if_modified(validators)
+    if source_batches is None:
+        logging.info("Parking vélo source unchanged, nothing to refresh.")
+        return False
+
+    if not validators:
+        df_gpd = sort_parking_velo(parking_velo_batches_to_gpd(source_batches))
+        manifest = _save_parking_velo_data(file_system_handler, df_gpd, new_validators, started_at)
+
+        # Un jeu filtré existant (ancien schéma compris) est reconstruit sur les nouvelles données
+        if file_system_handler.has_filtered_parking_velo_data():
+            filter_parking_velo_data(
+                file_system_handler, with_grid=file_system_handler.has_parking_velo_grid(ParkingVeloFilters.default)
+            )
+    else:
+        df_gpd_merged, df_gpd_changed, dropped_osm_ids = merge_parking_velo_data(
+            file_system_handler.get_parking_velo_data(), source_batches
+        )
+        logging.info(f"Parking vélo refresh: {len(df_gpd_changed)} changed rows, {len(dropped_osm_ids)} dropped rows.")
+        df_gpd = sort_parking_velo(df_gpd_merged)
+        manifest = _save_parking_velo_data(file_system_handler, df_gpd, new_validators, started_at)
 
+        if file_system_handler.has_filtered_parking_velo_data():
+            update_filtered_parking_velo_data(
+                file_system_handler,
+                df_gpd_changed,
+                dropped_osm_ids,
+                with_grid=file_system_handler.has_parking_velo_grid(ParkingVeloFilters.default),
+            )
 
-def load_parking_velo_data(source_handler: SourceHandler, file_system_handler: FileSystemHandler) -> None:
-    df = source_handler.get_parking_velo_data()
-    df_gpd = parking_velo_to_gpd(df)
+    file_system_handler.save_parking_velo_index(ParkingVeloIndex.from_lambert93(df_gpd, manifest["fingerprint"]))
+
+    # Enregistrés en dernier : un rafraîchissement interrompu sera rejoué
+    file_system_handler.save_parking_velo_source_validators(new_validators)
+    return True
+
+
+def _save_parking_velo_data(
+    file_system_handler: FileSystemHandler, df_gpd: gpd.GeoDataFrame, validators: dict[str, str], started_at: float
+) -> ParkingVeloManifest:
+    manifest = parking_velo_manifest(df_gpd, _source_timestamp(validators), time.perf_counter() - started_at)
     file_system_handler.save_parking_velo_data(df_gpd)
+    file_system_handler.save_parking_velo_manifest(manifest, ParkingVeloDatasets.parking_velo)
+    return manifest
+
+
+def _source_timestamp(validators: dict[str, str]) -> str:
+    # Date de la source si le serveur la fournit, date du chargement sinon
+    if validators.get("last_modified"):
+        return parsedate_to_datetime(validators["last_modified"]).isoformat()
+    return datetime.now(UTC).isoformat()
@@ -1,6 +1,10 @@
+import tempfile
+from typing import Iterator, Optional
 from urllib.parse import urljoin
 
 import pandas as pd
+import pyarrow.parquet as pq
+import requests
 
 from src.parking_velo.domain.ports.source_handler import SourceHandler
 
@@ -11,7 +15,50 @@ URL_PARKING_VELO = urljoin(
     "stationnement-velo-en-ile-de-france/exports/parquet?lang=fr&timezone=Europe%2FBerlin"
 )
 
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Secondes : connexion, puis attente maximale entre deux paquets reçus
+# Un serveur bloqué fait échouer le rafraîchissement au lieu de le figer
+REQUEST_TIMEOUT = (10.0, 60.0)
+
 
 class ApiHandler(SourceHandler):
+    def __init__(self, url: str = URL_PARKING_VELO, timeout: tuple[float, float] = REQUEST_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
     def get_parking_velo_data(self) -> pd.DataFrame:
-        return pd.read_parquet(URL_PARKING_VELO)
+        return pd.read_parquet(self.url)
+
+    def get_parking_velo_data_if_modified(
+        self, validators: dict[str, str]
+    ) -> tuple[Optional[Iterator[pd.DataFrame]], dict[str, str]]:
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        r = requests.get(self.url, headers=headers, stream=True, timeout=self.timeout)
+        if r.status_code == 304:
+            r.close()
+            return None, validators
+        r.raise_for_status()
+
+        new_validators = {
+            "etag": r.headers.get("ETag", ""),
+            "last_modified": r.headers.get("Last-Modified", ""),
+        }
+        return self._iter_row_groups(r), new_validators
+
+    @staticmethod
+    def _iter_row_groups(r: requests.Response) -> Iterator[pd.DataFrame]:
+        # L'export est écrit sur disque puis relu groupe de lignes par groupe de lignes
+        with r, tempfile.TemporaryFile() as f:
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+            f.seek(0)
+
+            parquet_file = pq.ParquetFile(f)
+            for i in range(parquet_file.num_row_groups):
+                yield parquet_file.read_row_group(i).to_pandas()
@@ -1,22 +1,345 @@
 import geopandas as gpd
+import json
+import numpy as np
 import os
+import pandas as pd
+import pickle
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
 
-from data import PATH_PARKING_VELO
+from data import (PATH_PARKING_VELO, PATH_PARKING_VELO_FILTERED, PATH_PARKING_VELO_INDEX,
+                  PATH_PARKING_VELO_SITES, PATH_PARKING_VELO_SOURCE)
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.datasets import ParkingVeloDatasets
 from src.parking_velo.config.filters import ParkingVeloFilters
-from src.parking_velo.domain.ports.file_system_handler import FileSystemHandler
+from src.parking_velo.domain.entities.compact_parking_velo import compact_parking_velo
+from src.parking_velo.domain.entities.parking_velo_filter_mask import (
+    parking_velo_filter_positions, select_parking_velo_filter)
+from src.parking_velo.domain.entities.parking_velo_grid import ParkingVeloGrid
+from src.parking_velo.domain.entities.parking_velo_index import ParkingVeloIndex
+from src.parking_velo.domain.entities.parking_velo_manifest import ParkingVeloManifest
+from src.parking_velo.domain.entities.parking_velo_predicate import (
+    ParkingVeloPredicate, parking_velo_predicate_mask)
+from src.parking_velo.domain.ports.file_system_handler import BBox, Columns, FileSystemHandler
+
+# Petits groupes de lignes : une lecture par emprise ne décode que les groupes qui l'intersectent
+ROW_GROUP_SIZE = 2_000
+
+# Colonnes toujours lues dans le jeu filtré : masque des filtres et géométrie
+FILTERED_COLUMNS = [ParkingVeloColumns.filter_mask.value, ParkingVeloColumns.geometry.value]
+
+# Cache partagé par toutes les instances du processus : chemin -> (version du fichier, objet chargé)
+# Le verrou global ne protège que les dictionnaires ; un fichier est lu sous le verrou de sa clé,
+# les lectures de fichiers différents se font en parallèle
+_CACHE: dict[str, tuple[tuple[int, int], Any]] = {}
+_CACHE_LOCK = threading.Lock()
+_KEY_LOCKS: dict[str, threading.Lock] = {}
+
+# Masques des prédicats ad hoc : en nombre non borné, gardés dans un cache LRU séparé
+PREDICATE_MASK_CACHE_SIZE = 32
+_PREDICATE_MASKS: "OrderedDict[str, tuple[tuple[int, int], np.ndarray]]" = OrderedDict()
+
+
+def _file_version(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_cached(path: str, reader: Callable[[str], Any], key: Optional[str] = None) -> Any:
+    key = key or path
+    version = _file_version(path)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        key_lock = _KEY_LOCKS.setdefault(key, threading.Lock())
+
+    # Un seul lecteur par clé : les sessions qui demandent le même fichier attendent sa lecture
+    with key_lock:
+        with _CACHE_LOCK:
+            cached = _CACHE.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version, reader(path))
+            with _CACHE_LOCK:
+                _CACHE[key] = cached
+        return cached[1]
+
+
+def _is_cached(path: str) -> bool:
+    # Fichier entier déjà chargé dans sa version courante : toute projection en est tirée sans décodage
+    with _CACHE_LOCK:
+        cached = _CACHE.get(path)
+    return cached is not None and cached[0] == _file_version(path)
+
+
+def _read_predicate_mask(
+    path: str, predicate: ParkingVeloPredicate, reader: Callable[[str], np.ndarray]
+) -> np.ndarray:
+    key = repr(predicate)
+    version = _file_version(path)
+    with _CACHE_LOCK:
+        cached = _PREDICATE_MASKS.get(key)
+        if cached is not None and cached[0] == version:
+            _PREDICATE_MASKS.move_to_end(key)
+            return cached[1]
+
+    # Masque calculé hors du verrou : il lit lui-même le fichier par le cache
+    cached = (version, reader(path))
+    with _CACHE_LOCK:
+        _PREDICATE_MASKS[key] = cached
+        _PREDICATE_MASKS.move_to_end(key)
+        while len(_PREDICATE_MASKS) > PREDICATE_MASK_CACHE_SIZE:
+            _PREDICATE_MASKS.popitem(last=False)
+    return cached[1]
+
+
+def _project(df: pd.DataFrame, columns: Columns) -> pd.DataFrame:
+    # Sélection sans copie : les colonnes retenues partagent leurs données avec le cache
+    if columns is None:
+        return df
+    data = {column: df[column] for column in columns}
+    if isinstance(df, gpd.GeoDataFrame):
+        return gpd.GeoDataFrame(data, geometry=df.geometry.name, crs=df.crs, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def _with_columns(columns: Columns, *required: str) -> Columns:
+    # Colonnes dont le gestionnaire a besoin ajoutées à la projection demandée, sans doublon
+    if columns is None:
+        return None
+    return list(dict.fromkeys([*columns, *required]))
+
+
+def _clip(df: gpd.GeoDataFrame, bbox: Optional[BBox]) -> gpd.GeoDataFrame:
+    # Copie superficielle : les données sont partagées, le cache n'est pas modifié par l'appelant
+    if bbox is None:
+        return df.copy(deep=False)
+    xmin, ymin, xmax, ymax = bbox
+    return df.cx[xmin:xmax, ymin:ymax]
 
 
 class LocalFileSystemHandler(FileSystemHandler):
 
     def save_parking_velo_data(self, df: gpd.GeoDataFrame) -> None:
-        df.to_parquet(PATH_PARKING_VELO, index=False)
+        self._write_parquet(df, PATH_PARKING_VELO)
+
+    def get_parking_velo_data(
+        self, bbox: Optional[BBox] = None, predicate: Optional[ParkingVeloPredicate] = None, columns: Columns = None
+    ) -> gpd.GeoDataFrame:
+        if not predicate:
+            return self._read_parquet(PATH_PARKING_VELO, bbox, columns)
+        if self.use_cache:
+            df = self._read_parquet(PATH_PARKING_VELO, columns=columns)
+            return _clip(df[self.get_parking_velo_predicate_mask(predicate)], bbox)  # type: ignore
+        # Prédicat évalué par pyarrow à la lecture, les groupes de lignes exclus ne sont pas décodés
+        return compact_parking_velo(gpd.read_parquet(
+            PATH_PARKING_VELO,
+            bbox=bbox,
+            filters=predicate,
+            columns=_with_columns(columns, ParkingVeloColumns.geometry.value),
+        ))
+
+    def get_parking_velo_columns(self) -> list[str]:
+        # Schéma lu dans le pied du fichier parquet, sans décoder les données
+        if not os.path.exists(PATH_PARKING_VELO):
+            return []
+        return pq.read_schema(PATH_PARKING_VELO).names
+
+    def get_parking_velo_predicate_mask(self, predicate: ParkingVeloPredicate) -> np.ndarray:
+        if self.use_cache:
+            # Masque calculé une seule fois par prédicat et par version du fichier, tant qu'il reste dans le cache
+            return _read_predicate_mask(
+                PATH_PARKING_VELO,
+                predicate,
+                lambda path: parking_velo_predicate_mask(self._read_parquet(path), predicate),
+            )
+        return parking_velo_predicate_mask(self._read_parquet(PATH_PARKING_VELO), predicate)
+
+    def save_parking_velo_source_validators(self, validators: dict[str, str]) -> None:
+        with open(PATH_PARKING_VELO_SOURCE, "w") as f:
+            json.dump(validators, f)
+
+    def get_parking_velo_source_validators(self) -> dict[str, str]:
+        if not (os.path.exists(PATH_PARKING_VELO_SOURCE) and os.path.exists(PATH_PARKING_VELO)):
+            return {}
+        with open(PATH_PARKING_VELO_SOURCE) as f:
+            return json.load(f)
+
+    def save_parking_velo_manifest(self, manifest: ParkingVeloManifest, dataset: ParkingVeloDatasets) -> None:
+        path = dataset.get_manifest_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+    def get_parking_velo_manifest(self, dataset: ParkingVeloDatasets) -> ParkingVeloManifest:
+        path = dataset.get_manifest_path()
+        if not os.path.exists(path):
+            return {}
+        if self.use_cache:
+            return _read_cached(path, self._load_json)
+        return self._load_json(path)
+
+    def has_filtered_parking_velo_data(self) -> bool:
+        return os.path.exists(PATH_PARKING_VELO_FILTERED)
+
+    def save_filtered_parking_velo_data(self, df: gpd.GeoDataFrame) -> None:
+        os.makedirs(os.path.dirname(PATH_PARKING_VELO_FILTERED), exist_ok=True)
+        self._write_parquet(df, PATH_PARKING_VELO_FILTERED)
+
+    def save_parking_velo_sites(self, df: gpd.GeoDataFrame) -> None:
+        os.makedirs(os.path.dirname(PATH_PARKING_VELO_SITES), exist_ok=True)
+        self._write_arrow(df, PATH_PARKING_VELO_SITES)
+
+    def get_parking_velo_sites(self, columns: Columns = None) -> pd.DataFrame:
+        if self.use_cache:
+            return _project(_read_cached(PATH_PARKING_VELO_SITES, self._map_arrow), columns)
+        return self._map_arrow(PATH_PARKING_VELO_SITES, columns)
+
+    def get_parking_velo_filter_positions(self, filter: ParkingVeloFilters) -> np.ndarray:
+        # Lignes des sites retenues par le filtre, calculées une fois par version du fichier
+        if self.use_cache:
+            return _read_cached(
+                PATH_PARKING_VELO_SITES,
+                lambda path: self._filter_positions(path, filter),
+                key=f"{PATH_PARKING_VELO_SITES}#{filter.value}",
+            )
+        return self._filter_positions(PATH_PARKING_VELO_SITES, filter)
+
+    def get_filtered_parking_velo_data(
+        self, filter: ParkingVeloFilters, bbox: Optional[BBox] = None, columns: Columns = None
+    ) -> gpd.GeoDataFrame:
+        if self.use_cache:
+            # Une seule table en cache ; par filtre, seules les positions de ses lignes sont gardées
+            df = self._read_parquet(PATH_PARKING_VELO_FILTERED, columns=_with_columns(columns, *FILTERED_COLUMNS))
+            positions = _read_cached(
+                PATH_PARKING_VELO_FILTERED,
+                lambda path: parking_velo_filter_positions(self._read_parquet(path, columns=FILTERED_COLUMNS), filter),
+                key=f"{PATH_PARKING_VELO_FILTERED}#{filter.value}",
+            )
+            # Sous-ensemble des seules colonnes demandées, propre à l'appel
+            return _clip(df.iloc[positions], bbox)
+        df = self._read_parquet(PATH_PARKING_VELO_FILTERED, bbox, _with_columns(columns, *FILTERED_COLUMNS))
+        return select_parking_velo_filter(df, filter)
+
+    def save_parking_velo_clusters(self, df: pd.DataFrame, filter: ParkingVeloFilters) -> None:
+        os.makedirs(os.path.dirname(filter.get_clusters_path()), exist_ok=True)
+        self._write_feather(df, filter.get_clusters_path())
+
+    def get_parking_velo_clusters(self, filter: ParkingVeloFilters) -> Optional[pd.DataFrame]:
+        path = filter.get_clusters_path()
+        if not os.path.exists(path):
+            return None
+        if self.use_cache:
+            return _read_cached(path, self._map_arrow)
+        return self._map_arrow(path)
+
+    def save_parking_velo_index(self, index: ParkingVeloIndex, filter: Optional[ParkingVeloFilters] = None) -> None:
+        path = filter.get_index_path() if filter else PATH_PARKING_VELO_INDEX
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def get_parking_velo_index(self, filter: Optional[ParkingVeloFilters] = None) -> Optional[ParkingVeloIndex]:
+        index = self._read_pickle(filter.get_index_path() if filter else PATH_PARKING_VELO_INDEX)
+        return self._if_current(index, ParkingVeloDatasets.sites if filter else ParkingVeloDatasets.parking_velo)
+
+    def save_parking_velo_grid(self, grid: Optional[ParkingVeloGrid], filter: ParkingVeloFilters) -> None:
+        if grid is None:
+            # Pas de grille pour cette version des données : une ancienne grille serait périmée
+            if os.path.exists(filter.get_grid_path()):
+                os.remove(filter.get_grid_path())
+            return
+        os.makedirs(os.path.dirname(filter.get_grid_path()), exist_ok=True)
+        with open(filter.get_grid_path(), "wb") as f:
+            pickle.dump(grid, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def has_parking_velo_grid(self, filter: ParkingVeloFilters) -> bool:
+        # Grille présente, même construite sur une version antérieure des données
+        return os.path.exists(filter.get_grid_path())
+
+    def get_parking_velo_grid(self, filter: ParkingVeloFilters) -> Optional[ParkingVeloGrid]:
+        return self._if_current(self._read_pickle(filter.get_grid_path()), ParkingVeloDatasets.sites)
+
+    def _if_current(self, built: Any, dataset: ParkingVeloDatasets) -> Any:
+        # Index ou grille construit sur une autre version des données : ignoré, l'appelant calcule sans
+        fingerprint = getattr(built, "fingerprint", None)
+        if fingerprint is None or fingerprint != self.get_parking_velo_manifest(dataset).get("fingerprint"):
+            return None
+        return built
+
+    def _read_pickle(self, path: str) -> Any:
+        if not os.path.exists(path):
+            return None
+        if self.use_cache:
+            return _read_cached(path, self._load_pickle)
+        return self._load_pickle(path)
+
+    def _read_parquet(self, path: str, bbox: Optional[BBox] = None, columns: Columns = None) -> gpd.GeoDataFrame:
+        # La géométrie est toujours lue : le résultat reste un GeoDataFrame
+        columns = _with_columns(columns, ParkingVeloColumns.geometry.value)
+        if self.use_cache:
+            if columns is None or _is_cached(path):
+                df = _read_cached(path, self._load_parquet)
+            else:
+                # Projection décodée seule, en cache sous l'ensemble de ses colonnes
+                df = _read_cached(
+                    path, lambda path: self._load_parquet(path, columns), key=f"{path}#{','.join(sorted(columns))}"
+                )
+            return _clip(_project(df, columns), bbox)
+        # Seules les colonnes demandées sont décodées
+        return compact_parking_velo(gpd.read_parquet(path, bbox=bbox, columns=columns))
+
+    @staticmethod
+    def _load_parquet(path: str, columns: Columns = None) -> gpd.GeoDataFrame:
+        return compact_parking_velo(gpd.read_parquet(path, columns=columns))
+
+    @staticmethod
+    def _write_parquet(df: gpd.GeoDataFrame, path: str) -> None:
+        # Catégories écrites en colonnes dictionnaire, relues telles quelles
+        compact_parking_velo(df).to_parquet(path, index=False, write_covering_bbox=True, row_group_size=ROW_GROUP_SIZE)
+
+    @staticmethod
+    def _write_arrow(df: gpd.GeoDataFrame, path: str) -> None:
+        # Coordonnées en flottants + attributs, non compressé pour pouvoir être projeté en mémoire
+        df_arrow = compact_parking_velo(pd.DataFrame(df.drop(columns=ParkingVeloColumns.geometry.value))).assign(**{
+            ParkingVeloColumns.lon.value: df.geometry.x.to_numpy(),
+            ParkingVeloColumns.lat.value: df.geometry.y.to_numpy(),
+        })
+        LocalFileSystemHandler._write_feather(df_arrow, path)
+
+    @staticmethod
+    def _write_feather(df: pd.DataFrame, path: str) -> None:
+        # Fichier remplacé atomiquement : les processus qui le projettent gardent l'ancienne version
+        tmp_path = f"{path}.tmp"
+        feather.write_feather(df, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _map_arrow(path: str, columns: Columns = None) -> pd.DataFrame:
+        # Lecture sans copie : les colonnes pointent dans les pages du fichier, partagées entre processus
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
 
-    def get_parking_velo_data(self) -> gpd.GeoDataFrame:
-        return gpd.read_parquet(PATH_PARKING_VELO)
+    @staticmethod
+    def _filter_positions(path: str, filter: ParkingVeloFilters) -> np.ndarray:
+        return parking_velo_filter_positions(
+            LocalFileSystemHandler._map_arrow(path, [ParkingVeloColumns.filter_mask.value]), filter
+        )
 
-    def save_filtered_parking_velo_data(self, df: gpd.GeoDataFrame, filter: ParkingVeloFilters) -> None:
-        os.makedirs(os.path.dirname(filter.get_path()), exist_ok=True)
-        df.to_parquet(filter.get_path(), index=False)
+    @staticmethod
+    def _load_json(path: str) -> Any:
+        with open(path) as f:
+            return json.load(f)
 
-    def get_filtered_parking_velo_data(self, filter: ParkingVeloFilters) -> gpd.GeoDataFrame:
-        return gpd.read_parquet(filter.get_path())
+    @staticmethod
+    def _load_pickle(path: str) -> Any:
+        with open(path, "rb") as f:
+            return pickle.load(f)
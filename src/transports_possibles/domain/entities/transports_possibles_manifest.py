@@ -0,0 +1,27 @@
+import hashlib
+import json
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+import pandas as pd
+
+TransportsPossiblesManifest = dict[str, Any]
+
+
+def schema_hash(df: pd.DataFrame) -> str:
+    schema = [[str(column), str(dtype)] for column, dtype in df.dtypes.items()]
+    return hashlib.sha256(json.dumps(schema).encode()).hexdigest()[:16]
+
+
+def transports_possibles_manifest(
+    df: pd.DataFrame, source_timestamp: Optional[str], build_duration: float
+) -> TransportsPossiblesManifest:
+    # Jeu de données sans géométrie : pas d'emprise
+    return {
+        "row_count": len(df),
+        "bbox": None,
+        "schema_hash": schema_hash(df),
+        "source_timestamp": source_timestamp,
+        "built_at": datetime.now(UTC).isoformat(),
+        "build_duration": round(build_duration, 3),
+    }
@@ -2,6 +2,8 @@ import pandas as pd
 
 from abc import ABC, abstractmethod
 
+from src.transports_possibles.domain.entities.transports_possibles_manifest import TransportsPossiblesManifest
+
 
 class FileSystemHandler(ABC):
     @abstractmethod
@@ -11,3 +13,11 @@ class FileSystemHandler(ABC):
     @abstractmethod
     def get_transports_possibles_data(self) -> pd.DataFrame:
         pass
+
+    @abstractmethod
+    def save_transports_possibles_manifest(self, manifest: TransportsPossiblesManifest) -> None:
+        pass
+
+    @abstractmethod
+    def get_transports_possibles_manifest(self) -> TransportsPossiblesManifest:
+        pass
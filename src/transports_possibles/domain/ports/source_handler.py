@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 import pandas as pd
 
 
 class SourceHandler(ABC):
     @abstractmethod
-    def get_transports_possibles_data(self) -> pd.DataFrame:
+    def get_transports_possibles_data(self) -> tuple[pd.DataFrame, Optional[str]]:
+        # Données et date de dernière modification de la source (None si inconnue)
         pass
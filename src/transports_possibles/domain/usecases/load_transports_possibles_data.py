@@ -1,8 +1,14 @@
+import time
 
+from src.transports_possibles.domain.entities.transports_possibles_manifest import transports_possibles_manifest
 from src.transports_possibles.domain.ports.file_system_handler import FileSystemHandler
 from src.transports_possibles.domain.ports.source_handler import SourceHandler
 
 
 def load_transports_possibles_data(source_handler: SourceHandler, file_system_handler: FileSystemHandler) -> None:
-    df = source_handler.get_transports_possibles_data()
+    started_at = time.perf_counter()
+    df, source_timestamp = source_handler.get_transports_possibles_data()
     file_system_handler.save_transports_possibles_data(df)
+    file_system_handler.save_transports_possibles_manifest(
+        transports_possibles_manifest(df, source_timestamp, time.perf_counter() - started_at)
+    )
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import pandas as pd
 import boto3
 
@@ -15,7 +17,7 @@ FILE_KEY_S3 = "/datasets-diffusion/2025/12_Donnees_transilien_SNCF/Capacité emp
 
 
 class ApiHandler(SourceHandler):
-    def get_transports_possibles_data(self) -> pd.DataFrame:
+    def get_transports_possibles_data(self) -> tuple[pd.DataFrame, Optional[str]]:
         s3 = boto3.client(
             "s3",
             endpoint_url="https://" + ENDPOINT_URL,
@@ -27,6 +29,8 @@ class ApiHandler(SourceHandler):
         response = s3.get_object(Bucket=BUCKET, Key=FILE_KEY_S3)
         status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
         if status == 200:
-            return pd.read_csv(response.get("Body"), sep=";")
+            # Date de l'objet S3, et non celle du téléchargement
+            last_modified = response.get("LastModified")
+            return pd.read_csv(response.get("Body"), sep=";"), last_modified.isoformat() if last_modified else None
         else:
             raise Exception(f"Failed to fetch data from S3. Status code: {status}")
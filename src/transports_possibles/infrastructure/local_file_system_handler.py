@@ -1,6 +1,10 @@
+import json
+import os
+
 import pandas as pd
 
-from data import PATH_TRANSPORTS_POSSIBLES
+from data import PATH_TRANSPORTS_POSSIBLES, PATH_TRANSPORTS_POSSIBLES_MANIFEST
+from src.transports_possibles.domain.entities.transports_possibles_manifest import TransportsPossiblesManifest
 from src.transports_possibles.domain.ports.file_system_handler import FileSystemHandler
 
 
@@ -11,3 +15,15 @@ class LocalFileSystemHandler(FileSystemHandler):
 
     def get_transports_possibles_data(self) -> pd.DataFrame:
         return pd.read_parquet(PATH_TRANSPORTS_POSSIBLES)
+
+    def save_transports_possibles_manifest(self, manifest: TransportsPossiblesManifest) -> None:
+        tmp_path = f"{PATH_TRANSPORTS_POSSIBLES_MANIFEST}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, PATH_TRANSPORTS_POSSIBLES_MANIFEST)
+
+    def get_transports_possibles_manifest(self) -> TransportsPossiblesManifest:
+        if not os.path.exists(PATH_TRANSPORTS_POSSIBLES_MANIFEST):
+            return {}
+        with open(PATH_TRANSPORTS_POSSIBLES_MANIFEST) as f:
+            return json.load(f)
@@ -0,0 +1,18 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Répertoire de données jetable, positionné avant tout import de data : les tests n'écrivent jamais dans data/
+os.environ["CYCLOFLOW_DATA_PATH"] = tempfile.mkdtemp(prefix="cycloflow_tests_")
+
+from data import DATA_PATH  # noqa: E402
+
+
+@pytest.fixture
+def data_path() -> str:
+    # Répertoire vidé avant chaque test qui écrit des données
+    shutil.rmtree(DATA_PATH, ignore_errors=True)
+    os.makedirs(DATA_PATH)
+    return DATA_PATH
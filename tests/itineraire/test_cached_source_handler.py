@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+import requests
+from shapely.geometry import Point
+
+from src.itineraire.domain.ports.source_handler import SourceHandler
+from src.itineraire.infrastructure import local_file_system_handler
+from src.itineraire.infrastructure.api_handler import ApiHandler
+from src.itineraire.infrastructure.cached_source_handler import CachedGeocodingSourceHandler
+from src.itineraire.infrastructure.local_file_system_handler import LocalFileSystemHandler
+
+
+class StubSource(SourceHandler):
+    # Source de géocodage en mémoire : adresse connue, adresse introuvable ou erreur transitoire
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls: list[str] = []
+
+    def get_address_coordinates(self, address_name: str) -> Point:
+        self.calls.append(address_name)
+        if self.error is not None:
+            raise self.error
+        return Point(2.3316, 48.8691)
+
+    def get_itinerary_transport(self, departure_coordinates, arrival_coordinates, travel_datetime, datetime_represents):
+        raise NotImplementedError
+
+    def get_itinerary_marche(self, departure_coordinates, arrival_coordinates):
+        raise NotImplementedError
+
+    def get_itinerary_velo(self, departure_coordinates, arrival_coordinates, profile="Default"):
+        raise NotImplementedError
+
+
+class GeoveloStandIn(BaseHTTPRequestHandler):
+    # Réponses de /places servies dans l'ordre : quota dépassé puis lieu trouvé
+    responses: list[tuple[int, bytes]] = []
+
+    def do_GET(self) -> None:
+        status, body = GeoveloStandIn.responses.pop(0)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+@pytest.fixture
+def geocoding_handler(data_path) -> LocalFileSystemHandler:
+    local_file_system_handler._PENDING_STATS.clear()
+    return LocalFileSystemHandler(os.path.join(data_path, "geocoding.sqlite"))
+
+
+@pytest.fixture
+def geovelo_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GeoveloStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_miss_then_hit_calls_the_source_once(geocoding_handler):
+    source = StubSource()
+    handler = CachedGeocodingSourceHandler(source, geocoding_handler)
+
+    first = handler.get_address_coordinates("12 Rue de la Paix, Paris")
+    # Variante de casse, d'accents et de ponctuation : même entrée
+    second = handler.get_address_coordinates("12 rue de la paix  paris")
+
+    assert source.calls == ["12 Rue de la Paix, Paris"]
+    assert first.equals(second)
+    assert geocoding_handler.get_geocoding_stats() == {"miss": 1, "hit": 1}
+
+
+def test_unknown_address_is_cached_as_a_failure(geocoding_handler):
+    source = StubSource(ValueError("Aucun lieu trouvé pour l'adresse: nulle part"))
+    handler = CachedGeocodingSourceHandler(source, geocoding_handler)
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Aucun lieu trouvé"):
+            handler.get_address_coordinates("nulle part")
+
+    assert source.calls == ["nulle part"]
+    assert geocoding_handler.get_geocoding_stats() == {"miss": 1, "negative_hit": 1}
+
+
+def test_transient_errors_are_not_cached(geocoding_handler):
+    source = StubSource(requests.ConnectionError("connexion refusée"))
+    handler = CachedGeocodingSourceHandler(source, geocoding_handler)
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            handler.get_address_coordinates("12 rue de la paix")
+
+    assert len(source.calls) == 2
+    assert geocoding_handler.get_geocoding("12 rue de la paix") is None
+
+
+def test_rate_limited_lookup_is_retried_not_cached(geocoding_handler, geovelo_url):
+    GeoveloStandIn.responses = [
+        (429, b'{"message": "Too Many Requests"}'),
+        (200, b'{"places": [{"x": 598000.0, "y": 2429000.0}]}'),
+    ]
+    api_handler = ApiHandler()
+    api_handler.url_geovelo = geovelo_url
+    handler = CachedGeocodingSourceHandler(api_handler, geocoding_handler)
+
+    with pytest.raises(requests.HTTPError):
+        handler.get_address_coordinates("12 rue de la paix")
+    point = handler.get_address_coordinates("12 rue de la paix")
+
+    assert 2.0 < point.x < 2.7 and 48.6 < point.y < 49.1
+    assert geocoding_handler.get_geocoding("12 rue de la paix") == {"lon": point.x, "lat": point.y}
+
+
+def test_hit_counters_are_written_in_batches(geocoding_handler):
+    handler = CachedGeocodingSourceHandler(StubSource(), geocoding_handler)
+    handler.get_address_coordinates("12 rue de la paix")
+    for _ in range(10):
+        handler.get_address_coordinates("12 rue de la paix")
+
+    # Les lectures du cache n'écrivent pas leurs compteurs un par un
+    with sqlite3.connect(geocoding_handler.path) as connection:
+        stored = dict(connection.execute("SELECT event, count FROM geocoding_stats").fetchall())
+    assert stored == {"miss": 1}
+    assert geocoding_handler.get_geocoding_stats() == {"miss": 1, "hit": 10}
+
+
+def test_database_is_initialised_once_per_process(geocoding_handler, monkeypatch):
+    initialised = []
+    initialise = LocalFileSystemHandler._initialise
+    monkeypatch.setattr(LocalFileSystemHandler, "_initialise", lambda self: initialised.append(self.path) or initialise(self))
+
+    # Un gestionnaire par itinéraire : le schéma n'est pas recréé à chaque fois
+    for _ in range(3):
+        LocalFileSystemHandler(geocoding_handler.path).save_geocoding("12 rue de la paix", {"lon": 2.3, "lat": 48.8}, 60)
+    assert initialised == []
+
+    # Base supprimée : recréée à la prochaine instanciation
+    os.remove(geocoding_handler.path)
+    assert LocalFileSystemHandler(geocoding_handler.path).get_geocoding("12 rue de la paix") is None
+    assert initialised == [geocoding_handler.path]
@@ -0,0 +1,25 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from tests.parquet_source_handler import ParquetSourceHandler
+from tests.synthetic_parking_velo import generate_parking_velo_export
+from src.parking_velo.domain.usecases.filter_parking_velo_data import filter_parking_velo_data
+from src.parking_velo.domain.usecases.load_parking_velo_data import load_parking_velo_data
+from src.parking_velo.infrastructure import local_file_system_handler
+from src.parking_velo.infrastructure.local_file_system_handler import LocalFileSystemHandler
+
+
+@pytest.fixture
+def parking_velo_data(data_path) -> str:
+    # Pipeline complet sur un export synthétique : ingestion, filtres, sites, index et grilles
+    export_path = os.path.join(data_path, "export.parquet")
+    generate_parking_velo_export(3_000, export_path)
+    handler = LocalFileSystemHandler()
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_parking_velo_data(ParquetSourceHandler(export_path), handler)
+        filter_parking_velo_data(handler, with_grid=True)
+    local_file_system_handler._CACHE.clear()
+    return export_path
@@ -0,0 +1,68 @@
+import numpy as np
+from shapely.geometry import Point
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.entities.lambert93 import point_to_lambert93
+from src.parking_velo.domain.usecases.find_nearest_parking_velo import (
+    find_nearest_parking_velo, find_nearest_parking_velo_batch, find_nearest_parking_velo_matching)
+from src.parking_velo.infrastructure import local_file_system_handler
+from src.parking_velo.infrastructure.local_file_system_handler import LocalFileSystemHandler
+
+
+def _brute_force_nearest(df_sites, filter: ParkingVeloFilters, point: Point) -> int:
+    rows = np.flatnonzero(df_sites[ParkingVeloColumns.filter_mask].to_numpy() & filter.get_bit())
+    point_l93 = point_to_lambert93(point)
+    xs = df_sites[ParkingVeloColumns.x_l93].to_numpy(dtype=float)[rows]
+    ys = df_sites[ParkingVeloColumns.y_l93].to_numpy(dtype=float)[rows]
+    return int(rows[np.argmin(np.hypot(xs - point_l93.x, ys - point_l93.y))])
+
+
+def test_nearest_reuses_the_cached_filter_positions(parking_velo_data, monkeypatch):
+    handler = LocalFileSystemHandler(use_cache=True)
+    calls = []
+    filter_positions = local_file_system_handler.parking_velo_filter_positions
+    monkeypatch.setattr(
+        local_file_system_handler, "parking_velo_filter_positions",
+        lambda df, filter: calls.append(filter) or filter_positions(df, filter),
+    )
+
+    df_sites = handler.get_parking_velo_sites()
+    for point in [Point(2.3522, 48.8566), Point(2.30, 48.88), Point(2.40, 48.83)]:
+        nearest = find_nearest_parking_velo(handler, point, ParkingVeloFilters.default)
+        assert nearest.name == _brute_force_nearest(df_sites, ParkingVeloFilters.default, point)
+
+    # Lignes du filtre calculées à la première recherche seulement
+    assert calls == [ParkingVeloFilters.default]
+
+
+def test_nearest_matching_has_the_shape_of_nearest(parking_velo_data):
+    handler = LocalFileSystemHandler(use_cache=True)
+    point = Point(2.3522, 48.8566)
+    columns = [ParkingVeloColumns.capacite.value]
+
+    site = find_nearest_parking_velo(handler, point, ParkingVeloFilters.default, columns)
+    predicate = [(ParkingVeloColumns.capacite.value, ">=", 0)]
+    parking = find_nearest_parking_velo_matching(handler, point, predicate, columns)
+
+    # Un site d'un côté, un parking brut de l'autre, mais les mêmes champs
+    assert set(parking.index) == set(site.index)
+    assert isinstance(parking.name, int) and parking[ParkingVeloColumns.capacite] >= 0
+    assert (parking[ParkingVeloColumns.lon], parking[ParkingVeloColumns.lat]) == \
+        (parking[ParkingVeloColumns.geometry].x, parking[ParkingVeloColumns.geometry].y)
+
+
+def test_batch_matches_a_brute_force_search_per_point(parking_velo_data):
+    handler = LocalFileSystemHandler(use_cache=True)
+    rng = np.random.default_rng(7)
+    lons, lats = rng.uniform(2.25, 2.42, 200), rng.uniform(48.81, 48.90, 200)
+
+    df_nearest = find_nearest_parking_velo_batch(handler, lons, lats, ParkingVeloFilters.surveille)
+
+    df_sites = handler.get_parking_velo_sites()
+    rows = [
+        _brute_force_nearest(df_sites, ParkingVeloFilters.surveille, Point(lon, lat)) for lon, lat in zip(lons, lats)
+    ]
+    assert df_nearest[ParkingVeloColumns.osm_id].tolist() == df_sites[ParkingVeloColumns.osm_id].iloc[rows].tolist()
+    assert np.allclose(df_nearest.geometry.x, df_sites[ParkingVeloColumns.lon].iloc[rows].to_numpy(dtype=float))
+    assert np.allclose(df_nearest.geometry.y, df_sites[ParkingVeloColumns.lat].iloc[rows].to_numpy(dtype=float))
@@ -0,0 +1,71 @@
+import numpy as np
+import pyarrow as pa
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.usecases.get_parking_velo_data import get_parking_velo_count, get_shared_parking_velo_data
+from src.parking_velo.infrastructure import local_file_system_handler
+from src.parking_velo.infrastructure.local_file_system_handler import LocalFileSystemHandler
+
+
+def _buffer_address(column) -> int:
+    return column.array._pa_array.chunks[0].buffers()[1].address
+
+
+def test_shared_data_is_not_copied(parking_velo_data):
+    handler = LocalFileSystemHandler(use_cache=True)
+    columns = [ParkingVeloColumns.lon.value, ParkingVeloColumns.capacite.value]
+
+    df_parking_velo, positions = get_shared_parking_velo_data(handler, ParkingVeloFilters.surveille, columns)
+
+    # Colonnes du fichier projeté en mémoire, partagées par tous les appels et toutes les sessions
+    df_sites = handler.get_parking_velo_sites()
+    assert len(df_parking_velo) == len(df_sites)
+    assert _buffer_address(df_parking_velo[ParkingVeloColumns.lon]) == _buffer_address(df_sites[ParkingVeloColumns.lon])
+
+    filter_mask = df_sites[ParkingVeloColumns.filter_mask].to_numpy()
+    assert np.array_equal(positions, np.flatnonzero(filter_mask & ParkingVeloFilters.surveille.get_bit()))
+    assert 0 < len(positions) < len(df_sites)
+
+
+def test_sites_are_read_from_the_memory_mapped_file(parking_velo_data):
+    path = local_file_system_handler.PATH_PARKING_VELO_SITES
+    table_size = pa.ipc.open_file(pa.OSFile(path)).read_all().nbytes
+
+    # Lu dans un fichier ordinaire, le tableau est copié dans la mémoire allouée par Arrow
+    allocated = pa.total_allocated_bytes()
+    copied = pa.ipc.open_file(pa.OSFile(path)).read_all()
+    assert pa.total_allocated_bytes() - allocated >= table_size
+    del copied
+
+    # Projeté en mémoire, ses colonnes pointent dans les pages du fichier : Arrow n'alloue presque rien
+    allocated = pa.total_allocated_bytes()
+    df_sites = LocalFileSystemHandler(use_cache=True).get_parking_velo_sites()
+    assert len(df_sites) > 0
+    assert pa.total_allocated_bytes() - allocated < table_size // 10
+
+
+def test_count_is_the_number_of_parkings_not_sites(parking_velo_data):
+    handler = LocalFileSystemHandler(use_cache=True)
+
+    for filter in ParkingVeloFilters:
+        filtered = handler.get_filtered_parking_velo_data(filter)
+        assert get_parking_velo_count(handler, filter) == len(filtered)
+    assert get_parking_velo_count(handler, ParkingVeloFilters.default) > len(handler.get_parking_velo_sites())
+
+
+def test_filtered_reads_share_one_cached_table(parking_velo_data):
+    handler = LocalFileSystemHandler(use_cache=True)
+
+    for filter in ParkingVeloFilters:
+        cached = handler.get_filtered_parking_velo_data(filter, columns=[ParkingVeloColumns.osm_id.value])
+        uncached = LocalFileSystemHandler().get_filtered_parking_velo_data(filter)
+        assert cached[ParkingVeloColumns.osm_id].tolist() == uncached[ParkingVeloColumns.osm_id].tolist()
+
+    # Une table par fichier, les filtres n'y ajoutent que leurs positions
+    filter_entries = [
+        value for key, (_, value) in local_file_system_handler._CACHE.items()
+        if key.rsplit("#", 1)[-1] in {filter.value for filter in ParkingVeloFilters}
+    ]
+    assert len(filter_entries) == len(ParkingVeloFilters)
+    assert all(isinstance(positions, np.ndarray) and positions.dtype.kind == "i" for positions in filter_entries)
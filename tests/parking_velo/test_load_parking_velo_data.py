@@ -0,0 +1,178 @@
+import contextlib
+import io
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+
+import pandas as pd
+import pytest
+import requests
+
+from tests.synthetic_parking_velo import generate_parking_velo_export
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.datasets import ParkingVeloDatasets
+from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.usecases.filter_parking_velo_data import filter_parking_velo_data
+from src.parking_velo.domain.usecases.load_parking_velo_data import load_parking_velo_data
+from src.parking_velo.infrastructure.api_handler import ApiHandler
+from src.parking_velo.infrastructure.local_file_system_handler import LocalFileSystemHandler
+
+
+class IdfmStandIn(BaseHTTPRequestHandler):
+    # Export servi comme par le portail IDFM : ETag, Last-Modified et réponses 304
+    body = b""
+    etag = ""
+    last_modified = ""
+    delay = 0.0
+    requests: list[dict[str, Optional[str]]] = []
+
+    def do_GET(self) -> None:
+        IdfmStandIn.requests.append({
+            "If-None-Match": self.headers.get("If-None-Match"),
+            "If-Modified-Since": self.headers.get("If-Modified-Since"),
+        })
+        time.sleep(self.delay)
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", self.last_modified)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+@pytest.fixture
+def idfm_url() -> Iterator[str]:
+    IdfmStandIn.requests = []
+    IdfmStandIn.delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), IdfmStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/export.parquet"
+    server.shutdown()
+    server.server_close()
+
+
+def _publish(data_path: str, df_export: pd.DataFrame, etag: str, last_modified: str) -> None:
+    path = os.path.join(data_path, "export.parquet")
+    df_export.to_parquet(path, index=False, row_group_size=500)
+    with open(path, "rb") as f:
+        IdfmStandIn.body = f.read()
+    IdfmStandIn.etag = etag
+    IdfmStandIn.last_modified = last_modified
+
+
+def _synthetic_export(data_path: str, rows: int) -> pd.DataFrame:
+    path = os.path.join(data_path, "synthetic.parquet")
+    generate_parking_velo_export(rows, path)
+    return pd.read_parquet(path)
+
+
+def _load(url: str, handler: LocalFileSystemHandler) -> bool:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return load_parking_velo_data(ApiHandler(url), handler)
+
+
+def test_first_load_without_validators_downloads_everything(data_path, idfm_url):
+    df_export = _synthetic_export(data_path, 2_000)
+    _publish(data_path, df_export, '"v1"', "Mon, 06 Oct 2025 08:00:00 GMT")
+    handler = LocalFileSystemHandler()
+
+    assert _load(idfm_url, handler)
+
+    assert IdfmStandIn.requests == [{"If-None-Match": None, "If-Modified-Since": None}]
+    assert handler.get_parking_velo_source_validators() == {
+        "etag": '"v1"', "last_modified": "Mon, 06 Oct 2025 08:00:00 GMT"
+    }
+    df_gpd = handler.get_parking_velo_data()
+    assert sorted(df_gpd[ParkingVeloColumns.osm_id]) == sorted(df_export["osm_id"])
+    manifest = handler.get_parking_velo_manifest(ParkingVeloDatasets.parking_velo)
+    assert manifest["row_count"] == len(df_export)
+    assert manifest["source_timestamp"] == "2025-10-06T08:00:00+00:00"
+
+
+def test_unchanged_source_answers_304_and_keeps_the_data(data_path, idfm_url):
+    _publish(data_path, _synthetic_export(data_path, 1_000), '"v1"', "Mon, 06 Oct 2025 08:00:00 GMT")
+    handler = LocalFileSystemHandler()
+    _load(idfm_url, handler)
+    manifest = handler.get_parking_velo_manifest(ParkingVeloDatasets.parking_velo)
+
+    assert not _load(idfm_url, handler)
+
+    assert IdfmStandIn.requests[-1] == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 06 Oct 2025 08:00:00 GMT"
+    }
+    assert handler.get_parking_velo_manifest(ParkingVeloDatasets.parking_velo) == manifest
+
+
+def test_changed_source_is_merged_and_filtered_data_updated(data_path, idfm_url):
+    df_export = _synthetic_export(data_path, 3_000)
+    _publish(data_path, df_export, '"v1"', "Mon, 06 Oct 2025 08:00:00 GMT")
+    handler = LocalFileSystemHandler()
+    _load(idfm_url, handler)
+    with contextlib.redirect_stdout(io.StringIO()):
+        filter_parking_velo_data(handler)
+
+    # Nouvelle version : 100 parkings supprimés, 100 modifiés et tous rendus surveillés, 1 ajouté
+    df_changed = df_export.iloc[100:].copy()
+    df_changed.loc[df_changed.index[:100], "date_modif"] += pd.Timedelta(days=1)
+    df_changed.loc[df_changed.index[:100], "surveille"] = "OUI"
+    df_changed = pd.concat([df_changed, df_export.iloc[[0]].assign(osm_id="node/new")], ignore_index=True)
+    _publish(data_path, df_changed, '"v2"', "Tue, 07 Oct 2025 08:00:00 GMT")
+
+    assert _load(idfm_url, handler)
+
+    assert IdfmStandIn.requests[-1]["If-None-Match"] == '"v1"'
+    assert handler.get_parking_velo_source_validators()["etag"] == '"v2"'
+    df_gpd = handler.get_parking_velo_data()
+    assert sorted(df_gpd[ParkingVeloColumns.osm_id]) == sorted(df_changed["osm_id"])
+    assert df_gpd[[ParkingVeloColumns.x_l93, ParkingVeloColumns.y_l93]].notna().all().all()
+
+    # Jeu filtré mis à jour par différence : identique à un filtrage complet de la nouvelle version
+    updated = handler.get_parking_velo_manifest(ParkingVeloDatasets.filtered)
+    with contextlib.redirect_stdout(io.StringIO()):
+        filter_parking_velo_data(handler)
+    assert updated["filter_counts"] == handler.get_parking_velo_manifest(ParkingVeloDatasets.filtered)["filter_counts"]
+
+
+def test_stalled_server_times_out(idfm_url):
+    IdfmStandIn.delay = 1.0
+
+    with pytest.raises(requests.Timeout):
+        ApiHandler(idfm_url, timeout=(1.0, 0.2)).get_parking_velo_data_if_modified({})
+
+
+def test_data_written_with_an_older_schema_is_reloaded(data_path, idfm_url):
+    df_export = _synthetic_export(data_path, 2_000)
+    _publish(data_path, df_export, '"v1"', "Mon, 06 Oct 2025 08:00:00 GMT")
+    handler = LocalFileSystemHandler()
+    _load(idfm_url, handler)
+    with contextlib.redirect_stdout(io.StringIO()):
+        filter_parking_velo_data(handler)
+
+    # Fichiers d'avant les coordonnées Lambert-93, source inchangée depuis
+    handler.save_parking_velo_data(
+        handler.get_parking_velo_data().drop(columns=[ParkingVeloColumns.x_l93.value, ParkingVeloColumns.y_l93.value])
+    )
+    handler.save_filtered_parking_velo_data(
+        handler.get_filtered_parking_velo_data(ParkingVeloFilters.default).drop(
+            columns=[ParkingVeloColumns.x_l93.value, ParkingVeloColumns.y_l93.value]
+        )
+    )
+
+    assert _load(idfm_url, handler)
+
+    assert IdfmStandIn.requests[-1] == {"If-None-Match": None, "If-Modified-Since": None}
+    df_gpd = handler.get_parking_velo_data()
+    assert df_gpd[[ParkingVeloColumns.x_l93, ParkingVeloColumns.y_l93]].notna().all().all()
+    df_filtered = handler.get_filtered_parking_velo_data(ParkingVeloFilters.default)
+    assert df_filtered[[ParkingVeloColumns.x_l93, ParkingVeloColumns.y_l93]].notna().all().all()
+    assert handler.get_parking_velo_index() is not None
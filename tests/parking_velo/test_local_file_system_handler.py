@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.synthetic_parking_velo import generate_parking_velo_export
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.parking_velo_to_gpd import parking_velo_to_gpd
+from src.parking_velo.infrastructure import local_file_system_handler
+from src.parking_velo.infrastructure.local_file_system_handler import (
+    PREDICATE_MASK_CACHE_SIZE, LocalFileSystemHandler)
+
+
+@pytest.fixture
+def handler(data_path) -> LocalFileSystemHandler:
+    path = os.path.join(data_path, "export.parquet")
+    generate_parking_velo_export(1_000, path)
+    LocalFileSystemHandler().save_parking_velo_data(parking_velo_to_gpd(pd.read_parquet(path)))
+    local_file_system_handler._PREDICATE_MASKS.clear()
+    local_file_system_handler._CACHE.clear()
+    return LocalFileSystemHandler(use_cache=True)
+
+
+def test_predicate_mask_matches_an_uncached_read(handler):
+    predicate = [(ParkingVeloColumns.capacite.value, ">=", 30), (ParkingVeloColumns.type.value, "=", "abri")]
+
+    mask = handler.get_parking_velo_predicate_mask(predicate)
+
+    df_gpd = LocalFileSystemHandler().get_parking_velo_data()
+    expected = (df_gpd[ParkingVeloColumns.capacite] >= 30) & (df_gpd[ParkingVeloColumns.type] == "abri")
+    assert np.array_equal(mask, expected.to_numpy())
+    assert handler.get_parking_velo_predicate_mask(predicate) is mask
+
+
+def test_predicate_masks_are_bounded(handler):
+    for capacity in range(PREDICATE_MASK_CACHE_SIZE * 3):
+        handler.get_parking_velo_predicate_mask([(ParkingVeloColumns.capacite.value, ">=", capacity)])
+
+    assert len(local_file_system_handler._PREDICATE_MASKS) == PREDICATE_MASK_CACHE_SIZE
+    # Les prédicats les plus récents sont conservés, aucun masque n'entre dans le cache des fichiers
+    assert repr([(ParkingVeloColumns.capacite.value, ">=", PREDICATE_MASK_CACHE_SIZE * 3 - 1)]) in \
+        local_file_system_handler._PREDICATE_MASKS
+    assert not any("capacite" in key for key in local_file_system_handler._CACHE)
+
+
+def test_cached_data_is_reloaded_when_the_file_changes(handler):
+    df_gpd = handler.get_parking_velo_data()
+    assert handler.get_parking_velo_data()[ParkingVeloColumns.osm_id.value].array is \
+        df_gpd[ParkingVeloColumns.osm_id.value].array
+
+    LocalFileSystemHandler().save_parking_velo_data(df_gpd.iloc[:500])
+    # Date de modification distincte même sur un système de fichiers à la seconde près
+    stat = os.stat(local_file_system_handler.PATH_PARKING_VELO)
+    os.utime(local_file_system_handler.PATH_PARKING_VELO, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    reloaded = handler.get_parking_velo_data()
+    assert len(reloaded) == 500
+    assert reloaded[ParkingVeloColumns.osm_id].tolist() == df_gpd[ParkingVeloColumns.osm_id].iloc[:500].tolist()
+
+
+def test_different_files_are_read_in_parallel_and_each_file_once(data_path):
+    paths = [os.path.join(data_path, f"{name}.bin") for name in ("a", "b")]
+    for path in paths:
+        with open(path, "wb") as f:
+            f.write(b"x")
+    reads = []
+
+    def slow_reader(path: str) -> str:
+        reads.append(path)
+        time.sleep(0.2)
+        return path
+
+    threads = [
+        threading.Thread(target=local_file_system_handler._read_cached, args=(path, slow_reader))
+        for path in paths * 2
+    ]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Deux lectures de 0,2 s en parallèle, les demandes du même fichier attendent la première lecture
+    assert time.perf_counter() - started_at < 0.35
+    assert sorted(reads) == sorted(paths)
+
+
+def test_cached_projection_decodes_only_the_requested_columns(handler):
+    columns = [ParkingVeloColumns.osm_id.value, ParkingVeloColumns.capacite.value]
+
+    df_gpd = handler.get_parking_velo_data(columns=columns)
+
+    assert list(df_gpd.columns) == [*columns, ParkingVeloColumns.geometry.value]
+    (_, cached), = local_file_system_handler._CACHE.values()
+    assert sorted(cached.columns) == sorted(df_gpd.columns)
+
+    # Une fois le fichier entier chargé, les projections en sont tirées sans nouveau décodage
+    df_full = handler.get_parking_velo_data()
+    cached_keys = set(local_file_system_handler._CACHE)
+    projected = handler.get_parking_velo_data(columns=[ParkingVeloColumns.nom.value])
+    assert set(local_file_system_handler._CACHE) == cached_keys
+    assert projected[ParkingVeloColumns.nom.value].array is df_full[ParkingVeloColumns.nom.value].array
+
+
+@pytest.mark.parametrize("bbox", [(2.30, 48.83, 2.38, 48.88), (2.0, 48.0, 3.0, 49.5), (0.0, 0.0, 0.1, 0.1)])
+def test_bbox_read_matches_a_clipped_full_read(handler, bbox):
+    df_gpd = LocalFileSystemHandler().get_parking_velo_data()
+    xmin, ymin, xmax, ymax = bbox
+    expected = sorted(df_gpd.cx[xmin:xmax, ymin:ymax][ParkingVeloColumns.osm_id.value].tolist())
+
+    # Lecture par groupes de lignes sans cache, découpe du fichier en cache
+    for bbox_handler in [LocalFileSystemHandler(), handler]:
+        df_bbox = bbox_handler.get_parking_velo_data(bbox=bbox)
+        assert sorted(df_bbox[ParkingVeloColumns.osm_id.value].tolist()) == expected
@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.synthetic_parking_velo import generate_parking_velo_export
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.merge_parking_velo_data import merge_parking_velo_data
+from src.parking_velo.domain.entities.parking_velo_to_gpd import GEO_POINT_COL, parking_velo_batches_to_gpd
+
+
+@pytest.fixture(scope="module")
+def df_export(tmp_path_factory) -> pd.DataFrame:
+    path = os.path.join(tmp_path_factory.mktemp("export"), "export.parquet")
+    generate_parking_velo_export(1_000, path)
+    return pd.read_parquet(path)
+
+
+def _batches(df: pd.DataFrame, size: int = 300) -> list[pd.DataFrame]:
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+def test_unchanged_source_has_no_changed_or_dropped_rows(df_export):
+    df_gpd_existing = parking_velo_batches_to_gpd(_batches(df_export))
+
+    df_gpd_merged, df_gpd_changed, dropped_osm_ids = merge_parking_velo_data(df_gpd_existing, _batches(df_export))
+
+    assert len(df_gpd_changed) == 0
+    assert len(dropped_osm_ids) == 0
+    assert sorted(df_gpd_merged[ParkingVeloColumns.osm_id]) == sorted(df_export["osm_id"])
+
+
+def test_modified_added_and_dropped_rows(df_export):
+    df_gpd_existing = parking_velo_batches_to_gpd(_batches(df_export))
+
+    df_source = df_export.iloc[10:].copy()
+    # Parkings 10 à 14 déplacés et datés du lendemain, un nouveau parking en fin d'export
+    moved = df_export.iloc[[0]][GEO_POINT_COL].iloc[0]
+    df_source.loc[df_source.index[:5], "date_modif"] += pd.Timedelta(days=1)
+    df_source.loc[df_source.index[:5], GEO_POINT_COL] = moved
+    df_source = pd.concat([df_source, df_export.iloc[[1]].assign(osm_id="node/new")], ignore_index=True)
+
+    df_gpd_merged, df_gpd_changed, dropped_osm_ids = merge_parking_velo_data(df_gpd_existing, _batches(df_source))
+
+    assert sorted(dropped_osm_ids) == sorted(df_export["osm_id"].iloc[:15])
+    assert sorted(df_gpd_changed[ParkingVeloColumns.osm_id]) == sorted(
+        [*df_export["osm_id"].iloc[10:15], "node/new"]
+    )
+    assert sorted(df_gpd_merged[ParkingVeloColumns.osm_id]) == sorted(df_source["osm_id"])
+
+    # Les lignes modifiées sont reconverties : coordonnées et date de la nouvelle version
+    df_moved = df_gpd_merged[df_gpd_merged[ParkingVeloColumns.osm_id].isin(df_export["osm_id"].iloc[10:15])]
+    first = df_gpd_existing[df_gpd_existing[ParkingVeloColumns.osm_id] == df_export["osm_id"].iloc[0]]
+    assert np.allclose(df_moved[ParkingVeloColumns.x_l93], first[ParkingVeloColumns.x_l93].iloc[0])
+    assert (df_moved[ParkingVeloColumns.date_modif] > df_export["date_modif"].iloc[10:15].min()).all()
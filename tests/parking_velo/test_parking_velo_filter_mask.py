@@ -0,0 +1,75 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.entities.compact_parking_velo import compact_parking_velo
+from src.parking_velo.domain.entities.parking_velo_filter_mask import (
+    parking_velo_filter_mask, parking_velo_filter_positions, select_parking_velo_filter)
+from src.parking_velo.domain.usecases.filter_parking_velo_data import FILTER_LIST
+
+
+def _parkings() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame({
+        ParkingVeloColumns.osm_id.value: ["node/0", "node/1", "node/2", "node/3", "node/4"],
+        ParkingVeloColumns.acces.value: ["privee", "clientele", "public", None, "public"],
+        ParkingVeloColumns.type.value: ["abri", "abri", "casier", "arceaux", "arceaux"],
+        ParkingVeloColumns.surveille.value: ["NON", "OUI", "NON", "NON", None],
+    }, geometry=gpd.points_from_xy(range(5), range(5)), crs="EPSG:4326")
+
+
+def test_each_row_carries_the_bits_of_the_filters_it_satisfies():
+    mask = parking_velo_filter_mask(_parkings(), FILTER_LIST)
+
+    assert mask.tolist() == [
+        ParkingVeloFilters.privee_abris.get_bit() | ParkingVeloFilters.default.get_bit(),
+        ParkingVeloFilters.clientele_abris.get_bit() | ParkingVeloFilters.surveille.get_bit()
+        | ParkingVeloFilters.default.get_bit(),
+        ParkingVeloFilters.casier.get_bit() | ParkingVeloFilters.default.get_bit(),
+        0,
+        0,
+    ]
+
+
+def test_bits_are_distinct_and_fit_the_mask_dtype():
+    bits = [filter.get_bit() for filter in ParkingVeloFilters]
+
+    assert len(set(bits)) == len(bits)
+    assert max(bits) <= np.iinfo(np.uint8).max
+
+
+def test_categorical_columns_give_the_same_mask():
+    df = _parkings()
+
+    assert parking_velo_filter_mask(compact_parking_velo(df), FILTER_LIST).tolist() == \
+        parking_velo_filter_mask(df, FILTER_LIST).tolist()
+
+
+def test_select_filter_keeps_matching_rows_in_order():
+    df = _parkings()
+    df[ParkingVeloColumns.filter_mask.value] = parking_velo_filter_mask(df, FILTER_LIST)
+
+    assert parking_velo_filter_positions(df, ParkingVeloFilters.default).tolist() == [0, 1, 2]
+    assert select_parking_velo_filter(df, ParkingVeloFilters.surveille)[ParkingVeloColumns.osm_id].tolist() == [
+        "node/1"
+    ]
+    assert select_parking_velo_filter(df, ParkingVeloFilters.privee_abris).index.tolist() == [0]
+
+
+def test_default_filter_is_the_union_of_the_others():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    df = gpd.GeoDataFrame({
+        ParkingVeloColumns.acces.value: rng.choice(np.array(["privee", "clientele", "public", None]), n),
+        ParkingVeloColumns.type.value: rng.choice(np.array(["abri", "casier", "arceaux"]), n),
+        ParkingVeloColumns.surveille.value: rng.choice(np.array(["OUI", "NON"]), n),
+    }, geometry=gpd.points_from_xy(np.zeros(n), np.zeros(n)))
+    mask = parking_velo_filter_mask(df, FILTER_LIST).to_numpy()
+
+    union = np.zeros(n, dtype=bool)
+    for filter in ParkingVeloFilters:
+        if filter != ParkingVeloFilters.default:
+            union |= (mask & filter.get_bit()) != 0
+    assert np.array_equal(union, (mask & ParkingVeloFilters.default.get_bit()) != 0)
+    assert pd.Series(mask).dtype == np.uint8
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from shapely.geometry import Point
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.domain.entities.parking_velo_grid import MAX_CELL_CANDIDATES, ParkingVeloGrid
+from src.parking_velo.domain.entities.parking_velo_index import ParkingVeloIndex
+
+
+def _index(xs: np.ndarray, ys: np.ndarray) -> ParkingVeloIndex:
+    return ParkingVeloIndex.from_lambert93(pd.DataFrame({
+        ParkingVeloColumns.x_l93.value: xs, ParkingVeloColumns.y_l93.value: ys,
+    }))
+
+
+def test_dense_area_is_split_and_matches_the_index():
+    # Centre dense façon Paris et parkings épars sur le reste de la région
+    rng = np.random.default_rng(0)
+    index = _index(
+        np.r_[rng.normal(652_000, 2_000, 20_000), rng.uniform(583_000, 742_000, 2_000)],
+        np.r_[rng.normal(6_862_000, 2_000, 20_000), rng.uniform(6_780_000, 6_906_000, 2_000)],
+    )
+    grid = ParkingVeloGrid(index)
+
+    leaf_sizes = np.diff(grid.offsets)[grid.first_child < 0]
+    assert np.count_nonzero(grid.first_child >= 0) > 0
+    assert np.median(leaf_sizes[leaf_sizes > 0]) <= MAX_CELL_CANDIDATES
+
+    for x, y in zip(rng.normal(652_000, 3_000, 500), rng.normal(6_862_000, 3_000, 500)):
+        point = Point(x, y)
+        assert grid.nearest(point) == index.nearest(point)
+
+
+def test_point_outside_the_grid():
+    grid = ParkingVeloGrid(_index(np.array([652_000.0]), np.array([6_862_000.0])))
+
+    assert grid.nearest(Point(0, 0)) is None
+    assert grid.nearest(Point(600_000, 6_800_000)) == 0
+
+
+def test_empty_filter():
+    grid = ParkingVeloGrid(_index(np.array([]), np.array([])))
+
+    assert len(grid) == 0
+    assert grid.nearest(Point(652_000, 6_862_000)) is None
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+from shapely.geometry import Point
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.datasets import ParkingVeloDatasets
+from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.entities.parking_velo_index import BRUTE_FORCE_LIMIT, ParkingVeloIndex
+from src.parking_velo.domain.entities.parking_velo_manifest import parking_velo_fingerprint
+from src.parking_velo.infrastructure.local_file_system_handler import LocalFileSystemHandler
+
+
+def _random_parkings(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        ParkingVeloColumns.osm_id.value: [f"node/{i}" for i in range(n)],
+        ParkingVeloColumns.x_l93.value: rng.uniform(640_000, 660_000, n),
+        ParkingVeloColumns.y_l93.value: rng.uniform(6_855_000, 6_870_000, n),
+    })
+
+
+def _brute_force_nearest(df: pd.DataFrame, point: Point, mask: np.ndarray) -> int:
+    distances = np.hypot(df[ParkingVeloColumns.x_l93] - point.x, df[ParkingVeloColumns.y_l93] - point.y).to_numpy()
+    distances[~mask] = np.inf
+    return int(np.argmin(distances))
+
+
+def _random_points(n: int, seed: int = 1) -> list[Point]:
+    rng = np.random.default_rng(seed)
+    return [Point(x, y) for x, y in zip(rng.uniform(638_000, 662_000, n), rng.uniform(6_853_000, 6_872_000, n))]
+
+
+def test_nearest_matches_brute_force():
+    df = _random_parkings(5_000)
+    index = ParkingVeloIndex.from_lambert93(df)
+    everything = np.ones(len(df), dtype=bool)
+
+    for point in _random_points(200):
+        assert index.nearest(point) == _brute_force_nearest(df, point, everything)
+
+
+def test_nearest_many_keeps_input_order():
+    df = _random_parkings(2_000)
+    index = ParkingVeloIndex.from_lambert93(df)
+    points = _random_points(50)
+
+    positions, distances = index.nearest_many(np.array(points, dtype=object))
+
+    assert positions.tolist() == [index.nearest(point) for point in points]
+    assert np.allclose(distances, shapely.distance(index.geometries[positions], points))
+
+
+@pytest.mark.parametrize("share", [0.01, 0.5])
+def test_nearest_where_matches_brute_force(share):
+    # 1 % des 20 000 parkings : calcul direct, 50 % : recherche par rayons croissants
+    df = _random_parkings(20_000)
+    index = ParkingVeloIndex.from_lambert93(df)
+    mask = np.random.default_rng(2).random(len(df)) < share
+    assert (np.count_nonzero(mask) <= BRUTE_FORCE_LIMIT) == (share == 0.01)
+
+    for point in _random_points(100):
+        assert index.nearest_where(point, mask) == _brute_force_nearest(df, point, mask)
+
+
+def test_nearest_where_without_match():
+    df = _random_parkings(100)
+    index = ParkingVeloIndex.from_lambert93(df)
+
+    assert index.nearest_where(Point(650_000, 6_860_000), np.zeros(len(df), dtype=bool)) is None
+
+
+def test_index_of_another_data_version_is_ignored(data_path):
+    handler = LocalFileSystemHandler()
+    df = _random_parkings(1_000)
+    handler.save_parking_velo_manifest({"fingerprint": parking_velo_fingerprint(df)}, ParkingVeloDatasets.sites)
+    handler.save_parking_velo_index(
+        ParkingVeloIndex.from_lambert93(df, parking_velo_fingerprint(df)), ParkingVeloFilters.default
+    )
+    assert handler.get_parking_velo_index(ParkingVeloFilters.default) is not None
+
+    # Même nombre de lignes, parkings différents : l'index enregistré ne correspond plus
+    df_refreshed = _random_parkings(1_000, seed=3)
+    handler.save_parking_velo_manifest(
+        {"fingerprint": parking_velo_fingerprint(df_refreshed)}, ParkingVeloDatasets.sites
+    )
+    assert handler.get_parking_velo_index(ParkingVeloFilters.default) is None
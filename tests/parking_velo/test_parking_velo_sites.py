@@ -0,0 +1,95 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyproj
+
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.entities.lambert93 import LAMBERT93, WGS84
+from src.parking_velo.domain.entities.parking_velo_filter_mask import select_parking_velo_filter
+from src.parking_velo.domain.entities.parking_velo_sites import (
+    SITE_MAX_SIZE, SITE_RADIUS, parking_velo_site_labels, parking_velo_sites)
+
+PARIS = (652_000.0, 6_862_000.0)
+
+
+def _parkings(xs, ys, masks=None, capacities=None) -> gpd.GeoDataFrame:
+    xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    n = len(xs)
+    lons, lats = pyproj.Transformer.from_crs(LAMBERT93, WGS84, always_xy=True).transform(xs, ys)
+    return gpd.GeoDataFrame({
+        ParkingVeloColumns.osm_id.value: [f"node/{i}" for i in range(n)],
+        ParkingVeloColumns.capacite.value: np.full(n, 10) if capacities is None else capacities,
+        ParkingVeloColumns.filter_mask.value: np.asarray(
+            np.full(n, ParkingVeloFilters.default.get_bit()) if masks is None else masks, dtype=np.uint8
+        ),
+        ParkingVeloColumns.date_modif.value: pd.Timestamp("2024-01-01"),
+        ParkingVeloColumns.x_l93.value: xs,
+        ParkingVeloColumns.y_l93.value: ys,
+    }, geometry=gpd.points_from_xy(lons, lats), crs=WGS84)
+
+
+def _extents(df: pd.DataFrame, labels: np.ndarray) -> np.ndarray:
+    grouped = df.groupby(labels)
+    x, y = grouped[ParkingVeloColumns.x_l93.value], grouped[ParkingVeloColumns.y_l93.value]
+    return np.maximum(x.max() - x.min(), y.max() - y.min()).to_numpy()
+
+
+def test_close_parkings_form_one_site_and_distant_ones_stay_apart():
+    df = _parkings([PARIS[0], PARIS[0] + 5, PARIS[0] + 12, PARIS[0] + 200], [PARIS[1]] * 4)
+
+    labels = parking_velo_site_labels(df)
+
+    assert labels.tolist()[:3] == [labels[0]] * 3
+    assert labels[3] != labels[0]
+    assert sorted(set(labels.tolist())) == [0, 1]
+
+
+def test_a_row_of_racks_along_a_street_is_cut_into_bounded_sites():
+    # 100 arceaux espacés de 10 m : un seul composant connexe de 1 km
+    df = _parkings(PARIS[0] + 10 * np.arange(100), np.full(100, PARIS[1]))
+
+    labels = parking_velo_site_labels(df)
+
+    assert _extents(df, labels).max() <= SITE_MAX_SIZE
+    assert len(set(labels.tolist())) >= 1_000 / SITE_MAX_SIZE
+    # Chaque arceau reste à moins d'un demi-site du centre de son site
+    centroids = df.groupby(labels)[ParkingVeloColumns.x_l93.value].transform("mean")
+    assert (df[ParkingVeloColumns.x_l93] - centroids).abs().max() <= SITE_MAX_SIZE / 2
+
+
+def test_radius_zero_keeps_one_site_per_parking():
+    df = _parkings([PARIS[0], PARIS[0] + 1], [PARIS[1]] * 2)
+
+    assert parking_velo_site_labels(df, radius=0).tolist() == [0, 1]
+
+
+def test_sites_never_mix_parkings_of_different_filters():
+    privee, surveille, default = (filter.get_bit() for filter in (
+        ParkingVeloFilters.privee_abris, ParkingVeloFilters.surveille, ParkingVeloFilters.default
+    ))
+    df = _parkings(
+        [PARIS[0], PARIS[0] + 3, PARIS[0] + 6, PARIS[0] + 9],
+        [PARIS[1]] * 4,
+        masks=[privee | default, privee | default, surveille | default, surveille | default],
+        capacities=[10, 20, 5, 7],
+    )
+
+    sites = parking_velo_sites(df)
+
+    assert len(sites) == 2
+    df_privee = select_parking_velo_filter(sites, ParkingVeloFilters.privee_abris)
+    assert df_privee[ParkingVeloColumns.capacite].tolist() == [30]
+    assert sorted(df_privee[ParkingVeloColumns.osm_ids].iloc[0]) == ["node/0", "node/1"]
+    df_default = select_parking_velo_filter(sites, ParkingVeloFilters.default)
+    assert df_default[ParkingVeloColumns.capacite].sum() == 42
+
+
+def test_site_position_is_the_members_centroid():
+    df = _parkings([PARIS[0], PARIS[0] + 10], [PARIS[1], PARIS[1] + 10])
+
+    sites = parking_velo_sites(df, radius=SITE_RADIUS)
+
+    assert len(sites) == 1
+    assert np.isclose(sites[ParkingVeloColumns.x_l93].iloc[0], PARIS[0] + 5)
+    assert np.isclose(sites[ParkingVeloColumns.y_l93].iloc[0], PARIS[1] + 5)
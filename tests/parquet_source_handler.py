@@ -0,0 +1,29 @@
+import os
+from typing import Iterator, Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.parking_velo.domain.ports.source_handler import SourceHandler
+
+
+class ParquetSourceHandler(SourceHandler):
+    # Export parquet local servi comme la source IDFM, groupe de lignes par groupe de lignes
+    def __init__(self, path: str):
+        self.path = path
+
+    def get_parking_velo_data(self) -> pd.DataFrame:
+        return pd.read_parquet(self.path)
+
+    def get_parking_velo_data_if_modified(
+        self, validators: dict[str, str]
+    ) -> tuple[Optional[Iterator[pd.DataFrame]], dict[str, str]]:
+        etag = f"{os.stat(self.path).st_mtime_ns}-{os.stat(self.path).st_size}"
+        if validators.get("etag") == etag:
+            return None, validators
+        return self._iter_row_groups(), {"etag": etag}
+
+    def _iter_row_groups(self) -> Iterator[pd.DataFrame]:
+        parquet_file = pq.ParquetFile(self.path)
+        for i in range(parquet_file.num_row_groups):
+            yield parquet_file.read_row_group(i).to_pandas()
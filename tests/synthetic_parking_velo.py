@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+
+from src.parking_velo.domain.entities.parking_velo_to_gpd import GEO_POINT_COL, GEO_SHAPE_COL
+
+# Schéma de l'export parquet « stationnement-velo-en-ile-de-france » d'IDFM
+SCHEMA = pa.schema([
+    ("osm_id", pa.string()),
+    ("couvert", pa.string()),
+    ("capacite", pa.int64()),
+    ("nom", pa.string()),
+    ("acces", pa.string()),
+    ("payant", pa.string()),
+    ("surveille", pa.string()),
+    ("type", pa.string()),
+    ("insee_com", pa.string()),
+    ("nom_com", pa.string()),
+    ("date_modif", pa.timestamp("ns")),
+    ("notes", pa.string()),
+    (GEO_SHAPE_COL, pa.binary()),
+    (GEO_POINT_COL, pa.binary()),
+])
+
+# Emprise de l'Île-de-France en WGS84 et centre de Paris
+ILE_DE_FRANCE_BOUNDS = (1.45, 48.12, 3.55, 49.24)
+PARIS_CENTER = (2.3522, 48.8566)
+
+N_COMMUNES = 1_300
+COMMUNE_SPREAD = 0.01  # ~1 km autour du centre de la commune
+COLOCATED_SHARE = 0.2  # part des arceaux posés à quelques mètres d'un autre
+COLOCATED_SPREAD = 0.00004  # ~4 m
+
+CHUNK_SIZE = 250_000
+
+
+def generate_parking_velo_export(rows: int, path: str, seed: int = 0, chunk_size: int = CHUNK_SIZE) -> None:
+    # Écrit par blocs : 5 millions de lignes ne sont jamais en mémoire en même temps
+    rng = np.random.default_rng(seed)
+    communes = _communes(rng)
+    with pq.ParquetWriter(path, SCHEMA) as writer:
+        for start in range(0, rows, chunk_size):
+            chunk = _parking_velo_chunk(rng, communes, start, min(chunk_size, rows - start))
+            writer.write_table(pa.Table.from_pandas(chunk, schema=SCHEMA, preserve_index=False))
+
+
+def _communes(rng: np.random.Generator) -> pd.DataFrame:
+    xmin, ymin, xmax, ymax = ILE_DE_FRANCE_BOUNDS
+    lons = rng.uniform(xmin, xmax, N_COMMUNES)
+    lats = rng.uniform(ymin, ymax, N_COMMUNES)
+    # Paris et la petite couronne concentrent l'essentiel des stationnements
+    distances = np.hypot(lons - PARIS_CENTER[0], lats - PARIS_CENTER[1])
+    weights = np.exp(-distances / 0.15)
+    departments = rng.choice(["75", "77", "78", "91", "92", "93", "94", "95"], N_COMMUNES)
+    return pd.DataFrame({
+        "lon": lons,
+        "lat": lats,
+        "weight": weights / weights.sum(),
+        "insee_com": [f"{department}{i:03d}" for i, department in enumerate(departments)],
+        "nom_com": [f"Commune {i}" for i in range(N_COMMUNES)],
+    })
+
+
+def _parking_velo_chunk(rng: np.random.Generator, communes: pd.DataFrame, start: int, n: int) -> pd.DataFrame:
+    commune = rng.choice(len(communes), n, p=communes["weight"].to_numpy())
+    lons = communes["lon"].to_numpy()[commune] + rng.normal(0, COMMUNE_SPREAD, n)
+    lats = communes["lat"].to_numpy()[commune] + rng.normal(0, COMMUNE_SPREAD, n)
+
+    # Arceaux voisins : recopiés à quelques mètres d'un point précédent du bloc
+    colocated = np.flatnonzero(rng.random(n) < COLOCATED_SHARE)
+    colocated = colocated[colocated > 0]
+    neighbours = rng.integers(0, colocated, len(colocated))
+    lons[colocated] = lons[neighbours] + rng.normal(0, COLOCATED_SPREAD, len(colocated))
+    lats[colocated] = lats[neighbours] + rng.normal(0, COLOCATED_SPREAD, len(colocated))
+    commune[colocated] = commune[neighbours]
+
+    points = shapely.to_wkb(shapely.points(lons, lats))
+    return pd.DataFrame({
+        "osm_id": [f"node/{i}" for i in range(start, start + n)],
+        "couvert": rng.choice(np.array(["OUI", "NON", None]), n, p=[0.2, 0.6, 0.2]),
+        "capacite": rng.integers(1, 60, n),
+        "nom": rng.choice(np.array(["Gare", "Mairie", "Ecole", "Marché", None]), n, p=[0.1, 0.1, 0.1, 0.05, 0.65]),
+        "acces": rng.choice(np.array(["public", "privee", "clientele", None]), n, p=[0.6, 0.15, 0.15, 0.1]),
+        "payant": rng.choice(np.array(["OUI", "NON"]), n, p=[0.05, 0.95]),
+        "surveille": rng.choice(np.array(["OUI", "NON"]), n, p=[0.1, 0.9]),
+        "type": rng.choice(np.array(["arceaux", "ancrage", "abri", "casier"]), n, p=[0.55, 0.2, 0.15, 0.1]),
+        "insee_com": communes["insee_com"].to_numpy()[commune],
+        "nom_com": communes["nom_com"].to_numpy()[commune],
+        "date_modif": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2_000, n), unit="D"),
+        "notes": rng.choice(np.array(["Devant l'entrée", None]), n, p=[0.05, 0.95]),
+        GEO_SHAPE_COL: points,
+        GEO_POINT_COL: points,
+    })
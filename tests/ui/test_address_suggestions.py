@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from ui import address_suggestions
+from ui.address_suggestions import AddressSuggestionService
+
+
+class StubGoogleMaps:
+    # Client Google Maps en mémoire : une suggestion par requête, appels enregistrés
+    def __init__(self):
+        self.queries: list[str] = []
+
+    def places_autocomplete(self, query, **_):
+        self.queries.append(query)
+        return [{"description": f"{query}, Paris, France"}]
+
+
+@pytest.fixture(autouse=True)
+def short_debounce(monkeypatch):
+    monkeypatch.setattr(address_suggestions, "SUGGESTION_DEBOUNCE", 0.1)
+    monkeypatch.setattr(address_suggestions, "SUGGESTION_DEBOUNCE_POLL", 0.005)
+
+
+def _not_superseded() -> bool:
+    return False
+
+
+def test_query_after_a_pause_calls_google_once():
+    service, gmaps = AddressSuggestionService(), StubGoogleMaps()
+
+    first = service.suggest("12 rue de la paix", gmaps, "token", _not_superseded)
+    second = service.suggest("12 rue de la paix", gmaps, "token", _not_superseded)
+
+    assert gmaps.queries == ["12 rue de la paix"]
+    assert first == second == ["12 rue de la paix, Paris, France"]
+
+
+def test_superseded_query_makes_no_google_call():
+    service, gmaps = AddressSuggestionService(), StubGoogleMaps()
+    service.cache.set("12 rue", ["12 Rue de la Paix, Paris", "12 Rue du Bac, Paris"])
+
+    # Frappe plus récente en attente dans Streamlit pendant le délai
+    suggestions = service.suggest("12 rue de la", gmaps, "token", superseded=lambda: True)
+
+    assert gmaps.queries == []
+    assert suggestions == ["12 Rue de la Paix, Paris"]
+
+
+def test_only_the_last_query_of_a_burst_calls_google():
+    service, gmaps = AddressSuggestionService(), StubGoogleMaps()
+    threads = []
+    for query in ["12 r", "12 ru", "12 rue", "12 rue de", "12 rue de la paix"]:
+        thread = threading.Thread(target=service.suggest, args=(query, gmaps, "token", _not_superseded))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+
+    assert gmaps.queries == ["12 rue de la paix"]
+
+
+def test_sessions_are_debounced_independently():
+    service, gmaps = AddressSuggestionService(), StubGoogleMaps()
+    threads = [
+        threading.Thread(target=service.suggest, args=(query, gmaps, token, _not_superseded))
+        for query, token in [("12 rue de la paix", "a"), ("3 avenue foch", "b")]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(gmaps.queries) == ["12 rue de la paix", "3 avenue foch"]
+
+
+def test_outside_streamlit_no_keystroke_is_pending():
+    assert address_suggestions.newer_keystroke_pending() is False
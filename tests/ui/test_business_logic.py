@@ -0,0 +1,43 @@
+import copy
+
+from ui.business_logic import _normalize_bike_itineraries
+
+
+def _option(title: str, start: float) -> dict:
+    return {
+        'title': title,
+        'id': f"{title}-{start}",
+        'duration': 600,
+        'distances': {'total': 2_000},
+        'sections': [{'geometry': f"polyline-{start}", 'details': {'direction': 'N'}}],
+        'waypoints': [{'longitude': start, 'latitude': 48.85}, {'longitude': start + 0.01, 'latitude': 48.86}],
+        'details': {'elevation': 12},
+        'estimatedDatetimeOfDeparture': f"2026-10-18T08:{int(start * 10):02d}:00",
+        'estimatedDatetimeOfArrival': f"2026-10-18T09:{int(start * 10):02d}:00",
+    }
+
+
+def test_normalization_does_not_mutate_or_share_the_callers_containers():
+    segments = [[_option('RECOMMENDED', 2.3), _option('FASTER', 2.3)], [_option('RECOMMENDED', 2.4)]]
+    snapshot = copy.deepcopy(segments)
+
+    routes = _normalize_bike_itineraries(segments)
+
+    assert segments == snapshot
+    assert [route['title'] for route in routes] == ['RECOMMENDED', 'FASTER']
+    assert len(routes[0]['sections']) == 2 and routes[0]['duration'] == 1_200
+
+    # L'itinéraire agrégé a ses propres listes et dictionnaires : les modifier laisse l'entrée intacte
+    routes[0]['sections'].append({'geometry': 'extra'})
+    routes[0]['waypoints'].clear()
+    routes[0]['details']['elevation'] = 0
+    routes[0]['distances']['total'] = 0
+    assert segments == snapshot
+
+
+def test_flat_routes_are_returned_in_a_new_list():
+    flat = [_option('RECOMMENDED', 2.3)]
+
+    routes = _normalize_bike_itineraries(flat)
+
+    assert routes == flat and routes is not flat
@@ -0,0 +1,11 @@
+from ui.constants import PARKING_VIEWPORT_LIMITS, PARKING_VIEWPORT_MAX
+from ui.map_components import _get_parking_viewport_limit
+
+
+def test_viewport_limit_grows_with_zoom():
+    limits = [_get_parking_viewport_limit(zoom) for zoom in range(14, 21)]
+
+    assert limits == sorted(limits)
+    assert limits[0] == min(PARKING_VIEWPORT_LIMITS.values())
+    assert _get_parking_viewport_limit(16) == PARKING_VIEWPORT_LIMITS[16]
+    assert _get_parking_viewport_limit(18) == PARKING_VIEWPORT_MAX
@@ -10,7 +10,7 @@ from .business_logic import (
     get_itinerary_result
 )
 
-from .map_components import create_base_map
+from .map_components import create_base_map, create_parking_viewport_layer
 
 from .route_components import (
     add_bike_routes_to_map,
@@ -29,6 +29,7 @@ __all__ = [
     'has_itinerary_result',
     'get_itinerary_result',
     'create_base_map',
+    'create_parking_viewport_layer',
     'add_bike_routes_to_map',
     'add_departure_arrival_markers',
     'add_walking_route_to_map',
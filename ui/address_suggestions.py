@@ -0,0 +1,304 @@
+"""
+Suggestions d'adresses : index local, cache partagé et appels Google limités
+"""
+
+import itertools
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_requests import ScriptRequestType
+
+from src.itineraire.domain.entities.geocoding import normalize_address
+from src.parking_velo.config.columns import ParkingVeloColumns
+from src.parking_velo.config.datasets import ParkingVeloDatasets
+from src.parking_velo.config.filters import ParkingVeloFilters
+from src.parking_velo.domain.apps.get_parking_velo import get_parking_velo_dataset_manifest, get_shared_parking_velo
+
+from .constants import (
+    PARIS_CENTER,
+    SUGGESTION_CACHE_SIZE,
+    SUGGESTION_CACHE_TTL,
+    SUGGESTION_DEBOUNCE,
+    SUGGESTION_DEBOUNCE_POLL,
+    SUGGESTION_LIMIT,
+    SUGGESTION_MIN_CHARS,
+)
+
+# Part minimale des trigrammes de la requête présents dans un nom pour le suggérer
+TRIGRAM_MIN_SCORE = 0.5
+
+
+def newer_keystroke_pending():
+    """Vérifie si une frappe plus récente attend la fin du run Streamlit courant.
+
+    Les runs d'une session s'exécutent l'un après l'autre : la frappe suivante
+    n'est visible que comme demande de rerun en attente (état interne de
+    Streamlit, lu défensivement), le run courant sera alors interrompu.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    script_requests = getattr(ctx, "script_requests", None)
+    return getattr(script_requests, "_state", None) == ScriptRequestType.RERUN
+
+
+def _trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _matches_words(query, normalized):
+    """Vérifie que chaque mot de la requête commence un mot du texte."""
+    words = normalized.split()
+    return all(any(word.startswith(token) for word in words) for token in query.split())
+
+
+class TtlLruCache:
+    """Cache borné (les entrées les moins récemment lues sont évincées) à durée de vie limitée."""
+
+    def __init__(self, max_entries=SUGGESTION_CACHE_SIZE, ttl=SUGGESTION_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def longest_prefix(self, key):
+        """Renvoie la réponse encore valide de la plus longue requête préfixe de key."""
+        for end in range(len(key) - 1, SUGGESTION_MIN_CHARS - 1, -1):
+            with self._lock:
+                entry = self._entries.get(key[:end])
+            if entry is not None and entry[0] >= time.monotonic():
+                return entry[1]
+        return None
+
+
+class AddressIndex:
+    """Index local de noms de lieux, interrogé par préfixe puis par trigrammes."""
+
+    def __init__(self, names=()):
+        self._names = {}
+        self._sorted = []
+        self._postings = {}
+        self._lock = threading.Lock()
+        self.add(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, names):
+        with self._lock:
+            added = False
+            for name in names:
+                normalized = normalize_address(name)
+                if len(normalized) < SUGGESTION_MIN_CHARS or normalized in self._names:
+                    continue
+                self._names[normalized] = name
+                for trigram in _trigrams(normalized):
+                    self._postings.setdefault(trigram, []).append(normalized)
+                added = True
+            if added:
+                self._sorted = sorted(self._names)
+
+    def search(self, query, limit=SUGGESTION_LIMIT):
+        query = normalize_address(query)
+        if len(query) < SUGGESTION_MIN_CHARS:
+            return []
+
+        with self._lock:
+            # Noms commençant par la requête, dans l'ordre alphabétique
+            found = []
+            position = bisect_left(self._sorted, query)
+            while position < len(self._sorted) and len(found) < limit and self._sorted[position].startswith(query):
+                found.append(self._sorted[position])
+                position += 1
+
+            # Complétés par les noms partageant le plus de trigrammes (fautes de frappe, mots dans le désordre)
+            if len(found) < limit:
+                query_trigrams = _trigrams(query)
+                counts = Counter()
+                for trigram in query_trigrams:
+                    counts.update(self._postings.get(trigram, ()))
+                min_count = TRIGRAM_MIN_SCORE * len(query_trigrams)
+                candidates = sorted(
+                    (name for name, count in counts.items() if count >= min_count and name not in found),
+                    key=lambda name: (-counts[name], len(name), name),
+                )
+                found.extend(candidates[:limit - len(found)])
+
+            return [self._names[name] for name in found]
+
+
+class AddressSuggestionService:
+    """Suggestions d'adresses partagées par toutes les sessions.
+
+    L'index local (noms de parkings, gares rencontrées, adresses déjà
+    choisies) répond en premier ; Google n'est appelé que si l'index et le
+    cache ne suffisent pas, au plus une fois par intervalle de debounce et
+    Google n'est appelé que si l'index et le cache ne suffisent pas, et
+    seulement pour une requête qui n'a pas été suivie d'une autre frappe de
+    la même saisie (un jeton par champ et par utilisateur) pendant
+    SUGGESTION_DEBOUNCE : les requêtes dépassées sont servies par la réponse
+    de leur plus long préfixe, sans appel.
+    """
+
+    def __init__(self):
+        self.index = AddressIndex()
+        self.cache = TtlLruCache()
+        self.parking_version = None
+        self._latest_queries = {}
+        self._query_numbers = itertools.count()
+        self._lock = threading.Lock()
+
+    def suggest(self, query, gmaps, session_token, superseded=newer_keystroke_pending):
+        normalized = normalize_address(query)
+        if len(normalized) < SUGGESTION_MIN_CHARS:
+            return []
+
+        suggestions = self.index.search(query)
+        if len(suggestions) >= SUGGESTION_LIMIT:
+            return suggestions
+
+        remote = self.cache.get(normalized)
+        if remote is None:
+            if not self._debounce(session_token, superseded):
+                # Requête dépassée par une frappe plus récente : réponse précédente affinée, sans appel à Google
+                remote = [
+                    suggestion for suggestion in self.cache.longest_prefix(normalized) or []
+                    if _matches_words(normalized, normalize_address(suggestion))
+                ]
+            else:
+                remote = _google_suggestions(query, gmaps, session_token)
+                if remote is not None:
+                    self.cache.set(normalized, remote)
+
+        return list(dict.fromkeys(suggestions + (remote or [])))[:SUGGESTION_LIMIT]
+
+    def remember(self, names):
+        """Ajoute des lieux (adresse choisie, gares) à l'index local."""
+        self.index.add(name for name in names if name)
+
+    def refresh_parkings(self):
+        """Indexe les noms de parkings, une fois par version des données."""
+        version = get_parking_velo_dataset_manifest(ParkingVeloDatasets.sites).get("built_at")
+        with self._lock:
+            if version == self.parking_version:
+                return
+            self.parking_version = version
+        self.index.add(_parking_names())
+
+    def _debounce(self, session_token, superseded):
+        """Attend SUGGESTION_DEBOUNCE sans nouvelle frappe de la saisie.
+
+        Renvoie False dès qu'une requête plus récente est arrivée pour le même
+        jeton (appels concurrents) ou que superseded() le signale (frappe en
+        attente dans Streamlit) ; True si Google peut être appelé.
+        """
+        with self._lock:
+            number = next(self._query_numbers)
+            self._latest_queries[session_token] = (number, time.monotonic())
+
+        deadline = time.monotonic() + SUGGESTION_DEBOUNCE
+        while True:
+            with self._lock:
+                latest_number, _ = self._latest_queries.get(session_token, (number, None))
+            if latest_number != number or superseded():
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(SUGGESTION_DEBOUNCE_POLL, remaining))
+
+        now = time.monotonic()
+        with self._lock:
+            # Saisies terminées oubliées : le dictionnaire reste borné
+            self._latest_queries = {
+                token: entry for token, entry in self._latest_queries.items()
+                if token == session_token or now - entry[1] < 2 * SUGGESTION_DEBOUNCE
+            }
+        return True
+
+
+@st.cache_resource(show_spinner=False)
+def get_address_suggestion_service():
+    """Service unique du processus, partagé par toutes les sessions."""
+    return AddressSuggestionService()
+
+
+def get_suggestion_session_token(key_prefix):
+    """Jeton de session Google du champ : regroupe les frappes d'une même saisie."""
+    token_key = f"{key_prefix}_session_token"
+    if token_key not in st.session_state:
+        st.session_state[token_key] = uuid.uuid4().hex
+    return st.session_state[token_key]
+
+
+def end_suggestion_session(key_prefix):
+    """Termine la saisie : la prochaine recherche du champ ouvre une nouvelle session Google."""
+    st.session_state.pop(f"{key_prefix}_session_token", None)
+
+
+def remember_itinerary_stations(itinerary_data):
+    """Ajoute à l'index les gares et arrêts traversés par l'itinéraire en transports."""
+    sections = itinerary_data.get('itinerary_transport') if isinstance(itinerary_data, dict) else None
+    if not isinstance(sections, list):
+        return
+
+    names = []
+    for section in sections:
+        if not isinstance(section, dict):
+            continue
+        for point in (section.get('from'), section.get('to')):
+            stop_point = point.get('stop_point') if isinstance(point, dict) else None
+            if isinstance(stop_point, dict):
+                names.append(stop_point.get('name') or stop_point.get('label'))
+    get_address_suggestion_service().remember(names)
+
+
+def _google_suggestions(query, gmaps, session_token):
+    """Interroge Google Places, None en cas d'erreur (la réponse n'est pas mise en cache)."""
+    try:
+        results = gmaps.places_autocomplete(
+            query, session_token=session_token, location=PARIS_CENTER, radius=50000
+        )
+        return [result['description'] for result in results]
+    except Exception:
+        return None
+
+
+def _parking_names():
+    """Noms des parkings vélo suivis de leur commune, un par nom de site."""
+    parking_data, positions = get_shared_parking_velo(
+        filter=ParkingVeloFilters.default,
+        columns=[ParkingVeloColumns.nom.value, ParkingVeloColumns.nom_com.value],
+    )
+    # Seules les deux colonnes lues sont extraites du jeu partagé
+    site_noms = parking_data[ParkingVeloColumns.nom].iloc[positions]
+    site_communes = parking_data[ParkingVeloColumns.nom_com].iloc[positions]
+    named = site_noms.notna().to_numpy(dtype=bool)
+
+    names = []
+    for noms, nom_com in zip(site_noms[named], site_communes[named]):
+        # Un site regroupe les noms et communes de ses parkings séparés par « ; »
+        commune = nom_com.split(";")[0] if isinstance(nom_com, str) else None
+        for nom in str(noms).split(";"):
+            names.append(f"{nom}, {commune}" if commune else nom)
+    return names
@@ -4,12 +4,12 @@ Logique métier pour l'application CycloFlow
 
 import logging
 from collections import OrderedDict
-from copy import deepcopy
 from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
 
 import streamlit as st
 
+from .address_suggestions import remember_itinerary_stations
 from .constants import DEBUG_ADDRESSES
 from src.parking_velo.config.filters import ParkingVeloFilters
 from src.itineraire.domain.apps.itineraire_velo import itineraire_parking_velo
@@ -98,6 +98,8 @@ def calculate_itinerary(
             else:
                 st.session_state.itinerary_result = result
                 st.session_state.selected_route = 0
+                # Gares et arrêts de l'itinéraire proposés ensuite dans l'autocomplétion
+                remember_itinerary_stations(result)
                 st.success("✅ Itinéraire calculé!")
                 return True
         except Exception as e:
@@ -150,9 +152,9 @@ def _normalize_bike_itineraries(raw_routes: Any) -> List[Dict[str, Any]]:
     if not raw_routes or not isinstance(raw_routes, list):
         return []
 
-    # Déjà au format plat attendu
+    # Déjà au format plat attendu : nouvelle liste, celle de l'appelant n'est pas partagée
     if all(isinstance(route, dict) for route in raw_routes):
-        return raw_routes
+        return list(raw_routes)
 
     aggregated: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
     order: List[str] = []
@@ -183,7 +185,7 @@ def _normalize_bike_itineraries(raw_routes: Any) -> List[Dict[str, Any]]:
                     'distances': {},
                     'sections': [],
                     'waypoints': [],
-                    'details': option.get('details') or {},
+                    'details': dict(option.get('details') or {}),
                     'segment_details': [],
                     'estimatedDatetimeOfDeparture': None,
                     'estimatedDatetimeOfArrival': None,
@@ -202,8 +204,10 @@ def _normalize_bike_itineraries(raw_routes: Any) -> List[Dict[str, Any]]:
                 if isinstance(value, (int, float)):
                     agg['distances'][key] = agg['distances'].get(key, 0) + value
 
+            # Sections, points de passage et options sont repris par référence, sans copie ; seules les
+            # listes et dictionnaires de l'itinéraire agrégé lui sont propres, l'entrée n'est jamais modifiée
             if option.get('sections'):
-                agg['sections'].extend(deepcopy(option['sections']))
+                agg['sections'].extend(option['sections'])
 
             for waypoint in option.get('waypoints', []):
                 if not isinstance(waypoint, dict):
@@ -211,7 +215,7 @@ def _normalize_bike_itineraries(raw_routes: Any) -> List[Dict[str, Any]]:
                 coords = (waypoint.get('longitude'), waypoint.get('latitude'))
                 if coords not in agg['_waypoints_seen']:
                     agg['_waypoints_seen'].add(coords)
-                    agg['waypoints'].append(deepcopy(waypoint))
+                    agg['waypoints'].append(waypoint)
 
             departure = option.get('estimatedDatetimeOfDeparture')
             if departure:
@@ -220,9 +224,9 @@ def _normalize_bike_itineraries(raw_routes: Any) -> List[Dict[str, Any]]:
             if arrival:
                 agg['_arrivals'].append(arrival)
 
-            agg['segment_details'].append(deepcopy(option))
+            agg['segment_details'].append(option)
             if not agg.get('details') and option.get('details'):
-                agg['details'] = option['details']
+                agg['details'] = dict(option['details'])
 
             if not agg.get('id') and option.get('id'):
                 agg['id'] = option.get('id')
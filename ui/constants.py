@@ -12,6 +12,36 @@ DEBUG_ADDRESSES = {
 PARIS_CENTER = (48.8566, 2.3522)
 DEFAULT_USER_LOCATION = (48.8580848, 2.3861367)  # Pan Piper
 
+# Carte principale
+MAP_KEY = 'main_map'
+MAP_WIDTH = 700
+MAP_HEIGHT = 500
+DEFAULT_ZOOM = 12
+
+# Nombre maximal de parkings envoyés au navigateur par zoom, au-delà du dernier niveau d'agrégats (15) :
+# une vue au zoom 16 couvre quatre fois la surface d'une vue au zoom 17, ses parkings sont plus serrés
+PARKING_VIEWPORT_LIMITS = {16: 1500, 17: 3000}
+# Limite des zooms plus fins, où la vue ne couvre que quelques rues
+PARKING_VIEWPORT_MAX = 5000
+# Marge autour de la vue (en fraction de sa taille) : un petit déplacement ne laisse pas de bord vide
+PARKING_VIEWPORT_PADDING = 0.2
+
+# Suggestions d'adresses
+SUGGESTION_MIN_CHARS = 3
+SUGGESTION_LIMIT = 5
+# Délai sans nouvelle frappe avant d'appeler Google pour un champ, en secondes
+SUGGESTION_DEBOUNCE = 0.3
+# Intervalle entre deux vérifications d'une frappe plus récente pendant ce délai, en secondes
+SUGGESTION_DEBOUNCE_POLL = 0.02
+# Cache des réponses Google partagé entre sessions
+SUGGESTION_CACHE_SIZE = 5000
+SUGGESTION_CACHE_TTL = 24 * 3600
+
+# Tolérances de simplification des tracés en degrés, du tracé complet au plus simplifié
+ROUTE_SIMPLIFY_TOLERANCES = [0.0, 0.00001, 0.00004, 0.00016, 0.00064, 0.00256]
+# Écart maximal toléré à l'écran entre tracé simplifié et tracé complet, en pixels
+ROUTE_SIMPLIFY_PIXELS = 1
+
 # Couleurs des routes
 ROUTE_COLORS = {
     'RECOMMENDED': '#2E86AB',  # Bleu
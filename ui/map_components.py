@@ -2,41 +2,96 @@
 Gestion des cartes Folium pour CycloFlow
 """
 
+import copy
+import json
+import math
+
 import folium
-from folium.plugins import MarkerCluster
+from folium.elements import JSCSSMixin
+from folium.map import MacroElement
+from folium.plugins import FastMarkerCluster, MarkerCluster
+from folium.template import Template
 import streamlit as st
 
 from .constants import (
     DEFAULT_USER_LOCATION,
+    DEFAULT_ZOOM,
     ESRI_URLS,
-    ATTR_MAP
+    ATTR_MAP,
+    MAP_HEIGHT,
+    MAP_KEY,
+    MAP_WIDTH,
+    PARKING_VIEWPORT_LIMITS,
+    PARKING_VIEWPORT_MAX,
+    PARKING_VIEWPORT_PADDING,
 )
 from .styles import MAP_ATTRIBUTION_CSS
-from src.parking_velo.domain.apps.get_parking_velo import get_parking_velo
+from src.parking_velo.domain.apps.get_parking_velo import (
+    get_parking_velo_clusters,
+    get_parking_velo_in_bbox,
+)
+from src.parking_velo.config.columns import ParkingVeloColumns
 from src.parking_velo.config.filters import ParkingVeloFilters
 
+PARKING_MARKER_COLUMNS = [
+    ParkingVeloColumns.lat.value,
+    ParkingVeloColumns.lon.value,
+    ParkingVeloColumns.osm_id.value,
+    ParkingVeloColumns.capacite.value,
+]
 
-@st.cache_data(show_spinner=False)
-def load_parking_data(parking_filter: ParkingVeloFilters):
-    """Charge les données des parkings vélo pour le filtre demandé."""
-    return get_parking_velo(filter=parking_filter)
+# Marqueur et popup construits dans le navigateur à partir d'une ligne [lat, lon, osm_id, capacité]
+PARKING_MARKER_CALLBACK = """
+(function() {
+    var icon = L.divIcon({
+        html: '<i class="fa fa-bicycle" style="color: green; font-size: 12px;"></i>',
+        iconSize: [16, 16],
+        iconAnchor: [8, 8],
+        className: 'empty'
+    });
+    return function(row) {
+        var marker = L.marker([row[0], row[1]], {icon: icon});
+        marker.bindPopup(function() {
+            return 'Parking ID: ' + row[2] + '<br>Capacité: ' + row[3];
+        });
+        return marker;
+    };
+})()"""
 
+PARKING_CLUSTER_ICON_FUNCTION = """
+function(cluster) {
+    var count = cluster.getChildCount();
+    var size = count < 10 ? 'small' : count < 100 ? 'medium' : 'large';
+    var sizeMap = {'small': 20, 'medium': 30, 'large': 40};
+    return L.divIcon({
+        html: '<div><span>' + count + '</span></div>',
+        className: 'marker-cluster marker-cluster-' + size,
+        iconSize: new L.Point(sizeMap[size], sizeMap[size])
+    });
+}"""
 
-def create_base_map(
-    show_parking: bool = True,
-    map_style: str = 'CartoDB positron',
-    parking_filter: ParkingVeloFilters = ParkingVeloFilters.default,
-):
-    """Crée la carte de base avec marqueur utilisateur et parkings."""
-    m = _create_map_with_style(map_style)
 
+def create_base_map(map_style: str = 'CartoDB positron'):
+    """Crée la carte de base avec le marqueur utilisateur.
+
+    La partie statique de la carte est construite une seule fois par style,
+    puis copiée à chaque rerun : les couches d'itinéraire et st_folium
+    modifient la copie, jamais le modèle partagé. Les parkings sont ajoutés
+    à part, selon la vue courante (create_parking_viewport_layer).
+    """
     # Injecter le CSS pour nettoyer les attributions
     st.markdown(MAP_ATTRIBUTION_CSS, unsafe_allow_html=True)
 
-    # Ajouter les marqueurs par défaut
-    m = add_default_markers(m, show_parking, parking_filter)
+    return copy.deepcopy(_base_map_template(map_style))
 
-    return m
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _base_map_template(map_style):
+    """Construit la carte statique (fond, marqueur utilisateur) partagée entre reruns."""
+    m = _create_map_with_style(map_style)
+
+    # Ajouter les marqueurs par défaut
+    return add_default_markers(m)
 
 
 def _create_map_with_style(map_style):
@@ -53,7 +108,7 @@ def _create_esri_map(map_style):
     """Crée une carte Esri."""
     m = folium.Map(
         location=DEFAULT_USER_LOCATION,
-        zoom_start=12,
+        zoom_start=DEFAULT_ZOOM,
         prefer_canvas=True
     )
 
@@ -72,7 +127,7 @@ def _create_cartodb_voyager_map():
     """Crée une carte CartoDB Voyager."""
     m = folium.Map(
         location=DEFAULT_USER_LOCATION,
-        zoom_start=12,
+        zoom_start=DEFAULT_ZOOM,
         prefer_canvas=True
     )
 
@@ -91,19 +146,15 @@ def _create_standard_map(map_style):
     """Crée une carte standard (OpenStreetMap, CartoDB)."""
     return folium.Map(
         location=DEFAULT_USER_LOCATION,
-        zoom_start=12,
+        zoom_start=DEFAULT_ZOOM,
         tiles=map_style,
         attr=ATTR_MAP.get(map_style, 'Map tiles'),
         prefer_canvas=True
     )
 
 
-def add_default_markers(
-    m,
-    show_parking: bool = True,
-    parking_filter: ParkingVeloFilters = ParkingVeloFilters.default,
-):
-    """Ajoute les marqueurs par défaut (utilisateur et parkings)."""
+def add_default_markers(m):
+    """Ajoute les marqueurs par défaut (utilisateur)."""
     # Marqueur utilisateur
     folium.Marker(
         location=DEFAULT_USER_LOCATION,
@@ -115,43 +166,209 @@ def add_default_markers(
         )
     ).add_to(m)
 
-    # Ajouter parkings vélo si demandé
-    if show_parking:
-        _add_parking_markers(m, parking_filter)
-
     return m
 
 
-def _add_parking_markers(m, parking_filter: ParkingVeloFilters):
-    """Ajoute les marqueurs de parkings vélo pour le filtre choisi."""
-    # Cluster pour parkings avec configuration pour bulles plus petites
-    marker_cluster = MarkerCluster(
-        max_cluster_radius=30,
-        icon_create_function="""
-        function(cluster) {
-            var count = cluster.getChildCount();
-            var size = count < 10 ? 'small' : count < 100 ? 'medium' : 'large';
-            var sizeMap = {'small': 20, 'medium': 30, 'large': 40};
-            return L.divIcon({
-                html: '<div><span>' + count + '</span></div>',
-                className: 'marker-cluster marker-cluster-' + size,
-                iconSize: new L.Point(sizeMap[size], sizeMap[size])
-            });
-        }"""
-    ).add_to(m)
+def create_parking_viewport_layer(
+    show_parking: bool = True,
+    parking_filter: ParkingVeloFilters = ParkingVeloFilters.default,
+):
+    """Crée la couche des parkings visibles dans la vue courante de la carte.
+
+    La vue (emprise et zoom) est celle renvoyée par st_folium au dernier
+    rendu. Aux zooms larges, les agrégats précalculés de cette emprise sont
+    envoyés tels quels ; au niveau de la rue, seuls les parkings de l'emprise,
+    dans la limite du zoom courant, sont envoyés au navigateur. La couche
+    est ajoutée à la carte sans la recharger (paramètre feature_group_to_add
+    de st_folium).
+    """
+    layer = folium.FeatureGroup(name="Parkings vélo", control=False)
+    if not show_parking:
+        return layer
 
     try:
-        parking_data = load_parking_data(parking_filter)
-        for _, row in parking_data.iterrows():
-            folium.Marker(
-                location=[row.geometry.y, row.geometry.x],
-                popup=f"Parking ID: {row.get('osm_id', 'N/A')}<br>Capacité: {row.get('capacite', 'N/A')}",
-                icon=folium.DivIcon(
-                    html='<i class="fa fa-bicycle" style="color: green; font-size: 12px;"></i>',
-                    icon_size=(16, 16),
-                    icon_anchor=(8, 8)
-                )
-            ).add_to(marker_cluster)
+        bbox, zoom = _get_map_viewport()
+        clusters = get_parking_velo_clusters(filter=parking_filter, bbox=bbox, zoom=zoom)
+        if clusters is not None:
+            ParkingClusterLayer(_to_cluster_json(clusters)).add_to(layer)
+            return layer
+
+        parking_data, total = get_parking_velo_in_bbox(
+            filter=parking_filter, bbox=bbox, limit=_get_parking_viewport_limit(zoom), columns=PARKING_MARKER_COLUMNS
+        )
+        ParkingMarkerCluster(
+            _to_parking_json(parking_data),
+            max_cluster_radius=30,
+            icon_create_function=PARKING_CLUSTER_ICON_FUNCTION,
+        ).add_to(layer)
+
+        if total > len(parking_data):
+            st.caption(f"🔍 {len(parking_data)} parkings affichés sur {total} : zoomez pour voir les autres")
 
     except Exception as e:
         st.error(f"❌ Erreur chargement parkings: {e}")
+
+    return layer
+
+
+def get_map_zoom():
+    """Renvoie le zoom de la carte au dernier rendu, le zoom initial sinon."""
+    return (st.session_state.get(MAP_KEY) or {}).get("zoom") or DEFAULT_ZOOM
+
+
+def _get_map_viewport():
+    """Renvoie l'emprise (lon/lat min, lon/lat max) élargie et le zoom de la carte.
+
+    Avant le premier retour de st_folium, la vue est déduite du centre et du
+    zoom par défaut de la carte.
+    """
+    map_state = st.session_state.get(MAP_KEY) or {}
+    bounds = map_state.get("bounds") or {}
+    south_west, north_east = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+    zoom = get_map_zoom()
+
+    if None in (south_west.get("lng"), south_west.get("lat"), north_east.get("lng"), north_east.get("lat")):
+        # Taille de la vue en degrés : 256 pixels couvrent 360° de longitude au zoom 0
+        lon_span = MAP_WIDTH * 360 / (256 * 2 ** zoom)
+        lat_span = lon_span * MAP_HEIGHT / MAP_WIDTH * math.cos(math.radians(DEFAULT_USER_LOCATION[0]))
+        lat, lon = DEFAULT_USER_LOCATION
+        xmin, ymin, xmax, ymax = lon - lon_span / 2, lat - lat_span / 2, lon + lon_span / 2, lat + lat_span / 2
+    else:
+        xmin, ymin = south_west["lng"], south_west["lat"]
+        xmax, ymax = north_east["lng"], north_east["lat"]
+
+    padding_x = (xmax - xmin) * PARKING_VIEWPORT_PADDING
+    padding_y = (ymax - ymin) * PARKING_VIEWPORT_PADDING
+    return (xmin - padding_x, ymin - padding_y, xmax + padding_x, ymax + padding_y), zoom
+
+
+def _get_parking_viewport_limit(zoom) -> int:
+    """Renvoie le nombre maximal de parkings envoyés au navigateur à ce zoom.
+
+    Sans agrégats pour ce zoom (pyramide absente), la limite la plus basse
+    s'applique ; au-delà des zooms listés, PARKING_VIEWPORT_MAX.
+    """
+    if zoom in PARKING_VIEWPORT_LIMITS:
+        return PARKING_VIEWPORT_LIMITS[zoom]
+    if zoom > max(PARKING_VIEWPORT_LIMITS):
+        return PARKING_VIEWPORT_MAX
+    return min(PARKING_VIEWPORT_LIMITS.values())
+
+
+def _to_parking_json(parking_data) -> str:
+    """Sérialise des parkings en tableau JSON de lignes [lat, lon, osm_id, capacité]."""
+    rows = zip(
+        parking_data[ParkingVeloColumns.lat].to_numpy(dtype=float).round(6).tolist(),
+        parking_data[ParkingVeloColumns.lon].to_numpy(dtype=float).round(6).tolist(),
+        _to_json_values(parking_data[ParkingVeloColumns.osm_id]),
+        _to_json_values(parking_data[ParkingVeloColumns.capacite]),
+    )
+    # « </ » échappé : le tableau est inséré tel quel dans une balise <script>
+    return json.dumps(list(rows), separators=(",", ":")).replace("</", "<\\/")
+
+
+def _to_cluster_json(clusters) -> str:
+    """Sérialise des agrégats en lignes [lat, lon, nombre de sites, capacité, osm_id]."""
+    rows = zip(
+        clusters[ParkingVeloColumns.lat].to_numpy(dtype=float).round(6).tolist(),
+        clusters[ParkingVeloColumns.lon].to_numpy(dtype=float).round(6).tolist(),
+        clusters[ParkingVeloColumns.site_count].to_numpy(dtype=int).tolist(),
+        clusters[ParkingVeloColumns.capacite].to_numpy(dtype=int).tolist(),
+        _to_json_values(clusters[ParkingVeloColumns.osm_id]),
+    )
+    return json.dumps(list(rows), separators=(",", ":")).replace("</", "<\\/")
+
+
+def _to_json_values(values):
+    """Convertit une colonne en valeurs Python, les valeurs manquantes en None."""
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+class ParkingMarkerCluster(FastMarkerCluster):
+    """Cluster de parkings dont les données sont déjà sérialisées en JSON.
+
+    Contrairement à FastMarkerCluster, les lignes ne sont ni validées une à une
+    ni réencodées à chaque rendu de la carte.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                {{ this.callback }}
+
+                var data = {{ this.data_json }};
+                var cluster = L.markerClusterGroup({{ this.options|tojavascript }});
+                {%- if this.icon_create_function is not none %}
+                cluster.options.iconCreateFunction =
+                    {{ this.icon_create_function.strip() }};
+                {%- endif %}
+
+                var markers = new Array(data.length);
+                for (var i = 0; i < data.length; i++) {
+                    markers[i] = callback(data[i]);
+                }
+                cluster.addLayers(markers);
+
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, data_json: str, **kwargs):
+        super().__init__(data=[], callback=PARKING_MARKER_CALLBACK, **kwargs)
+        self.data_json = data_json
+
+
+class ParkingClusterLayer(JSCSSMixin, MacroElement):
+    """Agrégats de parkings précalculés, affichés sans regroupement côté navigateur.
+
+    Chaque agrégat est une bulle indiquant le nombre de sites et la capacité
+    totale ; un clic zoome sur l'agrégat. Les agrégats d'un seul site sont
+    affichés comme un parking.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                var parking = {{ this.callback }};
+                var sizes = {'small': 20, 'medium': 30, 'large': 40};
+
+                var data = {{ this.data_json }};
+                var layer = L.layerGroup();
+                for (var i = 0; i < data.length; i++) {
+                    var row = data[i];
+                    if (row[2] == 1) {
+                        layer.addLayer(parking([row[0], row[1], row[4], row[3]]));
+                        continue;
+                    }
+                    var size = row[2] < 10 ? 'small' : row[2] < 100 ? 'medium' : 'large';
+                    var marker = L.marker([row[0], row[1]], {icon: L.divIcon({
+                        html: '<div><span>' + row[2] + '</span></div>',
+                        className: 'marker-cluster marker-cluster-' + size,
+                        iconSize: new L.Point(sizes[size], sizes[size])
+                    })});
+                    marker.bindTooltip(row[2] + ' sites<br>Capacité totale: ' + row[3]);
+                    marker.on('click', function(e) {
+                        var map = e.target._map;
+                        map.setView(e.latlng, map.getZoom() + 2);
+                    });
+                    layer.addLayer(marker);
+                }
+
+                layer.addTo({{ this._parent.get_name() }});
+                return layer;
+            })();
+        {% endmacro %}"""
+    )
+
+    # Styles des bulles de Leaflet.markercluster, sans le script de regroupement
+    default_css = MarkerCluster.default_css
+
+    def __init__(self, data_json: str):
+        super().__init__()
+        self._name = "ParkingClusterLayer"
+        self.callback = PARKING_MARKER_CALLBACK
+        self.data_json = data_json
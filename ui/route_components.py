@@ -3,10 +3,11 @@ Gestion des itinéraires et des tracés sur la carte
 """
 
 import folium
-import polyline  # type: ignore
 import streamlit as st
 
 from .constants import ROUTE_COLORS
+from .map_components import get_map_zoom
+from .route_geometry import decode_polyline, level_for_zoom, simplify_levels
 from .styles import ROUTE_BUTTONS_CSS
 
 
@@ -59,6 +60,63 @@ def _extract_geojson_coordinates(geojson):
     return []
 
 
+def _get_route_geometries(itinerary_data):
+    """Renvoie les tracés de l'itinéraire, décodés et simplifiés une seule fois.
+
+    Les tableaux sont gardés en session avec l'itinéraire dont ils sont issus
+    et recalculés seulement quand un nouvel itinéraire est affiché.
+    """
+    geometries = st.session_state.get('route_geometries')
+    if geometries is None or geometries['itinerary'] is not itinerary_data:
+        geometries = _build_route_geometries(itinerary_data)
+        st.session_state.route_geometries = geometries
+    return geometries
+
+
+def _build_route_geometries(itinerary_data):
+    """Décode les tracés vélo, à pied et en transports en niveaux de détail."""
+    velo = []
+    for route in itinerary_data.get('itinerary_velo') or []:
+        route_levels = []
+        for section in route.get('sections', []):
+            encoded_geometry = section.get('geometry')
+            if not encoded_geometry:
+                route_levels.append(None)
+                continue
+            try:
+                route_levels.append(simplify_levels(decode_polyline(encoded_geometry)))
+            except Exception as e:
+                # Erreur gardée pour être signalée à chaque affichage
+                route_levels.append(e)
+        velo.append(route_levels)
+
+    walk_data = _ensure_dict(itinerary_data.get('itinerary_marche')) or {}
+    marche = [
+        _section_levels(_extract_geojson_coordinates(section.get('geojson')) if _has_valid_geojson(section) else [])
+        for section in walk_data.get('sections', [])
+    ]
+    transport = [
+        _section_levels(_extract_geojson_coordinates(section.get('geojson')))
+        for section in _get_transport_sections(itinerary_data)
+    ]
+
+    return {'itinerary': itinerary_data, 'velo': velo, 'marche': marche, 'transport': transport}
+
+
+def _section_levels(coords):
+    """Niveaux de détail d'une section à pied ou en transports, None sans tracé.
+
+    Une géométrie invalide ne fait pas échouer les autres sections : l'erreur
+    est gardée à la place des niveaux pour être signalée à chaque affichage.
+    """
+    if not coords:
+        return None
+    try:
+        return simplify_levels(coords)
+    except Exception as e:
+        return e
+
+
 def _get_transport_sections(itinerary_data):
     if not itinerary_data:
         return []
@@ -171,7 +229,8 @@ def _display_route_buttons(route_buttons, itinerary_data):
                 use_container_width=True
             ):
                 st.session_state.selected_route = route_index
-                st.rerun()
+                # Seul le fragment des itinéraires et de la carte est réexécuté
+                st.rerun(scope="fragment")
 
 
 def _create_button_text(title, bike_duration, total_duration, total_distance, itinerary_data):
@@ -195,32 +254,33 @@ def _create_button_text(title, bike_duration, total_duration, total_distance, it
 
 
 def _add_route_polylines(map_obj, itinerary_data):
-    """Ajoute tous les tracés d'itinéraires à la carte."""
+    """Ajoute tous les tracés d'itinéraires à la carte, au niveau de détail du zoom."""
+    geometries = _get_route_geometries(itinerary_data)
+    zoom = get_map_zoom()
     for i, route in enumerate(itinerary_data['itinerary_velo']):
         route_title = route.get('title', 'Route inconnue')
         duration_min = route.get('duration', 0) // 60
         distance_m = route.get('distances', {}).get('total', 0)
 
-        for section in route.get('sections', []):
-            encoded_geometry = section.get('geometry')
-            if encoded_geometry:
-                try:
-                    decoded_path = polyline.decode(encoded_geometry, precision=6)
-                    color = ROUTE_COLORS.get(route_title, '#666666')
-
-                    # Style selon si l'itinéraire est sélectionné
-                    opacity = 1.0 if st.session_state.selected_route == i else 0.4
-                    weight = 5 if st.session_state.selected_route == i else 3
-
-                    folium.PolyLine(
-                        locations=decoded_path,
-                        color=color,
-                        weight=weight,
-                        opacity=opacity,
-                        popup=f"{route_title} - {duration_min}min - {distance_m}m"
-                    ).add_to(map_obj)
-                except Exception as e:
-                    st.warning(f"Erreur géométrie {route_title}: {e}")
+        for levels in geometries['velo'][i]:
+            if levels is None:
+                continue
+            if isinstance(levels, Exception):
+                st.warning(f"Erreur géométrie {route_title}: {levels}")
+                continue
+            color = ROUTE_COLORS.get(route_title, '#666666')
+
+            # Style selon si l'itinéraire est sélectionné
+            opacity = 1.0 if st.session_state.selected_route == i else 0.4
+            weight = 5 if st.session_state.selected_route == i else 3
+
+            folium.PolyLine(
+                locations=level_for_zoom(levels, zoom).tolist(),
+                color=color,
+                weight=weight,
+                opacity=opacity,
+                popup=f"{route_title} - {duration_min}min - {distance_m}m"
+            ).add_to(map_obj)
 
 
 def _display_selected_route_details(itinerary_data):
@@ -383,24 +443,21 @@ def add_walking_route_to_map(map_obj, itinerary_data):
     distance_m = walk_data.get('distances', {}).get('walking', 0)
 
     # Ajouter le tracé à pied
-    for section in walk_data.get('sections', []):
-        if _has_valid_geojson(section):
-            coords = section['geojson']['coordinates']
-            if coords:
-                try:
-                    folium_coords = [[coord[1], coord[0]]
-                                     for coord in coords if len(coord) >= 2]
-                    if folium_coords:
-                        folium.PolyLine(
-                            locations=folium_coords,
-                            color='purple',
-                            weight=4,
-                            opacity=0.8,
-                            dash_array='8, 4',
-                            popup=f"🚶‍♂️ À pied - {duration_min}min - {distance_m}m"
-                        ).add_to(map_obj)
-                except (IndexError, TypeError) as e:
-                    st.warning(f"Erreur lors de l'affichage de l'itinéraire à pied: {e}")
+    zoom = get_map_zoom()
+    for levels in _get_route_geometries(itinerary_data)['marche']:
+        if levels is None:
+            continue
+        if isinstance(levels, Exception):
+            st.warning(f"Erreur lors de l'affichage de l'itinéraire à pied: {levels}")
+            continue
+        folium.PolyLine(
+            locations=level_for_zoom(levels, zoom).tolist(),
+            color='purple',
+            weight=4,
+            opacity=0.8,
+            dash_array='8, 4',
+            popup=f"🚶‍♂️ À pied - {duration_min}min - {distance_m}m"
+        ).add_to(map_obj)
 
 
 def display_transport_itinerary(transport_data):
@@ -451,9 +508,12 @@ def add_transport_route_to_map(map_obj, itinerary_data):
     if not sections:
         return
 
-    for section in sections:
-        coords = _extract_geojson_coordinates(section.get('geojson'))
-        if not coords:
+    zoom = get_map_zoom()
+    for section, levels in zip(sections, _get_route_geometries(itinerary_data)['transport']):
+        if levels is None:
+            continue
+        if isinstance(levels, Exception):
+            st.warning(f"Erreur lors de l'affichage du transport : {levels}")
             continue
 
         color, dash, weight = _transport_section_style(section)
@@ -461,7 +521,7 @@ def add_transport_route_to_map(map_obj, itinerary_data):
 
         try:
             folium.PolyLine(
-                locations=coords,
+                locations=level_for_zoom(levels, zoom).tolist(),
                 color=color,
                 weight=weight,
                 opacity=0.85,
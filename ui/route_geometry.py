@@ -0,0 +1,48 @@
+"""
+Géométries des tracés : tableaux de coordonnées et niveaux de simplification
+"""
+
+import numpy as np
+import polyline  # type: ignore
+import shapely
+
+from .constants import ROUTE_SIMPLIFY_PIXELS, ROUTE_SIMPLIFY_TOLERANCES
+
+
+def decode_polyline(encoded_geometry):
+    """Décode une polyligne Geovelo (précision 6) en tableau [latitude, longitude]."""
+    return np.array(polyline.decode(encoded_geometry, precision=6), dtype=float).reshape(-1, 2)
+
+
+def simplify_levels(coords):
+    """Précalcule les niveaux de détail d'un tracé [latitude, longitude].
+
+    Un niveau par tolérance de ROUTE_SIMPLIFY_TOLERANCES (Douglas-Peucker),
+    du tracé complet au plus simplifié ; les extrémités sont conservées.
+    """
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    if len(coords) < 3:
+        return [coords] * len(ROUTE_SIMPLIFY_TOLERANCES)
+
+    line = shapely.linestrings(coords)
+    simplified = shapely.simplify(line, np.array(ROUTE_SIMPLIFY_TOLERANCES[1:]), preserve_topology=False)
+    return [coords] + [shapely.get_coordinates(geometry) for geometry in simplified]
+
+
+def level_for_zoom(levels, zoom):
+    """Choisit le niveau le plus simplifié dont l'écart reste invisible à ce zoom.
+
+    La tolérance de simplification s'applique en degrés sur les deux axes ;
+    en Web Mercator un pixel couvre 360 / (256 * 2 ** zoom) degrés de
+    longitude mais seulement cos(latitude) fois autant de latitude. La borne
+    retenue est celle de la latitude, prise au point le plus éloigné de
+    l'équateur, pour rester sous un pixel dans les deux directions.
+    """
+    coords = levels[0]
+    cos_lat = np.cos(np.radians(np.abs(coords[:, 0]).max())) if len(coords) else 1.0
+    max_tolerance = ROUTE_SIMPLIFY_PIXELS * 360 / (256 * 2 ** zoom) * cos_lat
+    level = 0
+    for i, tolerance in enumerate(ROUTE_SIMPLIFY_TOLERANCES):
+        if tolerance <= max_tolerance:
+            level = i
+    return levels[level]
@@ -9,24 +9,31 @@ import streamlit as st
 from streamlit_searchbox import st_searchbox  # type: ignore
 
 from src.parking_velo.config.filters import ParkingVeloFilters
-from src.parking_velo.domain.apps.get_parking_velo import get_parking_velo
+from src.parking_velo.domain.apps.get_parking_velo import get_parking_velo_filter_count
 
-from .constants import PARIS_CENTER, MAP_STYLES
+from .address_suggestions import end_suggestion_session, get_address_suggestion_service, get_suggestion_session_token
+from .constants import MAP_STYLES
 from .styles import EXPANDER_CSS
 
 
 PARIS_TZ = ZoneInfo("Europe/Paris")
 
 
-def get_address_suggestions(query, gmaps):
-    """Obtient des suggestions d'adresses via Google Maps."""
-    if not query or len(query) < 3:
-        return []
-    try:
-        results = gmaps.places_autocomplete(query, location=PARIS_CENTER, radius=50000)
-        return [result['description'] for result in results]
-    except Exception:
+def get_address_suggestions(query, gmaps, key_prefix):
+    """Obtient des suggestions d'adresses, de l'index local puis de Google Maps."""
+    if not query:
         return []
+    service = get_address_suggestion_service()
+    service.refresh_parkings()
+    return service.suggest(query, gmaps, get_suggestion_session_token(key_prefix))
+
+
+def _accept_address(key_prefix, choice, default_value):
+    """Retient l'adresse choisie et clôt la session de saisie Google du champ."""
+    if choice and choice != default_value and st.session_state.get(f"{key_prefix}_accepted") != choice:
+        st.session_state[f"{key_prefix}_accepted"] = choice
+        get_address_suggestion_service().remember([choice])
+        end_suggestion_session(key_prefix)
 
 
 def create_address_input(label, key_prefix, default_value, gmaps):
@@ -36,7 +43,7 @@ def create_address_input(label, key_prefix, default_value, gmaps):
     # Tentative d'utilisation de streamlit-searchbox
     try:
         choice = st_searchbox(
-            lambda query: get_address_suggestions(query, gmaps),
+            lambda query: get_address_suggestions(query, gmaps, key_prefix),
             key=f"{key_prefix}_searchbox",
             placeholder=f"Tapez l'adresse de {label.lower()}",
             default=default_value
@@ -47,10 +54,11 @@ def create_address_input(label, key_prefix, default_value, gmaps):
         query = st.text_input(f"Adresse de {label.lower()}",
                               key=f"{key_prefix}_fb",
                               value=default_value)
-        suggestions = get_address_suggestions(query, gmaps)
+        suggestions = get_address_suggestions(query, gmaps, key_prefix)
         choice = st.selectbox("Suggestions", suggestions if suggestions else [query],
                               key=f"{key_prefix}_select") if suggestions else query
 
+    _accept_address(key_prefix, choice, default_value)
     return choice
 
 
@@ -90,12 +98,10 @@ def create_sidebar(gmaps):
         )
 
 
-@st.cache_data(show_spinner=False)
 def _get_parking_count(parking_filter: ParkingVeloFilters) -> int:
-    """Renvoie le nombre de parkings pour un filtre donné."""
+    """Renvoie le nombre de parkings pour un filtre donné, lu dans le manifeste du jeu de données."""
     try:
-        parking_data = get_parking_velo(filter=parking_filter)
-        return int(parking_data.shape[0])
+        return get_parking_velo_filter_count(filter=parking_filter)
     except Exception:
         return 0
 